@@ -0,0 +1,328 @@
+"""
+가짜 Discord 멤버/이벤트로 이벤트 처리기의 처리량과 DB round trip 측정
+
+    python -m benchmarks.bench_events --members 2000 --events 5000
+    python -m benchmarks.bench_events --mongo mongodb://localhost:27017 --rate 500
+    python -m benchmarks.bench_events --db-latency-ms 1 --scenarios voice,reaction
+
+- voice: VoiceTracker.on_voice_state_update (입장/이동/퇴장), 마지막에 write-behind 큐를 flush한 시간과 round trip까지 포함
+- reaction: GrantAuthority.on_raw_reaction_add (--reaction-hit-rate 비율만 대상 공지 메시지의 ✅ 반응)
+- sync: ServerSynchronization._sync_members (실행마다 --sync-change-rate 비율의 멤버 닉네임 변경, --sync-departure-rate 비율 탈퇴)
+- --mongo: memory(기본, 인메모리 대체 구현) 또는 로컬 mongod URI (watchers_bench DB 사용, 시작 시 비움)
+- --rate: 초당 이벤트 수 (0: 이벤트를 순서대로 최대한 빠르게 처리)
+- 결과는 시나리오별 JSON 한 줄로 출력 (커밋 간 비교용), 봇 로그는 Error만 출력
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+os.environ.setdefault("LOG_LEVEL", "CRITICAL")
+
+from benchmarks.mongo_backend import BENCH_DATABASE, connect
+
+GUILD_ID = 1000
+NOTICE_MESSAGE_ID = 2000
+OTHER_MESSAGE_ID = 2001
+MEMBER_ID_BASE = 10_000_000
+CHANNELS = [SimpleNamespace(name=f"voice-{idx}") for idx in range(8)]
+
+
+# ---- 가짜 Discord 객체 ----
+
+class FakeRole:
+    def __init__(self, role_id: int, name: str):
+        self.id = role_id
+        self.name = name
+
+    def is_default(self) -> bool:
+        return self.name == "@everyone"
+
+
+class FakeMember:
+    def __init__(self, member_id: int, name: str, joined_at: datetime, roles: list[FakeRole]):
+        self.id = member_id
+        self.name = name
+        self.display_name = name
+        self.joined_at = joined_at
+        self.roles = roles
+        self.bot = False
+
+    def get_role(self, role_id: int):
+        return next((role for role in self.roles if role.id == role_id), None)
+
+    async def add_roles(self, *roles):
+        self.roles.extend(roles)
+
+    async def send(self, *args, **kwargs):
+        pass
+
+
+class FakeGuild:
+    def __init__(self, guild_id: int, members: list[FakeMember], roles: list[FakeRole]):
+        self.id = guild_id
+        self.name = "bench-guild"
+        self.roles = roles
+        self.chunked = True
+        self.unavailable = False
+        self.voice_channels = []
+        self.stage_channels = []
+        self._members = {member.id: member for member in members}
+
+    @property
+    def members(self) -> list[FakeMember]:
+        return list(self._members.values())
+
+    @property
+    def member_count(self) -> int:
+        return len(self._members)
+
+    def remove_member(self, member_id: int):
+        self._members.pop(member_id, None)
+
+    def get_member(self, member_id: int):
+        return self._members.get(member_id)
+
+    def get_role(self, role_id: int):
+        return next((role for role in self.roles if role.id == role_id), None)
+
+    def get_channel(self, channel_id: int):
+        return None
+
+    async def chunk(self):
+        self.chunked = True
+
+
+class FakeBot:
+    def __init__(self, guild: FakeGuild):
+        self.guilds = [guild]
+
+    def get_guild(self, guild_id: int):
+        return next((guild for guild in self.guilds if guild.id == guild_id), None)
+
+    def get_channel(self, channel_id: int):
+        return None
+
+    def is_ready(self) -> bool:
+        return True
+
+
+def build_guild(count: int, rng: random.Random) -> FakeGuild:
+    everyone = FakeRole(GUILD_ID, "@everyone")
+    roles = [everyone, FakeRole(1, "Member"), FakeRole(2, "Guest"), FakeRole(3, "Organizer")]
+    joined = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    members = [
+        FakeMember(
+            MEMBER_ID_BASE + idx,
+            f"member{idx}",
+            joined + timedelta(minutes=rng.randrange(500_000)),
+            [everyone],
+        )
+        for idx in range(count)
+    ]
+    return FakeGuild(GUILD_ID, members, roles)
+
+
+# ---- 측정 ----
+
+def summarize(scenario: str, backend, args, latencies: list[float], events: int, elapsed: float, round_trips: int, **extra) -> dict:
+    ordered = sorted(latencies)
+    return {
+        "scenario": scenario,
+        "backend": backend.name,
+        "db_latency_ms": args.db_latency_ms if backend.name == "memory" else None,
+        "events": events,
+        "events_per_sec": round(events / elapsed, 1) if elapsed else None,
+        "p50_ms": round(statistics.median(ordered), 3),
+        "p99_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))], 3),
+        "max_ms": round(ordered[-1], 3),
+        "db_round_trips": round_trips,
+        "round_trips_per_event": round(round_trips / events, 3) if events else None,
+        **extra,
+    }
+
+
+async def drive(handler, events: list[tuple], rate: float) -> tuple[list[float], float]:
+    """
+    rate가 0이면 순서대로 await, 아니면 초당 rate개씩 별도 task로 실행 (디스코드 이벤트 dispatch와 같은 방식)
+    """
+    latencies = []
+
+    async def one(event):
+        started = time.perf_counter()
+        await handler(*event)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    if not rate:
+        for event in events:
+            await one(event)
+    else:
+        tasks = []
+        for idx, event in enumerate(events):
+            delay = started + idx / rate - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(one(event)))
+        await asyncio.gather(*tasks)
+    return latencies, time.perf_counter() - started
+
+
+def voice_events(guild: FakeGuild, count: int, rng: random.Random) -> list[tuple]:
+    # 입장 → (이동) → 퇴장 순서가 유지되도록 멤버별 상태를 따라가며 생성
+    members = guild.members
+    channel_of: dict[int, SimpleNamespace] = {}
+    events = []
+    for _ in range(count):
+        member = rng.choice(members)
+        current = channel_of.get(member.id)
+        if current is None:
+            after = rng.choice(CHANNELS)
+            channel_of[member.id] = after
+            events.append((member, SimpleNamespace(channel=None), SimpleNamespace(channel=after)))
+        elif rng.random() < 0.2:
+            after = rng.choice([channel for channel in CHANNELS if channel is not current])
+            channel_of[member.id] = after
+            events.append((member, SimpleNamespace(channel=current), SimpleNamespace(channel=after)))
+        else:
+            del channel_of[member.id]
+            events.append((member, SimpleNamespace(channel=current), SimpleNamespace(channel=None)))
+    return events
+
+
+async def bench_voice(backend, args, rng: random.Random) -> dict:
+    from cogs import instrument_cog
+    from cogs.voice_tracker import VoiceTracker
+
+    guild = build_guild(args.members, rng)
+    cog = instrument_cog(VoiceTracker(FakeBot(guild)))
+    await cog.cog_load()
+    events = voice_events(guild, args.events, rng)
+
+    round_trips = backend.round_trips
+    latencies, elapsed = await drive(cog.on_voice_state_update, events, args.rate)
+    drain_started = time.perf_counter()
+    await cog.cog_unload()
+    drain_ms = (time.perf_counter() - drain_started) * 1000
+    return summarize(
+        "voice", backend, args, latencies, len(events), elapsed + drain_ms / 1000,
+        backend.round_trips - round_trips, drain_ms=round(drain_ms, 1),
+    )
+
+
+def reaction_events(guild: FakeGuild, count: int, hit_rate: float, rng: random.Random) -> list[tuple]:
+    members = guild.members
+    events = []
+    for _ in range(count):
+        member = rng.choice(members)
+        hit = rng.random() < hit_rate
+        events.append((SimpleNamespace(
+            message_id=NOTICE_MESSAGE_ID if hit else OTHER_MESSAGE_ID,
+            emoji=SimpleNamespace(name="✅" if hit or rng.random() < 0.5 else "👍"),
+            guild_id=GUILD_ID,
+            channel_id=1,
+            user_id=member.id,
+            member=member,
+        ),))
+    return events
+
+
+async def bench_reaction(backend, args, rng: random.Random) -> dict:
+    from cogs import instrument_cog
+    from cogs.grant_authority import GrantAuthority
+    from settings import MEMBER_ROLE_NAME
+
+    guild = build_guild(args.members, rng)
+    cog = instrument_cog(GrantAuthority(FakeBot(guild)))
+    # config.json 대신 벤치마크용 공지 메시지만 감시
+    cog._targets = {NOTICE_MESSAGE_ID: MEMBER_ROLE_NAME or "Member"}
+    cog._watched = frozenset(cog._targets)
+    events = reaction_events(guild, args.events, args.reaction_hit_rate, rng)
+
+    round_trips = backend.round_trips
+    latencies, elapsed = await drive(cog.on_raw_reaction_add, events, args.rate)
+    await cog.cog_unload()
+    granted = sum(1 for member in guild.members if len(member.roles) > 1)
+    return summarize(
+        "reaction", backend, args, latencies, len(events), elapsed,
+        backend.round_trips - round_trips, granted=granted,
+    )
+
+
+async def bench_sync(backend, args, rng: random.Random) -> dict:
+    from cogs import instrument_cog
+    from cogs.server_synchronization import ServerSynchronization
+
+    guild = build_guild(args.members, rng)
+    cog = instrument_cog(ServerSynchronization(FakeBot(guild)))
+
+    # 첫 실행(전원 신규 기록)은 측정에서 제외
+    await cog._sync_members(guild)
+    round_trips = backend.round_trips
+    latencies = []
+    processed = 0
+    totals = {"unchanged": 0, "updated": 0, "removed": 0}
+    started = time.perf_counter()
+    for _ in range(args.sync_runs):
+        members = guild.members
+        for member in rng.sample(members, round(len(members) * args.sync_change_rate)):
+            member.display_name = f"{member.name}-{rng.randrange(1_000_000)}"
+        for member in rng.sample(members, round(len(members) * args.sync_departure_rate)):
+            guild.remove_member(member.id)
+
+        run_started = time.perf_counter()
+        report = await cog._sync_members(guild)
+        latencies.append((time.perf_counter() - run_started) * 1000)
+        processed += len(members)
+        for key in totals:
+            totals[key] += report[key]
+    elapsed = time.perf_counter() - started
+    await cog.cog_unload()
+    # events = 처리한 멤버 수, p50/p99는 동기화 1회 기준
+    return summarize(
+        "sync", backend, args, latencies, processed, elapsed,
+        backend.round_trips - round_trips, runs=args.sync_runs, **totals,
+    )
+
+
+SCENARIOS = {
+    "voice": bench_voice,
+    "reaction": bench_reaction,
+    "sync": bench_sync,
+}
+
+
+async def main(args) -> list[dict]:
+    backend = connect(args.mongo, latency_ms=args.db_latency_ms, database=args.database)
+    await backend.reset()
+    from db.indexes import ensure_indexes
+    await ensure_indexes()
+
+    results = []
+    for name in args.scenarios.split(","):
+        rng = random.Random(args.seed)
+        results.append(await SCENARIOS[name.strip()](backend, args, rng))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongo", default="memory", help="memory 또는 mongodb:// URI")
+    parser.add_argument("--database", default=BENCH_DATABASE)
+    parser.add_argument("--db-latency-ms", type=float, default=0.0, help="인메모리 backend의 연산당 지연")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--members", type=int, default=2000)
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--rate", type=float, default=0.0)
+    parser.add_argument("--reaction-hit-rate", type=float, default=0.2)
+    parser.add_argument("--sync-runs", type=int, default=5)
+    parser.add_argument("--sync-change-rate", type=float, default=0.02)
+    parser.add_argument("--sync-departure-rate", type=float, default=0.002)
+    parser.add_argument("--seed", type=int, default=42)
+    for result in asyncio.run(main(parser.parse_args())):
+        print(json.dumps(result))
@@ -0,0 +1,165 @@
+"""
+voice_sessions 규모별 음성 리더보드 조회 경로 벤치마크
+
+    python -m benchmarks.bench_leaderboard --mongo mongodb://localhost:27017
+    python -m benchmarks.bench_leaderboard --sizes 10000,100000 --repeat 10
+
+- 크기마다 benchmarks.voice_sessions_data로 DB를 새로 채우고 인덱스(db.indexes) 생성 후 측정
+- raw: db/voice_sessions.py의 $group 파이프라인 (voice_sessions 원본 집계)
+- rollup: db/voice_rollups.py (일/주/월 사전 집계 컬렉션)
+- cached: db/leaderboard_cache.py 캐시 hit (첫 호출로 채운 뒤 측정)
+- command: VoiceLeaderboard 명령어 전체 경로 (캐시를 비운 상태, 접속 중 세션 합산 + embed 생성 포함)
+- 기본 크기: mongod는 10k/100k/1M, 인메모리는 10k/100k (인메모리는 인덱스가 없어 전체 스캔)
+- 결과는 JSON 한 줄씩 출력 (크기별 데이터 생성 정보 1줄 + 조회 경로별 1줄)
+  interactive: p99가 --interactive-ms 이하인지 여부
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+os.environ.setdefault("LOG_LEVEL", "CRITICAL")
+
+from benchmarks.mongo_backend import BENCH_DATABASE, connect
+from benchmarks.voice_sessions_data import KST, USER_ID_BASE, populate
+
+DEFAULT_SIZES = {"mongodb": "10000,100000,1000000", "memory": "10000,100000"}
+
+
+class FakeInteraction:
+    def __init__(self):
+        self.guild = SimpleNamespace(get_member=lambda member_id: None)
+        self.response = SimpleNamespace(defer=self._noop)
+        self.followup = SimpleNamespace(send=self._noop)
+
+    async def _noop(self, *args, **kwargs):
+        pass
+
+
+def queries(now_kst: datetime, months: int) -> dict[str, tuple]:
+    """
+    조회 이름 → (voice_sessions / voice_rollups 함수 이름, 인자)
+    """
+    from cogs.voice_leaderboard import week_of_month
+
+    today = now_kst.date()
+    oldest = (now_kst.replace(day=15) - timedelta(days=31 * (months - 1))).date()
+    week = week_of_month(now_kst.year, now_kst.month, now_kst.day)
+    return {
+        "range_7d": ("aggregate_range", ((today - timedelta(days=7)).isoformat(), today.isoformat())),
+        "range_30d": ("aggregate_range", ((today - timedelta(days=30)).isoformat(), today.isoformat())),
+        "month_week": ("aggregate_month_week", (now_kst.year, now_kst.month, week)),
+        "month": ("aggregate_month", (now_kst.year, now_kst.month)),
+        "month_oldest": ("aggregate_month", (oldest.year, oldest.month)),
+    }
+
+
+async def measure(fn, repeat: int, before=None) -> tuple[list[float], int]:
+    latencies = []
+    rows = 0
+    for _ in range(repeat):
+        if before is not None:
+            before()
+        started = time.perf_counter()
+        result = await fn()
+        latencies.append((time.perf_counter() - started) * 1000)
+        rows = len(result) if isinstance(result, list) else rows
+    return latencies, rows
+
+
+def summarize(size: int, backend, path: str, query: str, latencies: list[float], rows: int | None, args, round_trips: int) -> dict:
+    ordered = sorted(latencies)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    return {
+        "docs": size,
+        "backend": backend.name,
+        "path": path,
+        "query": query,
+        "repeat": len(latencies),
+        "rows": rows,
+        "p50_ms": round(statistics.median(ordered), 3),
+        "p99_ms": round(p99, 3),
+        "max_ms": round(ordered[-1], 3),
+        "round_trips_per_call": round(round_trips / len(latencies), 2),
+        "interactive": p99 <= args.interactive_ms,
+    }
+
+
+async def bench_size(size: int, backend, args) -> list[dict]:
+    from db import leaderboard_cache, voice_rollups, voice_sessions
+    from db.indexes import ensure_indexes
+    from db.open_sessions import open_sessions
+
+    await backend.reset()
+    setup = await populate(size, args.users, args.months, args.seed)
+    index_started = time.perf_counter()
+    await ensure_indexes()
+    setup["index_ms"] = round((time.perf_counter() - index_started) * 1000, 1)
+    results = [{"backend": backend.name, "path": "setup", **setup}]
+
+    now_kst = datetime.now(timezone.utc).astimezone(KST)
+    paths = {"raw": voice_sessions, "rollup": voice_rollups, "cached": leaderboard_cache}
+    for query, (name, params) in queries(now_kst, args.months).items():
+        for path, module in paths.items():
+            fn = getattr(module, name)
+            if path == "cached":
+                leaderboard_cache.leaderboard_cache.clear()
+                await fn(*params)
+            round_trips = backend.round_trips
+            latencies, rows = await measure(lambda: fn(*params), args.repeat)
+            results.append(summarize(size, backend, path, query, latencies, rows, args, backend.round_trips - round_trips))
+
+    # 명령어 전체 경로 (접속 중인 세션 --live명 포함)
+    from cogs.voice_leaderboard import VoiceLeaderboard, week_of_month
+
+    now = datetime.now(timezone.utc)
+    for idx in range(args.live):
+        open_sessions.start(str(USER_ID_BASE + idx * 7), f"user{idx * 7}", now - timedelta(minutes=5 + idx))
+    cog = VoiceLeaderboard(SimpleNamespace())
+    week = week_of_month(now_kst.year, now_kst.month, now_kst.day)
+    commands = {
+        "/주간-음성-리더보드-오늘": (cog.weekly_leaderboard_today, ()),
+        "/월간-음성-리더보드-오늘": (cog.monthly_leaderboard_today, ()),
+        "/주차별-음성-리더보드": (cog.week_leaderboard, (week,)),
+        "/월별-음성-리더보드": (cog.month_leaderboard, (now_kst.month,)),
+    }
+    for query, (command, params) in commands.items():
+        round_trips = backend.round_trips
+        latencies, _ = await measure(
+            lambda: command.callback(cog, FakeInteraction(), *params),
+            args.repeat,
+            before=leaderboard_cache.leaderboard_cache.clear,
+        )
+        results.append(summarize(size, backend, "command", query, latencies, None, args, backend.round_trips - round_trips))
+    await cog.cog_unload()
+    for idx in range(args.live):
+        open_sessions.end(str(USER_ID_BASE + idx * 7))
+    return results
+
+
+async def main(args) -> list[dict]:
+    backend = connect(args.mongo, database=args.database)
+    sizes = [int(size) for size in (args.sizes or DEFAULT_SIZES[backend.name]).split(",")]
+    results = []
+    for size in sizes:
+        results.extend(await bench_size(size, backend, args))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongo", default="memory", help="memory 또는 mongodb:// URI")
+    parser.add_argument("--database", default=BENCH_DATABASE)
+    parser.add_argument("--sizes", default=None, help="쉼표로 구분한 voice_sessions 문서 수")
+    parser.add_argument("--users", type=int, default=3000)
+    parser.add_argument("--months", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--live", type=int, default=20, help="접속 중으로 둘 멤버 수 (command 경로)")
+    parser.add_argument("--interactive-ms", type=float, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    for result in asyncio.run(main(parser.parse_args())):
+        print(json.dumps(result, ensure_ascii=False))
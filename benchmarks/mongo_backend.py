@@ -0,0 +1,613 @@
+"""
+벤치마크용 MongoDB 연결: 로컬 mongod 또는 인메모리 Motor 대체 구현
+
+    backend = connect("memory", latency_ms=1.0)              # 인메모리 (연산마다 1ms 지연)
+    backend = connect("mongodb://localhost:27017")            # 로컬 mongod (watchers_bench DB 사용)
+    from db.mongo import ...                                  # connect() 이후에 import
+
+- db.connection의 client / 컬렉션을 벤치마크용으로 교체하므로 db.* / cogs.*보다 먼저 호출해야 함
+- backend.round_trips: 지금까지 DB로 보낸 명령 수 (인메모리는 연산 호출 수)
+- 인메모리 구현은 봇이 실제로 쓰는 연산/연산자만 지원
+  user_id 일치 조건만 해시로 찾고 나머지 조회는 전체 스캔, modified_count는 matched_count와 같게 보고
+"""
+import asyncio
+import os
+from types import SimpleNamespace
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import DeleteMany, DeleteOne, InsertOne, ReplaceOne, UpdateMany, UpdateOne, monitoring
+
+BENCH_DATABASE = "watchers_bench"
+# 인메모리 backend에서 해시로 찾는 필드 (봇의 조회/갱신은 대부분 user_id 기준)
+INDEXED_FIELD = "user_id"
+_IGNORED_COMMANDS = frozenset({"hello", "ismaster", "isMaster", "ping", "endSessions", "buildInfo"})
+
+
+# ---- 쿼리 / 업데이트 ----
+
+_MISSING = object()
+
+
+def _get(doc: dict, path: str):
+    value = doc
+    for part in path.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return _MISSING
+        value = value[part]
+    return value
+
+
+def _set(doc: dict, path: str, value):
+    parts = path.split(".")
+    for part in parts[:-1]:
+        doc = doc.setdefault(part, {})
+    doc[parts[-1]] = value
+
+
+def _unset(doc: dict, path: str):
+    parts = path.split(".")
+    for part in parts[:-1]:
+        doc = doc.get(part)
+        if not isinstance(doc, dict):
+            return
+    doc.pop(parts[-1], None)
+
+
+def _compare(value, arg, op) -> bool:
+    if value is _MISSING or value is None:
+        return False
+    try:
+        return op(value, arg)
+    except TypeError:
+        return False
+
+
+_OPERATORS = {
+    "$eq": lambda value, arg: _equals(value, arg),
+    "$ne": lambda value, arg: not _equals(value, arg),
+    "$in": lambda value, arg: any(_equals(value, item) for item in arg),
+    "$nin": lambda value, arg: not any(_equals(value, item) for item in arg),
+    "$exists": lambda value, arg: (value is not _MISSING) == bool(arg),
+    "$gt": lambda value, arg: _compare(value, arg, lambda a, b: a > b),
+    "$gte": lambda value, arg: _compare(value, arg, lambda a, b: a >= b),
+    "$lt": lambda value, arg: _compare(value, arg, lambda a, b: a < b),
+    "$lte": lambda value, arg: _compare(value, arg, lambda a, b: a <= b),
+}
+
+
+def _equals(value, arg) -> bool:
+    if value is _MISSING:
+        return arg is None
+    if isinstance(value, list) and not isinstance(arg, list):
+        return arg in value
+    return value == arg
+
+
+def matches(doc: dict, query: dict) -> bool:
+    for key, cond in query.items():
+        if key == "$or":
+            if not any(matches(doc, sub) for sub in cond):
+                return False
+            continue
+        if key == "$and":
+            if not all(matches(doc, sub) for sub in cond):
+                return False
+            continue
+        value = _get(doc, key)
+        if isinstance(cond, dict) and cond and all(op.startswith("$") for op in cond):
+            for op, arg in cond.items():
+                if op not in _OPERATORS:
+                    raise NotImplementedError(f"query operator {op}")
+                if not _OPERATORS[op](value, arg):
+                    return False
+        elif not _equals(value, cond):
+            return False
+    return True
+
+
+def apply_update(doc: dict, update: dict, inserting: bool):
+    for op, fields in update.items():
+        for path, value in fields.items():
+            if op == "$set" or (op == "$setOnInsert" and inserting):
+                _set(doc, path, value)
+            elif op == "$inc":
+                current = _get(doc, path)
+                _set(doc, path, (0 if current is _MISSING else current) + value)
+            elif op == "$unset":
+                _unset(doc, path)
+            elif op == "$max":
+                current = _get(doc, path)
+                if current is _MISSING or value > current:
+                    _set(doc, path, value)
+            elif op != "$setOnInsert":
+                raise NotImplementedError(f"update operator {op}")
+
+
+def _upsert_base(query: dict) -> dict:
+    # 필터의 단순 일치 조건을 새 문서의 필드로 사용
+    doc = {"_id": ObjectId()}
+    for key, cond in query.items():
+        if key.startswith("$") or (isinstance(cond, dict) and any(op.startswith("$") for op in cond)):
+            continue
+        _set(doc, key, cond)
+    return doc
+
+
+def _copy(doc: dict) -> dict:
+    return {key: value.copy() if isinstance(value, (dict, list)) else value for key, value in doc.items()}
+
+
+def _project(doc: dict, projection) -> dict:
+    if not projection:
+        return _copy(doc)
+    if isinstance(projection, (list, tuple)):
+        projection = dict.fromkeys(projection, 1)
+    include_id = projection.get("_id", 1)
+    fields = {key: flag for key, flag in projection.items() if key != "_id"}
+    copied = _copy(doc)
+    if fields and all(fields.values()):
+        result = {key: copied[key] for key in fields if key in copied}
+        if include_id and "_id" in copied:
+            result["_id"] = copied["_id"]
+        return result
+    result = {key: value for key, value in copied.items() if fields.get(key, 1)}
+    if not include_id:
+        result.pop("_id", None)
+    return result
+
+
+def _sort_docs(docs: list[dict], keys: list[tuple[str, int]]) -> list[dict]:
+    # 뒤 키부터 안정 정렬 (없는 값은 오름차순에서 가장 앞)
+    for key, direction in reversed(keys):
+        docs.sort(
+            key=lambda doc: (0, 0) if _get(doc, key) in (_MISSING, None) else (1, _get(doc, key)),
+            reverse=direction < 0,
+        )
+    return docs
+
+
+def _sort_spec(key_or_list, direction=None) -> list[tuple[str, int]]:
+    if isinstance(key_or_list, str):
+        return [(key_or_list, direction or 1)]
+    if isinstance(key_or_list, dict):
+        return list(key_or_list.items())
+    return list(key_or_list)
+
+
+# ---- 집계 ----
+
+def _expr(doc: dict, expr):
+    if isinstance(expr, str) and expr.startswith("$"):
+        value = _get(doc, expr[1:])
+        return None if value is _MISSING else value
+    if isinstance(expr, dict):
+        return {key: _expr(doc, value) for key, value in expr.items()}
+    return expr
+
+
+def _group(docs: list[dict], spec: dict) -> list[dict]:
+    groups: dict = {}
+    for doc in docs:
+        group_id = _expr(doc, spec["_id"])
+        key = repr(group_id)
+        acc = groups.get(key)
+        if acc is None:
+            acc = groups[key] = {"_id": group_id}
+        for field, accumulator in spec.items():
+            if field == "_id":
+                continue
+            (op, arg), = accumulator.items()
+            value = _expr(doc, arg)
+            if op == "$sum":
+                acc[field] = acc.get(field, 0) + (value if isinstance(value, (int, float)) else 0)
+            elif op == "$last":
+                acc[field] = value
+            elif op == "$first":
+                acc.setdefault(field, value)
+            elif op == "$max":
+                acc[field] = value if field not in acc or value > acc[field] else acc[field]
+            elif op == "$min":
+                acc[field] = value if field not in acc or value < acc[field] else acc[field]
+            else:
+                raise NotImplementedError(f"group accumulator {op}")
+    return list(groups.values())
+
+
+def _project_stage(doc: dict, spec: dict) -> dict:
+    result = {} if spec.get("_id", 1) == 0 else {"_id": doc.get("_id")}
+    for field, value in spec.items():
+        if field == "_id":
+            continue
+        if value in (1, True):
+            if field in doc:
+                result[field] = doc[field]
+        else:
+            result[field] = _expr(doc, value)
+    return result
+
+
+# ---- Motor 호환 객체 ----
+
+class FakeCursor:
+    def __init__(self, collection: "FakeCollection", load):
+        self._collection = collection
+        self._load = load
+        self._sort: list[tuple[str, int]] = []
+        self._skip = 0
+        self._limit = 0
+        self._docs = None
+
+    def sort(self, key_or_list, direction=None):
+        self._sort = _sort_spec(key_or_list, direction)
+        return self
+
+    def skip(self, count: int):
+        self._skip = count
+        return self
+
+    def limit(self, count: int):
+        self._limit = count
+        return self
+
+    async def _fetch(self) -> list[dict]:
+        await self._collection._round_trip()
+        docs = self._load()
+        if self._sort:
+            docs = _sort_docs(docs, self._sort)
+        docs = docs[self._skip:]
+        return docs[:self._limit] if self._limit else docs
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._docs is None:
+            self._docs = iter(await self._fetch())
+        try:
+            return next(self._docs)
+        except StopIteration:
+            raise StopAsyncIteration
+
+    async def to_list(self, length=None):
+        docs = await self._fetch()
+        return docs[:length] if length else docs
+
+
+class FakeCollection:
+    def __init__(self, database: "FakeDatabase", name: str):
+        self.database = database
+        self.name = name
+        self.docs: list[dict] = []
+        self._index: dict = {}
+
+    def _index_add(self, doc: dict):
+        key = doc.get(INDEXED_FIELD)
+        if isinstance(key, str):
+            self._index.setdefault(key, []).append(doc)
+
+    def _index_remove(self, doc: dict):
+        bucket = self._index.get(doc.get(INDEXED_FIELD))
+        if bucket and any(item is doc for item in bucket):
+            bucket[:] = [item for item in bucket if item is not doc]
+
+    def _reindex(self):
+        self._index = {}
+        for doc in self.docs:
+            self._index_add(doc)
+
+    def _candidates(self, query: dict | None) -> list[dict]:
+        key = query.get(INDEXED_FIELD) if query else None
+        if isinstance(key, str):
+            return self._index.get(key, [])
+        return self.docs
+
+    async def _round_trip(self):
+        client = self.database.client
+        client.round_trips += 1
+        if client.latency:
+            await asyncio.sleep(client.latency)
+
+    def _matching(self, query: dict | None) -> list[dict]:
+        if not query:
+            return list(self.docs)
+        return [doc for doc in self._candidates(query) if matches(doc, query)]
+
+    def _first(self, query: dict | None, sort=None) -> dict | None:
+        if sort:
+            docs = _sort_docs(self._matching(query), _sort_spec(sort))
+            return docs[0] if docs else None
+        for doc in self._candidates(query):
+            if not query or matches(doc, query):
+                return doc
+        return None
+
+    def _apply(self, doc: dict, update: dict, inserting: bool):
+        self._index_remove(doc)
+        apply_update(doc, update, inserting)
+        self._index_add(doc)
+
+    # 조회
+    def find(self, filter=None, projection=None, **kwargs):
+        return FakeCursor(self, lambda: [_project(doc, projection) for doc in self._matching(filter)])
+
+    async def find_one(self, filter=None, projection=None, **kwargs):
+        await self._round_trip()
+        doc = self._first(filter, kwargs.get("sort"))
+        return None if doc is None else _project(doc, projection)
+
+    async def count_documents(self, filter, **kwargs):
+        await self._round_trip()
+        return len(self._matching(filter))
+
+    async def estimated_document_count(self, **kwargs):
+        await self._round_trip()
+        return len(self.docs)
+
+    def aggregate(self, pipeline: list[dict], **kwargs):
+        def run():
+            docs = None
+            for stage in pipeline:
+                (name, spec), = stage.items()
+                if name == "$match":
+                    docs = self._matching(spec) if docs is None else [doc for doc in docs if matches(doc, spec)]
+                    continue
+                if docs is None:
+                    docs = list(self.docs)
+                if name == "$group":
+                    docs = _group(docs, spec)
+                elif name == "$sort":
+                    docs = _sort_docs(list(docs), _sort_spec(spec))
+                elif name == "$limit":
+                    docs = docs[:spec]
+                elif name == "$skip":
+                    docs = docs[spec:]
+                elif name == "$project":
+                    docs = [_project_stage(doc, spec) for doc in docs]
+                elif name == "$out":
+                    target = self.database[spec]
+                    target.docs = [{"_id": ObjectId(), **doc} if "_id" not in doc else doc for doc in docs]
+                    target._reindex()
+                    docs = []
+                else:
+                    raise NotImplementedError(f"aggregate stage {name}")
+            return [_copy(doc) for doc in (self.docs if docs is None else docs)]
+        return FakeCursor(self, run)
+
+    # 쓰기
+    def _insert(self, doc: dict):
+        doc = _copy(doc)
+        doc.setdefault("_id", ObjectId())
+        self.docs.append(doc)
+        self._index_add(doc)
+        return doc["_id"]
+
+    async def insert_one(self, document: dict, **kwargs):
+        await self._round_trip()
+        return SimpleNamespace(inserted_id=self._insert(document), acknowledged=True)
+
+    async def insert_many(self, documents, ordered: bool = True, **kwargs):
+        await self._round_trip()
+        return SimpleNamespace(inserted_ids=[self._insert(doc) for doc in documents], acknowledged=True)
+
+    def _update(self, filter: dict, update: dict, upsert: bool, multi: bool) -> tuple[int, int, object]:
+        targets = self._matching(filter) if multi else [doc for doc in [self._first(filter)] if doc is not None]
+        if not targets:
+            if not upsert:
+                return 0, 0, None
+            doc = _upsert_base(filter)
+            apply_update(doc, update, inserting=True)
+            return 0, 0, self._insert(doc)
+        for doc in targets:
+            self._apply(doc, update, inserting=False)
+        return len(targets), len(targets), None
+
+    def _replace(self, filter: dict, replacement: dict, upsert: bool) -> tuple[int, int, object]:
+        doc = self._first(filter)
+        if doc is None:
+            if not upsert:
+                return 0, 0, None
+            return 0, 0, self._insert(replacement)
+        _id = doc["_id"]
+        self._index_remove(doc)
+        doc.clear()
+        doc.update(_copy(replacement), _id=_id)
+        self._index_add(doc)
+        return 1, 1, None
+
+    def _delete(self, filter: dict, multi: bool) -> int:
+        if multi:
+            before = len(self.docs)
+            self.docs = [doc for doc in self.docs if not matches(doc, filter)]
+            self._reindex()
+            return before - len(self.docs)
+        doc = self._first(filter)
+        if doc is None:
+            return 0
+        self._index_remove(doc)
+        self.docs = [item for item in self.docs if item is not doc]
+        return 1
+
+    @staticmethod
+    def _update_result(matched: int, modified: int, upserted_id) -> SimpleNamespace:
+        return SimpleNamespace(matched_count=matched, modified_count=modified, upserted_id=upserted_id, acknowledged=True)
+
+    async def update_one(self, filter, update, upsert: bool = False, **kwargs):
+        await self._round_trip()
+        return self._update_result(*self._update(filter, update, upsert, multi=False))
+
+    async def update_many(self, filter, update, upsert: bool = False, **kwargs):
+        await self._round_trip()
+        return self._update_result(*self._update(filter, update, upsert, multi=True))
+
+    async def replace_one(self, filter, replacement, upsert: bool = False, **kwargs):
+        await self._round_trip()
+        return self._update_result(*self._replace(filter, replacement, upsert))
+
+    async def delete_one(self, filter, **kwargs):
+        await self._round_trip()
+        return SimpleNamespace(deleted_count=self._delete(filter, multi=False), acknowledged=True)
+
+    async def delete_many(self, filter, **kwargs):
+        await self._round_trip()
+        return SimpleNamespace(deleted_count=self._delete(filter, multi=True), acknowledged=True)
+
+    async def find_one_and_update(self, filter, update, projection=None, upsert: bool = False, return_document: bool = False, **kwargs):
+        await self._round_trip()
+        doc = self._first(filter, kwargs.get("sort"))
+        if doc is None:
+            if not upsert:
+                return None
+            doc = _upsert_base(filter)
+            apply_update(doc, update, inserting=True)
+            self._insert(doc)
+            return _project(doc, projection) if return_document else None
+        before = _project(doc, projection)
+        self._apply(doc, update, inserting=False)
+        return _project(doc, projection) if return_document else before
+
+    async def bulk_write(self, requests, ordered: bool = True, **kwargs):
+        await self._round_trip()
+        counts = {"inserted_count": 0, "matched_count": 0, "modified_count": 0, "deleted_count": 0, "upserted_count": 0}
+        upserted_ids = {}
+        for idx, request in enumerate(requests):
+            if isinstance(request, InsertOne):
+                self._insert(request._doc)
+                counts["inserted_count"] += 1
+                continue
+            if isinstance(request, (DeleteOne, DeleteMany)):
+                counts["deleted_count"] += self._delete(request._filter, multi=isinstance(request, DeleteMany))
+                continue
+            if isinstance(request, ReplaceOne):
+                matched, modified, upserted_id = self._replace(request._filter, request._doc, request._upsert)
+            elif isinstance(request, (UpdateOne, UpdateMany)):
+                matched, modified, upserted_id = self._update(
+                    request._filter, request._doc, request._upsert, multi=isinstance(request, UpdateMany)
+                )
+            else:
+                raise NotImplementedError(f"bulk_write request {type(request).__name__}")
+            counts["matched_count"] += matched
+            counts["modified_count"] += modified
+            if upserted_id is not None:
+                counts["upserted_count"] += 1
+                upserted_ids[idx] = upserted_id
+        return SimpleNamespace(**counts, upserted_ids=upserted_ids, acknowledged=True)
+
+    # 인덱스는 흉내만 냄
+    async def create_index(self, keys, **kwargs):
+        return kwargs.get("name", "index")
+
+    async def create_indexes(self, indexes, **kwargs):
+        return [index.document["name"] for index in indexes]
+
+    async def drop(self, **kwargs):
+        self.docs = []
+        self._index = {}
+
+
+class FakeDatabase:
+    def __init__(self, client: "FakeClient", name: str):
+        self.client = client
+        self.name = name
+        self._collections: dict[str, FakeCollection] = {}
+
+    def __getitem__(self, name: str) -> FakeCollection:
+        collection = self._collections.get(name)
+        if collection is None:
+            collection = self._collections[name] = FakeCollection(self, name)
+        return collection
+
+    def __getattr__(self, name: str) -> FakeCollection:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+    async def command(self, command, *args, **kwargs):
+        # 단일 서버처럼 응답 (setName 없음 → 트랜잭션 미사용 경로)
+        return {"ok": 1.0, "isWritablePrimary": True}
+
+    async def list_collection_names(self, **kwargs):
+        return [name for name, collection in self._collections.items() if collection.docs]
+
+
+class FakeClient:
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.round_trips = 0
+        self._databases: dict[str, FakeDatabase] = {}
+
+    def __getitem__(self, name: str) -> FakeDatabase:
+        database = self._databases.get(name)
+        if database is None:
+            database = self._databases[name] = FakeDatabase(self, name)
+        return database
+
+    def __getattr__(self, name: str) -> FakeDatabase:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+    async def start_session(self, **kwargs):
+        raise NotImplementedError("transactions are not supported by the in-memory backend")
+
+
+# ---- 연결 ----
+
+class _RoundTripCounter(monitoring.CommandListener):
+    def __init__(self):
+        self.count = 0
+
+    def started(self, event):
+        if event.command_name not in _IGNORED_COMMANDS:
+            self.count += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+class Backend:
+    def __init__(self, name: str, database, counter):
+        self.name = name
+        self.database = database
+        self._counter = counter
+
+    @property
+    def round_trips(self) -> int:
+        return self._counter()
+
+    async def reset(self):
+        """벤치마크 DB의 모든 컬렉션 비우기"""
+        for name in await self.database.list_collection_names():
+            await self.database[name].drop()
+
+
+def connect(target: str = "memory", latency_ms: float = 0.0, database: str = BENCH_DATABASE) -> Backend:
+    """
+    target: "memory" 또는 mongodb:// URI
+    - mongod를 쓰는 경우에도 watchersdb가 아닌 별도 DB(database)를 사용
+    """
+    if database == "watchersdb":
+        raise ValueError("refusing to run benchmarks against the production database name")
+
+    if target == "memory":
+        client = FakeClient(latency=latency_ms / 1000)
+        backend_name, counter = "memory", lambda: client.round_trips
+    else:
+        os.environ["MONGODB_URI"] = target
+        listener = _RoundTripCounter()
+        # db.connection에서 만드는 client에도 적용되도록 import 전에 전역 등록
+        monitoring.register(listener)
+        from db import connection
+        client = connection.client
+        backend_name, counter = "mongodb", lambda: listener.count
+
+    from db import connection
+    connection.client = client
+    connection.db = client[database]
+    for name, value in list(vars(connection).items()):
+        if isinstance(value, AsyncIOMotorCollection):
+            setattr(connection, name, connection.db[value.name])
+    return Backend(backend_name, connection.db, counter)
@@ -0,0 +1,102 @@
+"""
+Overwatch 승률 API를 흉내내는 로컬 가짜 서버로 fetch_rates의 지연 시간과 연결 재사용을 측정
+
+    python -m benchmarks.overwatch_fake_server --requests 200 --concurrency 8 --latency-ms 30
+
+- 서버는 benchmarks/fixtures/overwatch_rates.json의 payload를 latency-ms 만큼 지연 후 반환
+- pooled: Cog와 같은 공유 세션(keep-alive) / no-keepalive: 요청마다 새 연결
+- 결과는 JSON 한 줄로 출력 (커밋 간 비교용)
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from pathlib import Path
+
+import aiohttp
+from aiohttp import web
+
+from cogs.overwatch_rates import HEADERS, HTTP_TIMEOUT, create_http_session, fetch_rates
+
+FIXTURES = Path(__file__).parent / "fixtures" / "overwatch_rates.json"
+
+
+def build_app(payload: dict, latency: float, peers: set) -> web.Application:
+    async def rates(request: web.Request) -> web.Response:
+        peers.add(request.transport.get_extra_info("peername"))
+        if latency:
+            await asyncio.sleep(latency)
+        return web.json_response(payload)
+
+    app = web.Application()
+    app.router.add_get("/ko-kr/rates/data/", rates)
+    return app
+
+
+async def run_client(session: aiohttp.ClientSession, url: str, total: int, concurrency: int) -> list[float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    params = {"input": "PC", "region": "Asia", "map": "all-maps", "role": "All", "rq": "1", "tier": "All"}
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            await fetch_rates(session, params, log_id="", url=url)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    await asyncio.gather(*(one() for _ in range(total)))
+    return latencies
+
+
+def summarize(name: str, latencies: list[float], connections: int, elapsed: float) -> dict:
+    ordered = sorted(latencies)
+    return {
+        "mode": name,
+        "requests": len(latencies),
+        "connections": connections,
+        "requests_per_sec": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(statistics.median(ordered), 2),
+        "p99_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))], 2),
+        "mean_ms": round(statistics.fmean(ordered), 2),
+    }
+
+
+async def main(args) -> list[dict]:
+    payload = json.loads(FIXTURES.read_text(encoding="utf-8"))["all_maps_competitive_all"]
+    peers: set = set()
+    runner = web.AppRunner(build_app(payload, args.latency_ms / 1000, peers))
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", args.port)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    url = f"http://127.0.0.1:{port}/ko-kr/rates/data/"
+
+    sessions = {
+        "pooled": create_http_session,
+        "no-keepalive": lambda: aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(force_close=True), timeout=HTTP_TIMEOUT, headers=HEADERS
+        ),
+    }
+    results = []
+    try:
+        for name, factory in sessions.items():
+            peers.clear()
+            async with factory() as session:
+                started = time.perf_counter()
+                latencies = await run_client(session, url, args.requests, args.concurrency)
+                elapsed = time.perf_counter() - started
+            results.append(summarize(name, latencies, len(peers), elapsed))
+    finally:
+        await runner.cleanup()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=30)
+    parser.add_argument("--port", type=int, default=0)
+    for result in asyncio.run(main(parser.parse_args())):
+        print(json.dumps(result))
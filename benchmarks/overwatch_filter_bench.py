@@ -0,0 +1,208 @@
+"""
+승률 응답 필터링/Top 5 선택 마이크로 벤치마크 (benchmarks/fixtures/overwatch_rates.json 기준)
+
+    python -m benchmarks.overwatch_filter_bench --repeat 2000
+
+- legacy: 기존 _filter_by_map → _filter_by_rq → _filter_by_tier → _filter_by_role → _extract_stats → 정렬
+- decode+rank: 응답마다 RatesTable로 디코딩 후 조회 (캐시 miss)
+- rank: 한 번 디코딩한 RatesTable에 조건만 바꿔 조회 (캐시 hit, /승률-보기의 일반적인 경로)
+- 각 fixture와 map/rq/tier/role 조합에 대해 결과가 같은지 먼저 확인한 뒤 측정
+- flat_*: 같은 데이터를 다른 키 구성(최상위 heroName/winRate/map/rq/tier)으로 바꾼 payload
+- 결과는 fixture별 JSON 한 줄로 출력 (커밋 간 비교용)
+"""
+import argparse
+import itertools
+import json
+import time
+from pathlib import Path
+from typing import Any, Iterable
+
+from cogs.overwatch_rates import (
+    RatesTable,
+    _extract_items,
+    _normalize_map_value,
+    _parse_win_rate,
+)
+from utils.overwatch_normalize import normalize_role, normalize_tier
+
+FIXTURES = Path(__file__).parent / "fixtures" / "overwatch_rates.json"
+
+ROLES = ["All", "Tank", "Damage", "Support"]
+TIERS = ["All", "Gold", "Grandmaster"]
+MAPS = ["all-maps", "kings-row", "ilios"]
+RQS = ["0", "1"]
+
+
+# ---- 기존 구현 (비교 기준) ----
+
+def legacy_extract_stats(items: Iterable[dict]) -> list[tuple[str, float]]:
+    results = []
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        hero_val = item.get("hero") or item.get("heroName") or item.get("name") or item.get("hero_name")
+        if isinstance(hero_val, dict):
+            name = hero_val.get("name") or hero_val.get("key") or hero_val.get("value")
+        else:
+            name = hero_val
+        win_rate = item.get("winRate") or item.get("win_rate") or item.get("winrate") or item.get("winRatePct")
+        if win_rate is None and isinstance(item.get("cells"), dict):
+            win_rate = item["cells"].get("winrate") or item["cells"].get("winRate")
+        if isinstance(win_rate, dict):
+            win_rate = win_rate.get("value") or win_rate.get("percent") or win_rate.get("pct")
+        win_rate = _parse_win_rate(win_rate)
+        if name and win_rate is not None:
+            results.append((str(name), float(win_rate)))
+    return results
+
+
+def legacy_filter_by_map(items: list[dict], map_value: str) -> list[dict]:
+    if not map_value:
+        return list(items)
+    map_norm = _normalize_map_value(map_value)
+    if not map_norm or map_norm == "all-maps":
+        return list(items)
+    filtered = []
+    for item in items:
+        candidate = (
+            item.get("map") or item.get("mapName") or item.get("map_name")
+            or item.get("mapId") or item.get("mapSlug") or item.get("mapKey")
+        )
+        candidate_norm = _normalize_map_value(candidate)
+        if candidate_norm and candidate_norm == map_norm:
+            filtered.append(item)
+    return filtered or list(items)
+
+
+def legacy_filter_by_role(items: list[dict], role: str) -> list[dict]:
+    role_norm = normalize_role(role)
+    if role_norm == "All":
+        return list(items)
+    filtered = []
+    for item in items:
+        hero = item.get("hero")
+        if not isinstance(hero, dict):
+            hero = {}
+        hero_role = hero.get("role") or item.get("role") or item.get("heroRole")
+        if isinstance(hero_role, str) and hero_role.upper() == role_norm.upper():
+            filtered.append(item)
+    return filtered
+
+
+def legacy_filter_by_tier(items: list[dict], tier: str | None) -> list[dict]:
+    if not tier:
+        return list(items)
+    tier_norm = normalize_tier(tier)
+    if not isinstance(tier_norm, str) or tier_norm.lower() == "all":
+        return list(items)
+    filtered = []
+    for item in items:
+        item_tier = item.get("tier") or item.get("rank") or item.get("tierName")
+        if isinstance(item_tier, dict):
+            item_tier = item_tier.get("name") or item_tier.get("value") or item_tier.get("key")
+        if isinstance(item_tier, str) and item_tier.lower() == tier_norm.lower():
+            filtered.append(item)
+    return filtered or list(items)
+
+
+def legacy_filter_by_rq(items: list[dict], rq_value: str | None) -> list[dict]:
+    if rq_value is None:
+        return list(items)
+    filtered = []
+    for item in items:
+        item_rq = item.get("rq") or item.get("mode") or item.get("queue") or item.get("queueId")
+        if isinstance(item_rq, int):
+            item_rq = str(item_rq)
+        if isinstance(item_rq, str) and item_rq == str(rq_value):
+            filtered.append(item)
+    return filtered or list(items)
+
+
+def legacy_top_rates(data: Any, params: dict) -> list[tuple[str, float]]:
+    items = list(_extract_items(data))
+    items = legacy_filter_by_map(items, params["map"])
+    items = legacy_filter_by_rq(items, params["rq"])
+    items = legacy_filter_by_tier(items, params["tier"])
+    items = legacy_filter_by_role(items, params["role"])
+    return sorted(legacy_extract_stats(items), key=lambda x: x[1], reverse=True)[:5]
+
+
+# ---- 벤치마크 ----
+
+def flatten(payload: dict, tiers: Iterable[str], maps: Iterable[str]) -> dict:
+    """
+    최상위 키 구성의 payload로 변환 (맵/티어별 행을 복제해 필터가 실제로 걸리도록 함)
+    """
+    rq = payload["selected"]["rq"]
+    rows = []
+    for map_slug, tier in itertools.product(maps, tiers):
+        for idx, item in enumerate(payload["rates"]):
+            win_rate = item["cells"]["winrate"] + (idx % 3) - 1
+            rows.append({
+                "heroName": item["hero"]["name"],
+                "role": item["hero"]["role"].upper(),
+                "winRate": f"{win_rate:.1f}%",
+                "map": {"slug": map_slug},
+                "rq": int(rq),
+                "tier": tier,
+            })
+    return {"data": rows}
+
+
+def param_combinations() -> list[dict]:
+    return [
+        {"map": map_slug, "rq": rq, "tier": tier, "role": role}
+        for map_slug, rq, tier, role in itertools.product(MAPS, RQS, TIERS, ROLES)
+    ]
+
+
+def measure(fn, data: Any, combos: list[dict], repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for params in combos:
+            fn(data, params)
+    elapsed = time.perf_counter() - started
+    return elapsed / (repeat * len(combos)) * 1_000_000
+
+
+def decode_and_rank(data: Any, params: dict) -> list[tuple[str, float]]:
+    return RatesTable.from_payload(data, params).rank(params)
+
+
+def main(args) -> list[dict]:
+    fixtures = json.loads(FIXTURES.read_text(encoding="utf-8"))
+    payloads = dict(fixtures)
+    for name, payload in fixtures.items():
+        payloads[f"flat_{name}"] = flatten(payload, ["Gold", "Diamond"], ["kings-row", "circuit-royal"])
+
+    combos = param_combinations()
+    results = []
+    for name, data in payloads.items():
+        selected = fixtures.get(name, {}).get("selected", {})
+        table = RatesTable.from_payload(data, selected)
+        for params in combos:
+            expected = legacy_top_rates(data, params)
+            for actual in (decode_and_rank(data, params), table.rank(params)):
+                if expected != actual:
+                    raise AssertionError(f"{name} {params}: {expected} != {actual}")
+
+        legacy_us = measure(legacy_top_rates, data, combos, args.repeat)
+        decode_us = measure(decode_and_rank, data, combos, args.repeat)
+        rank_us = measure(lambda _, params: table.rank(params), data, combos, args.repeat)
+        results.append({
+            "fixture": name,
+            "items": len(_extract_items(data)),
+            "queries": len(combos) * args.repeat,
+            "legacy_us": round(legacy_us, 2),
+            "decode_rank_us": round(decode_us, 2),
+            "rank_us": round(rank_us, 2),
+            "speedup": round(legacy_us / rank_us, 2),
+        })
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=200)
+    for result in main(parser.parse_args()):
+        print(json.dumps(result))
@@ -0,0 +1,150 @@
+"""
+voice_sessions 벤치마크 데이터 생성기 (+ 같은 내용의 일/주/월 사전 집계 컬렉션)
+
+    python -m benchmarks.voice_sessions_data --count 100000 --mongo mongodb://localhost:27017
+
+- 유저별 활동량은 Zipf 분포 (소수 유저가 대부분의 세션을 차지)
+- 시작 시각은 저녁~새벽(KST)에 몰리고, 길이는 로그정규 분포(중앙값 약 40분, 최대 10시간)라 자정을 넘기는 세션이 자연스럽게 생김
+- 최근 --months개월(이번 달 포함)에 고르게 분포, 문서 형태는 build_voice_session과 동일
+- 사전 집계(voice_daily/weekly/monthly_totals)는 write-behind가 $inc로 쌓는 결과와 같은 값으로 한 번에 기록
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+
+from dateutil.relativedelta import relativedelta
+
+os.environ.setdefault("LOG_LEVEL", "CRITICAL")
+
+from benchmarks.mongo_backend import BENCH_DATABASE, connect
+
+KST = timezone(timedelta(hours=9))
+USER_ID_BASE = 100_000_000_000_000_000
+
+# KST 시각별 세션 시작 가중치 (0시 ~ 23시)
+HOUR_WEIGHTS = [6, 4, 2, 1, 1, 1, 1, 1, 2, 2, 3, 3, 4, 4, 4, 5, 5, 6, 8, 10, 12, 13, 12, 9]
+MEDIAN_SESSION_SECONDS = 40 * 60
+MIN_SESSION_SECONDS = 60
+MAX_SESSION_SECONDS = 10 * 60 * 60
+ZIPF_EXPONENT = 1.1
+
+
+def generate_sessions(count: int, users: int, months: int, seed: int = 42, now: datetime | None = None):
+    """
+    voice_sessions 문서 count개를 생성 (종료 시각이 now를 넘지 않음)
+    """
+    from db.voice_sessions import build_voice_session
+
+    rng = random.Random(seed)
+    now = now or datetime.now(timezone.utc)
+    now_kst = now.astimezone(KST)
+    window_start = (now_kst.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+                    - relativedelta(months=months - 1))
+    window_days = (now_kst - window_start).days + 1
+
+    user_weights = list(accumulate(1 / (rank + 1) ** ZIPF_EXPONENT for rank in range(users)))
+    hour_weights = list(accumulate(HOUR_WEIGHTS))
+    mu = math.log(MEDIAN_SESSION_SECONDS)
+
+    generated = 0
+    while generated < count:
+        user = rng.choices(range(users), cum_weights=user_weights)[0]
+        day = window_start + timedelta(days=rng.randrange(window_days))
+        hour = rng.choices(range(24), cum_weights=hour_weights)[0]
+        start = day + timedelta(hours=hour, seconds=rng.randrange(3600))
+        duration = int(min(MAX_SESSION_SECONDS, max(MIN_SESSION_SECONDS, rng.lognormvariate(mu, 1.0))))
+        end = start + timedelta(seconds=duration)
+        if end > now_kst:
+            continue
+        generated += 1
+        yield build_voice_session(str(USER_ID_BASE + user), f"user{user}", start, end, duration)
+
+
+def rollup_documents(sessions: list[dict]) -> dict[str, list[dict]]:
+    """
+    세션 목록 → 컬렉션 이름별 사전 집계 문서 (db/voice_rollups.py의 키 구성과 동일)
+    """
+    daily: dict[tuple, dict] = {}
+    weekly: dict[tuple, dict] = {}
+    monthly: dict[tuple, dict] = {}
+    for session in sessions:
+        user_id = session["user_id"]
+        year, month, week = session["kst_year"], session["kst_month"], session["kst_week_of_month"]
+        seconds = session["duration_seconds"]
+        for totals, key, fields in (
+            (daily, (user_id, session["kst_date"]),
+             {"kst_date": session["kst_date"], "kst_year": year, "kst_month": month, "kst_week_of_month": week}),
+            (weekly, (user_id, year, month, week), {"kst_year": year, "kst_month": month, "kst_week_of_month": week}),
+            (monthly, (user_id, year, month), {"kst_year": year, "kst_month": month}),
+        ):
+            doc = totals.get(key)
+            if doc is None:
+                doc = totals[key] = {"user_id": user_id, **fields, "total_seconds": 0}
+            doc["username"] = session["username"]
+            doc["total_seconds"] += seconds
+    return {
+        "voice_daily_totals": list(daily.values()),
+        "voice_weekly_totals": list(weekly.values()),
+        "voice_monthly_totals": list(monthly.values()),
+    }
+
+
+async def _insert(collection, docs: list[dict], batch_size: int):
+    for offset in range(0, len(docs), batch_size):
+        await collection.insert_many(docs[offset:offset + batch_size], ordered=False)
+
+
+async def populate(count: int, users: int, months: int, seed: int = 42, batch_size: int = 10_000) -> dict:
+    """
+    connect() 이후 호출 — voice_sessions와 사전 집계 컬렉션을 채우고 소요 시간 반환
+    """
+    from db import connection
+
+    started = time.perf_counter()
+    sessions = list(generate_sessions(count, users, months, seed))
+    rollups = rollup_documents(sessions)
+    generated = time.perf_counter()
+
+    await _insert(connection.voice_sessions, sessions, batch_size)
+    for name, docs in rollups.items():
+        await _insert(getattr(connection, name), docs, batch_size)
+    inserted = time.perf_counter()
+
+    return {
+        "docs": count,
+        "users": users,
+        "months": months,
+        "rollup_docs": {name: len(docs) for name, docs in rollups.items()},
+        "midnight_crossing": sum(
+            1 for session in sessions
+            if session["start_time"].astimezone(KST).date() != session["end_time"].astimezone(KST).date()
+        ),
+        "generate_ms": round((generated - started) * 1000, 1),
+        "insert_ms": round((inserted - generated) * 1000, 1),
+    }
+
+
+async def main(args) -> dict:
+    backend = connect(args.mongo, database=args.database)
+    await backend.reset()
+    result = await populate(args.count, args.users, args.months, args.seed)
+    from db.indexes import ensure_indexes
+    await ensure_indexes()
+    return {"backend": backend.name, "database": args.database, **result}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongo", default="memory", help="memory 또는 mongodb:// URI")
+    parser.add_argument("--database", default=BENCH_DATABASE)
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=3000)
+    parser.add_argument("--months", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=42)
+    print(json.dumps(asyncio.run(main(parser.parse_args()))))
@@ -1,5 +1,6 @@
 from discord.ext import commands
 from discord import app_commands
+from utils.metrics_utils import timed
 
 # Master, Organizer만 사용할 수 있는 명령어를 만들어주는 Decorator
 
@@ -24,3 +25,17 @@ def is_member_or_above_appcmd():
         user_roles = {role.name for role in getattr(interaction.user, "roles", [])}
         return bool(allowed_roles & user_roles) or interaction.user.guild_permissions.administrator
     return app_commands.check(predicate)
+
+# Cog의 앱 명령어 / 리스너 실행 시간을 metrics_utils에 기록 (bot.add_cog 전에 호출)
+# 이름: "command./명령어", "event.Cog이름.메서드"
+
+def instrument_cog(cog):
+    for command in cog.__cog_app_commands__:
+        targets = command.walk_commands() if isinstance(command, app_commands.Group) else (command,)
+        for target in targets:
+            if isinstance(target, app_commands.Command):
+                target._callback = timed(f"command./{target.qualified_name}")(target._callback)
+    for method_name in {method_name for _, method_name in cog.__cog_listeners__}:
+        listener = getattr(cog, method_name)
+        setattr(cog, method_name, timed(f"event.{cog.qualified_name}.{method_name}")(listener))
+    return cog
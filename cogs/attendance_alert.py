@@ -1,6 +1,6 @@
 from discord.ext import commands
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from db.mongo import collection
+from db.mongo import find_inactive_users
 from utils.time_utils import to_kst, KST_DISPLAY_FORMAT
 from settings import ALERT_CHANNEL_ID, ROLE_MASTER_MENTION, ROLE_ORGANIZER_MENTION
 from datetime import datetime, timezone
@@ -8,9 +8,48 @@ from apscheduler.triggers.cron import CronTrigger
 
 import discord
 from utils.logging_utils import log_bot
+from cogs import instrument_cog
 
 # Refactor: constants moved to settings; values unchanged
 
+ALERT_DAYS = (14, 30)
+MEMBERS_PER_EMBED = 20
+# 메시지 한 건의 embed 제한 (개수 / 모든 embed의 글자 수 합계)
+EMBEDS_PER_MESSAGE = 10
+EMBED_CHARS_PER_MESSAGE = 6000
+
+
+def build_alert_embeds(title: str, lines: list[str]) -> list[discord.Embed]:
+    """
+    멤버 여러 명을 한 embed에 묶어서 알림 (embed당 MEMBERS_PER_EMBED명)
+    """
+    embeds = []
+    for i in range(0, len(lines), MEMBERS_PER_EMBED):
+        chunk = lines[i:i + MEMBERS_PER_EMBED]
+        header = f"{ROLE_MASTER_MENTION} {ROLE_ORGANIZER_MENTION}\n" if i == 0 else ""
+        embeds.append(discord.Embed(
+            title=title,
+            description=header + "\n".join(chunk),
+            color=discord.Color.red()
+        ))
+    return embeds
+
+
+def batch_embeds(embeds: list[discord.Embed]) -> list[list[discord.Embed]]:
+    """
+    embed 목록을 메시지 단위로 나눔 (메시지당 EMBEDS_PER_MESSAGE개, 글자 수 합계 EMBED_CHARS_PER_MESSAGE 이하)
+    """
+    batches: list[list[discord.Embed]] = []
+    size = 0
+    for embed in embeds:
+        if not batches or len(batches[-1]) >= EMBEDS_PER_MESSAGE or size + len(embed) > EMBED_CHARS_PER_MESSAGE:
+            batches.append([])
+            size = 0
+        batches[-1].append(embed)
+        size += len(embed)
+    return batches
+
+
 class AttendanceAlert(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
@@ -25,64 +64,51 @@ class AttendanceAlert(commands.Cog):
         # 현재 시각을 KST datetime으로 생성
         now_kst = to_kst(datetime.now(timezone.utc))
         log_bot("Attendance", f"Check started: {now_kst.isoformat()}")
-        async for user in collection.find({}):
-            user_id = user.get("user_id")
-            username = user.get("username", "알 수 없음")
-            last_active_str = user.get("last_active")
-            if not last_active_str:
-                joined_at = user.get("joined_at_server", None)
-                if not joined_at:
-                    continue  # 입장 시간도 없으면 스킵
-                try:
-                    joined_at_kst = to_kst(joined_at)
-                except Exception:
-                    continue
-                days_inactive = (now_kst - joined_at_kst).days
-                if days_inactive == 14 or days_inactive == 30:
-                    guilds = self.bot.guilds
-                    for guild in guilds:
-                        member = guild.get_member(int(user_id))
-                        if member:
-                            channel = guild.get_channel(ALERT_CHANNEL_ID)
-                            if channel:
-                                joined_at_kor = to_kst(joined_at).strftime(KST_DISPLAY_FORMAT)
-                                embed = discord.Embed(
-                                    title="⚠️ 접속 기록 없음 안내",
-                                    description=(
-                                        f"{ROLE_MASTER_MENTION} {ROLE_ORGANIZER_MENTION}\n"
-                                        f"**{member.mention}** 님은 접속 기록이 아직 없습니다!\n"
-                                        f"서버 입장 시간은 `{joined_at_kor}` 입니다.\n"
-                                        f"{days_inactive}일 동안 접속 기록이 없습니다!"
-                                    ),
-                                    color=discord.Color.red()
-                                )
-                                await channel.send(embed=embed)
+
+        # 14일/30일째 미접속 유저만 DB에서 범위 쿼리로 조회
+        log_id = log_bot("DB Reading", "find inactive users")
+        users = await find_inactive_users(now_kst, days_list=ALERT_DAYS, log_id=log_id)
+        if not users:
+            return
+
+        for guild in self.bot.guilds:
+            channel = guild.get_channel(ALERT_CHANNEL_ID)
+            if not channel:
                 continue
+
+            inactive_lines = []
+            no_record_lines = []
+            for user in users:
+                member = guild.get_member(int(user["user_id"]))
+                if not member:
+                    continue
+                last_active = user.get("last_active")
+                if last_active:
+                    last_active_kst = to_kst(last_active)
+                    days_inactive = (now_kst - last_active_kst).days
+                    inactive_lines.append(
+                        f"**{member.mention}** — 마지막 접속 `{last_active_kst.strftime(KST_DISPLAY_FORMAT)}` ({days_inactive}일)"
+                    )
+                else:
+                    joined_at_kst = to_kst(user["joined_at_server"])
+                    days_inactive = (now_kst - joined_at_kst).days
+                    no_record_lines.append(
+                        f"**{member.mention}** — 서버 입장 `{joined_at_kst.strftime(KST_DISPLAY_FORMAT)}` ({days_inactive}일)"
+                    )
+
+            embeds = [
+                *build_alert_embeds("⚠️ 장기 미접속 안내", inactive_lines),
+                *build_alert_embeds("⚠️ 접속 기록 없음 안내", no_record_lines),
+            ]
             try:
-                last_active_kst = to_kst(last_active_str)
-            except Exception:
+                for batch in batch_embeds(embeds):
+                    await channel.send(embeds=batch)
+            except discord.HTTPException as e:
+                # 한 서버의 전송 실패가 다른 서버의 알림을 막지 않도록 서버 단위로 처리
+                log_bot("Error", f"{guild.name}: attendance alert send failed: {e}")
                 continue
-            seconds_inactive = (now_kst - last_active_kst).total_seconds()
-            days_inactive = (now_kst - last_active_kst).days
-            if days_inactive == 14 or days_inactive == 30:
-                guilds = self.bot.guilds
-                for guild in guilds:
-                    member = guild.get_member(int(user_id))
-                    if member:
-                        channel = guild.get_channel(ALERT_CHANNEL_ID)
-                        if channel:
-                            last_active_kor = to_kst(last_active_str).strftime(KST_DISPLAY_FORMAT)
-                            embed = discord.Embed(
-                                title="⚠️ 장기 미접속 안내",
-                                description=(
-                                    f"{ROLE_MASTER_MENTION} {ROLE_ORGANIZER_MENTION}\n"
-                                    f"**{member.mention}** 님은 마지막 접속일이 `{last_active_kor}` 입니다.\n"
-                                    f"{days_inactive}일 동안 접속하지 않았습니다!"
-                                ),
-                                color=discord.Color.red()
-                            )
-                            await channel.send(embed=embed)
+            log_bot("Attendance", f"{guild.name}: {len(inactive_lines)} inactive, {len(no_record_lines)} no record")
 
 async def setup(bot):
-    await bot.add_cog(AttendanceAlert(bot))
+    await bot.add_cog(instrument_cog(AttendanceAlert(bot)))
     log_bot("Load Complete", "AttendanceAlert Cog loaded")
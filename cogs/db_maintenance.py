@@ -0,0 +1,43 @@
+import asyncio
+
+import discord
+from discord import app_commands, Interaction
+from discord.ext import commands
+
+from cogs import is_master_or_organizer_appcmd, instrument_cog
+from db.migrations import migrate_iso_dates
+from utils.logging_utils import log_bot
+
+
+class DBMaintenance(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self._migration_lock = asyncio.Lock()
+
+    @app_commands.command(name="날짜-마이그레이션", description="[관리]문자열로 저장된 시간 정보를 날짜 타입으로 변환합니다.")
+    @is_master_or_organizer_appcmd()
+    async def migrate_dates(self, interaction: Interaction):
+        if self._migration_lock.locked():
+            await interaction.response.send_message("❌ 이미 마이그레이션이 진행 중입니다.", ephemeral=True)
+            return
+        await interaction.response.defer(thinking=True, ephemeral=True)
+
+        async with self._migration_lock:
+            log_id = log_bot("DB Writing", "migrate iso date strings to BSON dates")
+            results = await migrate_iso_dates(log_id=log_id)
+
+        lines = [
+            f"`{name}`: {'❌ 실패 (다시 실행하면 이어서 진행)' if count is None else f'{count}건 변환'}"
+            for name, count in results.items()
+        ]
+        embed = discord.Embed(
+            title="🗂️ 날짜 마이그레이션 완료",
+            description="\n".join(lines),
+            color=discord.Color.teal()
+        )
+        await interaction.followup.send(embed=embed, ephemeral=True)
+
+
+async def setup(bot):
+    await bot.add_cog(instrument_cog(DBMaintenance(bot)))
+    log_bot("Load Complete", "DBMaintenance Cog loaded")
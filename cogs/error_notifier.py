@@ -1,36 +1,170 @@
+import asyncio
+import os
+import threading
+import time
+
 from discord.ext import commands
 from discord import app_commands, Interaction
-from cogs import is_master_or_organizer_appcmd
-from settings import load_config, update_config
+from cogs import is_master_or_organizer_appcmd, instrument_cog
+from settings import load_config, update_config_async
 from utils.logging_utils import log_bot, set_error_callback
 
+# 에러 알림 묶음 전송 주기(초) / 한 주기에 모을 서로 다른 메시지 수 / 한 주기에 보낼 디스코드 메시지 수
+ERROR_DIGEST_SECONDS = float(os.getenv("ERROR_DIGEST_SECONDS", "15"))
+ERROR_DIGEST_MAX_DISTINCT = int(os.getenv("ERROR_DIGEST_MAX_DISTINCT", "50"))
+ERROR_DIGEST_MAX_MESSAGES = int(os.getenv("ERROR_DIGEST_MAX_MESSAGES", "3"))
+
+DISCORD_MESSAGE_LIMIT = 2000
+MAX_LINE_LENGTH = 300
+
+
+class ErrorDigest:
+    """
+    에러 메시지를 모아 두었다가 주기마다 묶어서 전송하기 위한 버퍼
+    - 같은 메시지는 한 줄로 합치고 발생 횟수만 증가
+    - 서로 다른 메시지가 max_distinct개를 넘으면 이후 메시지는 버리고 suppressed로 집계
+    - 로그는 어느 스레드에서든 올 수 있으므로 lock으로 보호
+    """
+
+    def __init__(self, max_distinct: int):
+        self.max_distinct = max_distinct
+        self._pending: dict[str, list] = {}
+        self._suppressed = 0
+        self._lock = threading.Lock()
+        self._counters = {"received": 0, "suppressed": 0, "digests": 0, "sent_messages": 0}
+
+    def add(self, message: str):
+        with self._lock:
+            self._counters["received"] += 1
+            entry = self._pending.get(message)
+            if entry is not None:
+                entry[0] += 1
+            elif len(self._pending) < self.max_distinct:
+                self._pending[message] = [1, time.time()]
+            else:
+                self._suppressed += 1
+                self._counters["suppressed"] += 1
+
+    def drain(self) -> tuple[list[tuple[str, int]], int]:
+        """
+        모인 (메시지, 횟수) 목록과 버려진 메시지 수를 꺼내고 비움
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            suppressed, self._suppressed = self._suppressed, 0
+        entries = sorted(pending.items(), key=lambda item: item[1][1])
+        return [(message, count) for message, (count, _) in entries], suppressed
+
+    def count(self, name: str, amount: int = 1):
+        with self._lock:
+            self._counters[name] += amount
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._counters, "pending": len(self._pending)}
+
+
+def format_digest(entries: list[tuple[str, int]], suppressed: int, max_messages: int) -> tuple[list[str], int]:
+    """
+    디스코드 메시지 길이 제한에 맞춰 최대 max_messages개의 묶음 메시지 생성
+    - 들어가지 못한 줄의 발생 횟수는 suppressed에 더해 마지막 메시지에 표시
+    - (메시지 목록, 들어가지 못해 생략된 발생 횟수) 반환
+    """
+    lines = []
+    for message, count in entries:
+        if len(message) > MAX_LINE_LENGTH:
+            message = message[:MAX_LINE_LENGTH - 1] + "…"
+        lines.append(f"`×{count}` {message}" if count > 1 else message)
+
+    # 마지막 메시지에 suppressed 안내 줄이 들어갈 자리를 남겨둠
+    budget = DISCORD_MESSAGE_LIMIT - 100
+    chunks: list[list[str]] = []
+    size = budget + 1
+    dropped = 0
+    for idx, line in enumerate(lines):
+        if size + len(line) + 1 > budget:
+            if len(chunks) == max_messages:
+                dropped = sum(count for _, count in entries[idx:])
+                break
+            chunks.append([])
+            size = 0
+        chunks[-1].append(line)
+        size += len(line) + 1
+
+    messages = ["\n".join(chunk) for chunk in chunks]
+    if suppressed + dropped:
+        notice = f"⚠️ 이번 주기에 에러 알림 {suppressed + dropped}건이 생략되었습니다."
+        if messages:
+            messages[-1] += "\n" + notice
+        else:
+            messages.append(notice)
+    return messages, dropped
+
 
 class ErrorNotifier(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.digest = ErrorDigest(max_distinct=ERROR_DIGEST_MAX_DISTINCT)
+        self._task: asyncio.Task | None = None
         set_error_callback(self._handle_error)
 
+    async def cog_load(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def cog_unload(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._send_digest()
+
     def _handle_error(self, message: str):
-        self.bot.loop.create_task(self._send_error(message))
+        # 에러마다 task/전송을 만들지 않고 버퍼에만 적재
+        self.digest.add(message)
 
-    async def _send_error(self, message: str):
-        config = load_config()
-        channel_id = config.get("ERROR_CHANNEL_ID")
+    async def _run(self):
+        while True:
+            await asyncio.sleep(ERROR_DIGEST_SECONDS)
+            await self._send_digest()
+
+    def _error_channel(self):
+        channel_id = load_config().get("ERROR_CHANNEL_ID")
         if not channel_id:
-            return
+            return None
         try:
             channel_id_int = int(channel_id)
         except ValueError:
-            log_bot("Error", "ERROR_CHANNEL_ID is not numeric")
+            log_bot("ErrorNotifier", "ERROR_CHANNEL_ID is not numeric")
+            return None
+        return self.bot.get_channel(channel_id_int)
+
+    async def _send_digest(self):
+        entries, suppressed = self.digest.drain()
+        if not entries and not suppressed:
             return
-        channel = self.bot.get_channel(channel_id_int)
-        if channel:
-            await channel.send(message)
+        channel = self._error_channel()
+        if channel is None:
+            return
+
+        messages, dropped = format_digest(entries, suppressed, ERROR_DIGEST_MAX_MESSAGES)
+        self.digest.count("suppressed", dropped)
+        self.digest.count("digests")
+        for message in messages:
+            try:
+                await channel.send(message)
+                self.digest.count("sent_messages")
+            except Exception as e:
+                # "Error"로 남기면 다시 이 버퍼로 들어오므로 별도 카테고리 사용
+                log_bot("ErrorNotifier", f"error digest send failed: {e}")
+                return
 
     @app_commands.command(name="에러-알림-채널-설정", description="에러 로그를 전송할 채널 ID를 설정합니다.")
     @is_master_or_organizer_appcmd()
     async def set_error_channel(self, interaction: Interaction, channel_id: str):
-        update_config("ERROR_CHANNEL_ID", channel_id)
+        await update_config_async("ERROR_CHANNEL_ID", channel_id)
         await interaction.response.send_message(
             f"[Load Complete] ERROR_CHANNEL_ID set to `{channel_id}`",
             ephemeral=True
@@ -40,12 +174,14 @@ class ErrorNotifier(commands.Cog):
     @is_master_or_organizer_appcmd()
     async def error_test(self, interaction: Interaction):
         log_id = log_bot("Error", "Manual error test")
+        stats = self.digest.stats()
         await interaction.response.send_message(
-            f"[Load Complete] Error test sent (log id: {log_id})",
+            f"[Load Complete] Error test sent (log id: {log_id}) — "
+            f"received {stats['received']}, suppressed {stats['suppressed']}, digests {stats['digests']}",
             ephemeral=True
         )
 
 
 async def setup(bot):
-    await bot.add_cog(ErrorNotifier(bot))
+    await bot.add_cog(instrument_cog(ErrorNotifier(bot)))
     log_bot("Load Complete", "ErrorNotifier Cog loaded")
@@ -1,85 +1,191 @@
+import asyncio
+
 from discord.ext import commands
 from discord import RawReactionActionEvent, Member, Interaction, app_commands
-from db.mongo import save_granted_role
-from cogs import is_master_or_organizer_appcmd
-from settings import load_config, update_config, MEMBER_ROLE_NAME, GUEST_ROLE_NAME
+from db.mongo import save_granted_role, save_granted_roles
+from cogs import is_master_or_organizer_appcmd, instrument_cog
+from settings import config_store, load_config, update_config_async, MEMBER_ROLE_NAME, GUEST_ROLE_NAME
 import discord
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from utils.logging_utils import log_bot
 
 
+# 설정 파일 외부 수정 반영 주기(초) — 명령어로 변경한 경우는 즉시 반영
+TARGET_REFRESH_SECONDS = 60
+# 일괄 부여 시 동시에 처리할 멤버 수 (429 응답은 discord.py가 대기 후 재시도)
+BULK_GRANT_CONCURRENCY = 5
+
+
 class GrantAuthority(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        # 공지 메시지 ID → 부여할 역할 이름 / 반응 이벤트 사전 필터용 집합
+        self._targets: dict[int, str] = {}
+        self._watched: frozenset[int] = frozenset()
+        self._config_version = None
+        # (guild_id, 역할 이름) → 역할 ID
+        self._role_ids: dict[tuple[int, str], int] = {}
+        # 공지 메시지 ID → 반응이 들어온 채널 ID (일괄 부여 시 메시지 조회용)
+        self._notice_channels: dict[int, int] = {}
+        self._reconcile_lock = asyncio.Lock()
+        self.refresh_targets()
+
+        self.scheduler = AsyncIOScheduler()
+        self.scheduler.add_job(self.refresh_targets, 'interval', seconds=TARGET_REFRESH_SECONDS)
+        self.scheduler.start()
+
+    async def cog_unload(self):
+        self.scheduler.shutdown(wait=False)
+
+    def refresh_targets(self):
+        """
+        config의 공지 메시지 ID가 바뀌었을 때만 대상 메시지 집합을 다시 계산
+        """
+        config = load_config()
+        if config_store.version == self._config_version:
+            return
+        self._config_version = config_store.version
+
+        targets = {}
+        for key, role_name in (("MEMBER_NOTICE_MESSAGE_ID", MEMBER_ROLE_NAME), ("GUEST_NOTICE_MESSAGE_ID", GUEST_ROLE_NAME)):
+            try:
+                message_id = int(config.get(key, 0))
+            except ValueError:
+                log_bot("Error", f"config.json {key} is not numeric")
+                continue
+            if message_id and role_name:
+                targets[message_id] = role_name
+        if targets == self._targets:
+            return
+        self._targets = targets
+        self._watched = frozenset(targets)
+        log_bot("GrantAuthority", f"Watching notice messages: {sorted(self._watched)}")
+
+    def _resolve_role(self, guild: discord.Guild, role_name: str) -> discord.Role | None:
+        # 역할 ID로 캐시하고, 삭제/이름 변경된 경우에만 이름으로 다시 탐색
+        key = (guild.id, role_name)
+        role_id = self._role_ids.get(key)
+        role = guild.get_role(role_id) if role_id else None
+        if role is None or role.name != role_name:
+            role = discord.utils.get(guild.roles, name=role_name)
+            if role is None:
+                self._role_ids.pop(key, None)
+                return None
+            self._role_ids[key] = role.id
+        return role
 
     @commands.Cog.listener()
     async def on_raw_reaction_add(self, payload: RawReactionActionEvent):
-        log_bot("GrantAuthority", f"Reaction detected — message_id: {payload.message_id}, emoji: {payload.emoji.name}")
-        if payload.emoji.name != "✅":
-            log_bot("GrantAuthority", "Emoji is not target — ignored")
+        # 대상 공지 메시지가 아닌 반응은 로그/조회 없이 바로 무시
+        if payload.message_id not in self._watched or payload.emoji.name != "✅":
             return
+        log_bot("GrantAuthority", f"Reaction detected — message_id: {payload.message_id}, emoji: {payload.emoji.name}")
 
         guild = self.bot.get_guild(payload.guild_id)
         if not guild:
             return
 
-        member: Member = guild.get_member(payload.user_id)
+        member: Member = payload.member or guild.get_member(payload.user_id)
         if not member or member.bot:
             return
 
-        # 메시지 ID 로드
-        # Refactor: config load centralized; behavior unchanged
-        config = load_config()
-        try:
-            member_msg_id = int(config.get("MEMBER_NOTICE_MESSAGE_ID", 0))
-            guest_msg_id = int(config.get("GUEST_NOTICE_MESSAGE_ID", 0))
-        except ValueError:
-            log_bot("Error", "config.json message ID is not numeric")
+        role_name = self._targets.get(payload.message_id)
+        if role_name is None:
             return
+        self._notice_channels[payload.message_id] = payload.channel_id
 
-        # 메시지 ID에 따라 역할 결정
-        role_name = None
-        if payload.message_id == member_msg_id:
-            role_name = MEMBER_ROLE_NAME
-        elif payload.message_id == guest_msg_id:
-            role_name = GUEST_ROLE_NAME
-        else:
-            return  # 대상 메시지가 아니면 무시
-
-        if discord.utils.get(member.roles, name=role_name):
+        role = self._resolve_role(guild, role_name)
+        if role is None:
+            log_bot("Error", f"Role not found: '{role_name}'")
+            return
+        if member.get_role(role.id):
             return
 
-        role = discord.utils.get(guild.roles, name=role_name)
-        if role:
-            try:
-                await member.add_roles(role)
-                log_bot("GrantAuthority", f"Role '{role_name}' granted")
-
-                embed = discord.Embed(
-                    title="💛Watchers💛 합류하신 것을 축하드려요!",
-                    description=f"환영해요, `{member.display_name}` 님!\n`{role_name}` 역할이 부여되었어요!\n앞으로 열심히 활동해주세요!",
-                    color=discord.Color.green()
-                )
-                try:
-                    await member.send(embed=embed)
-                    log_bot("GrantAuthority", "DM sent")
-                except discord.Forbidden:
-                    log_bot("GrantAuthority", "DM failed (user settings or blocked)")
-
-                log_id = log_bot("DB Writing", f"save granted role: {member.name}")
-                await save_granted_role(str(member.id), member.name, role_name, log_id=log_id)
-                log_bot("GrantAuthority", "DB saved")
+        if await self._grant_role(member, role):
+            log_id = log_bot("DB Writing", f"save granted role: {member.name}")
+            await save_granted_role(str(member.id), member.name, role.name, log_id=log_id)
+            log_bot("GrantAuthority", "DB saved")
+
+    async def _grant_role(self, member: Member, role: discord.Role) -> bool:
+        """
+        역할 부여 + 환영 DM (DB 기록은 호출한 쪽에서 처리), 성공 여부 반환
+        """
+        role_name = role.name
+        try:
+            await member.add_roles(role)
+            log_bot("GrantAuthority", f"Role '{role_name}' granted")
 
+            embed = discord.Embed(
+                title="💛Watchers💛 합류하신 것을 축하드려요!",
+                description=f"환영해요, `{member.display_name}` 님!\n`{role_name}` 역할이 부여되었어요!\n앞으로 열심히 활동해주세요!",
+                color=discord.Color.green()
+            )
+            try:
+                await member.send(embed=embed)
+                log_bot("GrantAuthority", "DM sent")
             except discord.Forbidden:
-                log_bot("Error", f"Missing permissions to grant role: '{role_name}'")
-            except Exception as e:
-                log_bot("Error", f"Unexpected error: {e}")
-        else:
-            log_bot("Error", f"Role not found: '{role_name}'")
+                log_bot("GrantAuthority", "DM failed (user settings or blocked)")
+            return True
+
+        except discord.Forbidden:
+            log_bot("Error", f"Missing permissions to grant role: '{role_name}'")
+        except Exception as e:
+            log_bot("Error", f"Unexpected error: {e}")
+        return False
+
+    async def _find_notice_message(self, guild: discord.Guild, message_id: int) -> discord.Message | None:
+        """
+        공지 메시지 조회 — 기록된 채널을 먼저 확인하고, 없으면 텍스트 채널을 순서대로 탐색
+        - 찾은 채널 ID는 config(NOTICE_CHANNEL_IDS)에 기록해 다음 조회부터 바로 사용
+        """
+        channel_ids = load_config().get("NOTICE_CHANNEL_IDS", {})
+        cached_id = channel_ids.get(str(message_id)) or self._notice_channels.get(message_id)
+        cached = guild.get_channel(int(cached_id)) if cached_id else None
+        candidates = [cached] if cached else []
+        candidates += [channel for channel in guild.text_channels if channel is not cached]
+
+        for channel in candidates:
+            try:
+                message = await channel.fetch_message(message_id)
+            except (discord.NotFound, discord.Forbidden):
+                continue
+            except discord.HTTPException as e:
+                log_bot("Error", f"Notice message lookup failed in #{channel.name}: {e}")
+                continue
+            if channel_ids.get(str(message_id)) != str(channel.id):
+                await update_config_async("NOTICE_CHANNEL_IDS", {**channel_ids, str(message_id): str(channel.id)})
+            return message
+        return None
+
+    async def _collect_missing_grants(self, guild: discord.Guild) -> tuple[list, list[int]]:
+        """
+        공지 메시지의 ✅ 반응 유저 중 역할이 없는 멤버 목록 [(member, role)]과 찾지 못한 메시지 ID 목록
+        """
+        pending = []
+        missing_messages = []
+        for message_id, role_name in self._targets.items():
+            role = self._resolve_role(guild, role_name)
+            if role is None:
+                log_bot("Error", f"Role not found: '{role_name}'")
+                continue
+            message = await self._find_notice_message(guild, message_id)
+            if message is None:
+                missing_messages.append(message_id)
+                continue
+            reaction = discord.utils.get(message.reactions, emoji="✅")
+            if reaction is None:
+                continue
+            async for user in reaction.users():
+                member = guild.get_member(user.id)
+                if member and not member.bot and not member.get_role(role.id):
+                    pending.append((member, role))
+        return pending, missing_messages
 
     @app_commands.command(name="멤버-공지메시지id-설정", description="멤버 공지 메시지 ID를 설정합니다.")
     @is_master_or_organizer_appcmd()
     async def update_member_message_id(self, interaction: Interaction, message_id: str):
-        update_config("MEMBER_NOTICE_MESSAGE_ID", message_id)
+        await update_config_async("MEMBER_NOTICE_MESSAGE_ID", message_id)
+        self.refresh_targets()
         embed = discord.Embed(
             title="📌 멤버 공지 메시지 ID 설정 완료",
             description=f"`MEMBER_NOTICE_MESSAGE_ID`가 `{message_id}`로 설정되었습니다.",
@@ -90,7 +196,8 @@ class GrantAuthority(commands.Cog):
     @app_commands.command(name="게스트-공지메시지id-설정", description="게스트 공지 메시지 ID를 설정합니다.")
     @is_master_or_organizer_appcmd()
     async def update_guest_message_id(self, interaction: Interaction, message_id: str):
-        update_config("GUEST_NOTICE_MESSAGE_ID", message_id)
+        await update_config_async("GUEST_NOTICE_MESSAGE_ID", message_id)
+        self.refresh_targets()
         embed = discord.Embed(
             title="📌 게스트 공지 메시지 ID 설정 완료",
             description=f"`GUEST_NOTICE_MESSAGE_ID`가 `{message_id}`로 설정되었습니다.",
@@ -98,6 +205,46 @@ class GrantAuthority(commands.Cog):
         )
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
+    @app_commands.command(name="역할-일괄-부여", description="[관리]공지 메시지에 ✅ 반응했지만 역할이 없는 멤버에게 역할을 부여합니다.")
+    @is_master_or_organizer_appcmd()
+    async def reconcile_roles(self, interaction: Interaction):
+        if self._reconcile_lock.locked():
+            await interaction.response.send_message("⏳ 이미 일괄 부여가 진행 중입니다.", ephemeral=True)
+            return
+        await interaction.response.defer(ephemeral=True, thinking=True)
+
+        async with self._reconcile_lock:
+            log_id = log_bot("GrantAuthority", "Bulk role reconcile started")
+            self.refresh_targets()
+            pending, missing_messages = await self._collect_missing_grants(interaction.guild)
+
+            semaphore = asyncio.Semaphore(BULK_GRANT_CONCURRENCY)
+
+            async def grant(member: Member, role: discord.Role) -> bool:
+                async with semaphore:
+                    return await self._grant_role(member, role)
+
+            results = await asyncio.gather(*(grant(member, role) for member, role in pending))
+            granted = [
+                (str(member.id), member.name, role.name)
+                for (member, role), ok in zip(pending, results)
+                if ok
+            ]
+            saved = await save_granted_roles(granted, log_id=log_id)
+            log_bot("GrantAuthority", f"Bulk role reconcile done — pending {len(pending)}, granted {len(granted)}, saved {saved}")
+
+        embed = discord.Embed(title="✅ 역할 일괄 부여 완료", color=discord.Color.green())
+        embed.add_field(name="대상", value=f"`{len(pending)}`명", inline=True)
+        embed.add_field(name="부여", value=f"`{len(granted)}`명", inline=True)
+        embed.add_field(name="실패", value=f"`{len(pending) - len(granted)}`명", inline=True)
+        if missing_messages:
+            embed.add_field(
+                name="⚠️ 찾지 못한 공지 메시지",
+                value="\n".join(f"`{message_id}`" for message_id in missing_messages),
+                inline=False,
+            )
+        await interaction.followup.send(embed=embed, ephemeral=True)
+
 async def setup(bot):
-    await bot.add_cog(GrantAuthority(bot))
+    await bot.add_cog(instrument_cog(GrantAuthority(bot)))
     log_bot("Load Complete", "GrantAuthority Cog loaded")
@@ -1,12 +1,19 @@
 import asyncio
+import heapq
+import math
+from array import array
 from typing import Any, Iterable, Tuple
 
+import aiohttp
 import discord
-import requests
 from discord import app_commands, Interaction
 from discord.ext import commands
 
-from cogs import is_member_or_above_appcmd
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+from cogs import is_master_or_organizer_appcmd, is_member_or_above_appcmd, instrument_cog
+from utils.cache_utils import SnapshotCache
+from utils.logging_utils import log_bot
 from utils.overwatch_normalize import (
     build_referer,
     normalize_map,
@@ -27,6 +34,17 @@ HEADERS = {
     "Origin": "https://overwatch.blizzard.com",
     "X-Requested-With": "XMLHttpRequest",
 }
+HTTP_TIMEOUT = aiohttp.ClientTimeout(total=20, connect=5)
+MAX_CONNECTIONS = 4
+MAX_CONCURRENT_REQUESTS = 4
+KEEPALIVE_SECONDS = 60
+
+# 승률 데이터는 하루에 몇 번만 바뀌므로 스냅샷을 캐시
+RATES_CACHE_TTL_SECONDS = 30 * 60
+RATES_CACHE_STALE_SECONDS = 6 * 60 * 60
+RATES_CACHE_MAX_ENTRIES = 64
+# 자주 요청되는 조합 N개를 TTL 주기로 미리 갱신 (0이면 끔)
+RATES_PREFETCH_TOP_N = 5
 
 
 def _extract_items(data: Any) -> Iterable[dict]:
@@ -61,37 +79,6 @@ def _parse_win_rate(value: Any) -> float | None:
     return num
 
 
-def _extract_stats(data: Any) -> list[Tuple[str, float]]:
-    results: list[Tuple[str, float]] = []
-    for item in _extract_items(data):
-        if not isinstance(item, dict):
-            continue
-        hero_val = item.get("hero") or item.get("heroName") or item.get("name") or item.get("hero_name")
-        if isinstance(hero_val, dict):
-            name = hero_val.get("name") or hero_val.get("key") or hero_val.get("value")
-        else:
-            name = hero_val
-        win_rate = (
-            item.get("winRate")
-            or item.get("win_rate")
-            or item.get("winrate")
-            or item.get("winRatePct")
-        )
-        if win_rate is None and isinstance(item.get("cells"), dict):
-            win_rate = item["cells"].get("winrate") or item["cells"].get("winRate")
-        if isinstance(win_rate, dict):
-            win_rate = win_rate.get("value") or win_rate.get("percent") or win_rate.get("pct")
-        win_rate = _parse_win_rate(win_rate)
-        if name and win_rate is not None:
-            results.append((str(name), float(win_rate)))
-    return results
-
-
-def _format_top5(stats: list[Tuple[str, float]]) -> list[str]:
-    stats_sorted = sorted(stats, key=lambda x: x[1], reverse=True)[:5]
-    return [f"{idx}. **{name}** — {rate:.2f}%" for idx, (name, rate) in enumerate(stats_sorted, start=1)]
-
-
 def _normalize_map_value(value: Any) -> str | None:
     if value is None:
         return None
@@ -105,108 +92,383 @@ def _normalize_map_value(value: Any) -> str | None:
     return value.strip().lower().replace(" ", "-").replace("_", "-")
 
 
-def _filter_by_map(items: Iterable[dict], map_value: str) -> list[dict]:
+# payload마다 다를 수 있는 키 후보 (앞쪽 키가 우선)
+_HERO_KEYS = ("hero", "heroName", "name", "hero_name")
+_HERO_NAME_KEYS = ("name", "key", "value")
+_WIN_RATE_KEYS = ("winRate", "win_rate", "winrate", "winRatePct")
+_CELL_WIN_RATE_KEYS = ("winrate", "winRate")
+_PICK_RATE_KEYS = ("pickRate", "pick_rate", "pickrate", "pickRatePct")
+_CELL_PICK_RATE_KEYS = ("pickrate", "pickRate")
+_RATE_VALUE_KEYS = ("value", "percent", "pct")
+_MAP_KEYS = ("map", "mapName", "map_name", "mapId", "mapSlug", "mapKey")
+_MAP_VALUE_KEYS = ("slug", "key", "name", "value")
+_RQ_KEYS = ("rq", "mode", "queue", "queueId")
+_TIER_KEYS = ("tier", "rank", "tierName")
+_TIER_VALUE_KEYS = ("name", "value", "key")
+_ROLE_KEYS = ("role", "heroRole")
+
+def _first_key(item: dict, keys: Iterable[str]) -> str | None:
+    return next((key for key in keys if item.get(key)), None)
+
+
+def _sub_key(value: Any, keys: Iterable[str]) -> str | None:
+    return _first_key(value, keys) if isinstance(value, dict) else None
+
+
+def _rate_path(sample: dict, keys: Iterable[str], cell_keys: Iterable[str]) -> tuple | None:
+    # (container, key, sub): 최상위 키 우선, 없으면 cells 아래에서 탐색
+    container = None
+    key = _first_key(sample, keys)
+    if key is None and isinstance(sample.get("cells"), dict):
+        container = "cells"
+        key = _first_key(sample["cells"], cell_keys)
+    if key is None:
+        return None
+    value = (sample[container] if container else sample)[key]
+    return container, key, _sub_key(value, _RATE_VALUE_KEYS)
+
+
+def _read_rate(item: dict, path: tuple | None) -> float:
+    if path is None:
+        return math.nan
+    container, key, sub = path
+    source = item.get(container) if container else item
+    if not isinstance(source, dict):
+        return math.nan
+    value = source.get(key)
+    if sub is not None and isinstance(value, dict):
+        value = value.get(sub)
+    rate = _parse_win_rate(value)
+    return math.nan if rate is None else float(rate)
+
+
+def detect_rate_schema(items: list) -> dict | None:
+    """
+    응답의 첫 번째 항목으로 키 구성을 한 번만 판별
+    - key: 항목에서 값을 꺼낼 키 (없으면 None) / sub: 값이 dict일 때 한 단계 더 들어갈 키
+    - 같은 응답의 항목들은 같은 구성이라고 가정
+    """
+    sample = next((item for item in items if isinstance(item, dict)), None)
+    if sample is None:
+        return None
+
+    hero_key = _first_key(sample, _HERO_KEYS)
+    map_key = _first_key(sample, _MAP_KEYS)
+    tier_key = _first_key(sample, _TIER_KEYS)
+    hero = sample.get("hero")
+    role_in_hero = isinstance(hero, dict) and bool(hero.get("role"))
+    return {
+        "hero_key": hero_key,
+        "hero_sub": _sub_key(sample.get(hero_key), _HERO_NAME_KEYS),
+        "win_rate": _rate_path(sample, _WIN_RATE_KEYS, _CELL_WIN_RATE_KEYS),
+        "pick_rate": _rate_path(sample, _PICK_RATE_KEYS, _CELL_PICK_RATE_KEYS),
+        "map_key": map_key,
+        "map_sub": _sub_key(sample.get(map_key), _MAP_VALUE_KEYS),
+        "rq_key": _first_key(sample, _RQ_KEYS),
+        "tier_key": tier_key,
+        "tier_sub": _sub_key(sample.get(tier_key), _TIER_VALUE_KEYS),
+        "role_in_hero": role_in_hero,
+        "role_key": None if role_in_hero else _first_key(sample, _ROLE_KEYS),
+    }
+
+
+def _map_target(map_value: str | None) -> str | None:
     if not map_value:
-        return list(items)
+        return None
     map_norm = _normalize_map_value(map_value)
     if not map_norm or map_norm == "all-maps":
-        return list(items)
-    filtered = []
-    for item in items:
-        if not isinstance(item, dict):
-            continue
-        candidate = (
-            item.get("map")
-            or item.get("mapName")
-            or item.get("map_name")
-            or item.get("mapId")
-            or item.get("mapSlug")
-            or item.get("mapKey")
-        )
-        candidate_norm = _normalize_map_value(candidate)
-        if candidate_norm and candidate_norm == map_norm:
-            filtered.append(item)
-    return filtered or list(items)
-
-
-def _filter_by_role(items: Iterable[dict], role: str) -> list[dict]:
-    role_norm = normalize_role(role)
-    if role_norm == "All":
-        return list(items)
-    role_key = role_norm.upper()
-    filtered = []
-    for item in items:
-        if not isinstance(item, dict):
-            continue
-        hero = item.get("hero")
-        if not isinstance(hero, dict):
-            hero = {}
-        hero_role = hero.get("role") or item.get("role") or item.get("heroRole")
-        if isinstance(hero_role, str) and hero_role.upper() == role_key:
-            filtered.append(item)
-    return filtered
+        return None
+    return map_norm
 
 
-def _filter_by_tier(items: Iterable[dict], tier: str | None) -> list[dict]:
+def _tier_target(tier: str | None) -> str | None:
     if not tier:
-        return list(items)
+        return None
     tier_norm = normalize_tier(tier)
     if not isinstance(tier_norm, str) or tier_norm.lower() == "all":
-        return list(items)
-    tier_key = tier_norm.lower()
-    filtered = []
-    for item in items:
-        if not isinstance(item, dict):
-            continue
-        item_tier = item.get("tier") or item.get("rank") or item.get("tierName")
-        if isinstance(item_tier, dict):
-            item_tier = item_tier.get("name") or item_tier.get("value") or item_tier.get("key")
-        if isinstance(item_tier, str) and item_tier.lower() == tier_key:
-            filtered.append(item)
-    return filtered or list(items)
-
-
-def _filter_by_rq(items: Iterable[dict], rq_value: str | int | None) -> list[dict]:
-    if rq_value is None:
-        return list(items)
-    rq_key = str(rq_value)
-    filtered = []
-    for item in items:
-        if not isinstance(item, dict):
+        return None
+    return tier_norm.lower()
+
+
+def _role_target(role: str | None) -> str | None:
+    role_norm = normalize_role(role)
+    return None if role_norm == "All" else role_norm.upper()
+
+
+class RatesTable:
+    """
+    승률 응답 한 건을 한 번만 디코딩한 컬럼형 테이블
+    - 컬럼: hero, role, tier, map, rq, win_rate, pick_rate (행 번호 기준)
+    - 차원(map/rq/tier/role)별 값 → 행 번호 집합 인덱스
+    - 응답 항목에 map/rq/tier 키가 없으면 요청한 값으로 채움
+    """
+
+    DIMENSIONS = ("map", "rq", "tier", "role")
+    METRICS = ("win_rate", "pick_rate")
+
+    def __init__(self):
+        self.hero: list[str | None] = []
+        self.win_rate = array("d")
+        self.pick_rate = array("d")
+        self.columns: dict[str, list[str | None]] = {dim: [] for dim in self.DIMENSIONS}
+        self.indexes: dict[str, dict[str, set[int]]] = {dim: {} for dim in self.DIMENSIONS}
+
+    def __len__(self) -> int:
+        return len(self.hero)
+
+    @classmethod
+    def from_payload(cls, data: Any, params: dict) -> "RatesTable":
+        table = cls()
+        items = _extract_items(data)
+        schema = detect_rate_schema(items)
+        if schema is None:
+            return table
+
+        hero_key, hero_sub = schema["hero_key"], schema["hero_sub"]
+        win_path, pick_path = schema["win_rate"], schema["pick_rate"]
+        map_key, map_sub = schema["map_key"], schema["map_sub"]
+        rq_key = schema["rq_key"]
+        tier_key, tier_sub = schema["tier_key"], schema["tier_sub"]
+        role_in_hero, role_key = schema["role_in_hero"], schema["role_key"]
+        # 응답에 없는 차원은 요청한 값으로 채움
+        default_map = _map_target(params.get("map"))
+        default_rq = str(params["rq"]) if params.get("rq") is not None else None
+        default_tier = _tier_target(params.get("tier"))
+        # 같은 맵 이름이 반복되므로 정규화 결과를 응답 단위로 재사용
+        normalized_maps: dict[str, str | None] = {}
+
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            name = item.get(hero_key) if hero_key else None
+            if hero_sub is not None and isinstance(name, dict):
+                name = name.get(hero_sub)
+
+            map_value = default_map
+            if map_key:
+                map_value = item.get(map_key)
+                if map_sub is not None and isinstance(map_value, dict):
+                    map_value = map_value.get(map_sub)
+                if isinstance(map_value, str):
+                    if map_value not in normalized_maps:
+                        normalized_maps[map_value] = _normalize_map_value(map_value)
+                    map_value = normalized_maps[map_value]
+                else:
+                    map_value = None
+
+            rq_value = default_rq
+            if rq_key:
+                rq_value = item.get(rq_key)
+                if isinstance(rq_value, int):
+                    rq_value = str(rq_value)
+                if not isinstance(rq_value, str):
+                    rq_value = None
+
+            tier_value = default_tier
+            if tier_key:
+                tier_value = item.get(tier_key)
+                if tier_sub is not None and isinstance(tier_value, dict):
+                    tier_value = tier_value.get(tier_sub)
+                tier_value = tier_value.lower() if isinstance(tier_value, str) else None
+
+            if role_in_hero:
+                hero = item.get("hero")
+                role_value = hero.get("role") if isinstance(hero, dict) else None
+            else:
+                role_value = item.get(role_key) if role_key else None
+            role_value = role_value.upper() if isinstance(role_value, str) else None
+
+            table._append(
+                str(name) if name else None,
+                {"map": map_value, "rq": rq_value, "tier": tier_value, "role": role_value},
+                _read_rate(item, win_path),
+                _read_rate(item, pick_path),
+            )
+        return table
+
+    def _append(self, hero: str | None, dims: dict, win_rate: float, pick_rate: float):
+        row = len(self.hero)
+        self.hero.append(hero)
+        self.win_rate.append(win_rate)
+        self.pick_rate.append(pick_rate)
+        for dim, value in dims.items():
+            self.columns[dim].append(value)
+            if value is not None:
+                self.indexes[dim].setdefault(value, set()).add(row)
+
+    def select(self, params: dict) -> list[int] | range:
+        """
+        params(map/rq/tier/role) 조건에 맞는 행 번호 목록
+        - 맵 → 모드 → 티어 순으로 좁히되, 일치하는 행이 없으면 해당 조건은 무시
+        - 역할은 일치하는 행이 없어도 그대로 적용
+        """
+        rows: set[int] | None = None
+        targets = (
+            ("map", _map_target(params.get("map"))),
+            ("rq", str(params["rq"]) if params.get("rq") is not None else None),
+            ("tier", _tier_target(params.get("tier"))),
+        )
+        for dim, target in targets:
+            if target is None:
+                continue
+            matched = self.indexes[dim].get(target)
+            if not matched:
+                continue
+            narrowed = matched if rows is None else rows & matched
+            if narrowed:
+                rows = narrowed
+
+        role = _role_target(params.get("role", "All"))
+        if role is not None:
+            matched = self.indexes["role"].get(role, set())
+            rows = matched if rows is None else rows & matched
+        return range(len(self)) if rows is None else sorted(rows)
+
+    def rank(
+        self,
+        params: dict,
+        metric: str = "win_rate",
+        limit: int = 5,
+        ascending: bool = False,
+    ) -> list[Tuple[str, float]]:
+        """
+        조건에 맞는 영웅을 metric(win_rate/pick_rate) 기준 상위(또는 하위) limit개로 반환
+        """
+        values = getattr(self, metric)
+        rows = [row for row in self.select(params) if self.hero[row] and not math.isnan(values[row])]
+        pick = heapq.nsmallest if ascending else heapq.nlargest
+        return [(self.hero[row], values[row]) for row in pick(limit, rows, key=values.__getitem__)]
+
+
+def _format_ranking(stats: list[Tuple[str, float]]) -> list[str]:
+    return [f"{idx}. **{name}** — {rate:.2f}%" for idx, (name, rate) in enumerate(stats, start=1)]
+
+
+def _sanitize_params(p: dict) -> dict:
+    key_map = {
+        "맵": "map",
+        "역할": "role",
+        "모드": "rq",
+        "모드(빠대, 경쟁)": "rq",
+        "티어": "tier",
+    }
+    fixed = {}
+    for k, v in p.items():
+        if v is None:
             continue
-        item_rq = item.get("rq") or item.get("mode") or item.get("queue") or item.get("queueId")
-        if isinstance(item_rq, int):
-            item_rq = str(item_rq)
-        if isinstance(item_rq, str) and item_rq == rq_key:
-            filtered.append(item)
-    return filtered or list(items)
-async def fetch_rates(params: dict, log_id: str):
-    def _sanitize_params(p: dict) -> dict:
-        key_map = {
-            "맵": "map",
-            "역할": "role",
-            "모드": "rq",
-            "모드(빠대, 경쟁)": "rq",
-            "티어": "tier",
-        }
-        fixed = {}
-        for k, v in p.items():
-            fixed[key_map.get(k, k)] = v
-        return fixed
-
-    def _request():
-        safe_params = _sanitize_params(params)
-        headers = {**HEADERS, "Referer": build_referer(safe_params)}
-        r = requests.get(API_URL, headers=headers, params=safe_params, timeout=20)
+        fixed[key_map.get(k, k)] = str(v)
+    return fixed
+
+
+async def fetch_rates(session: aiohttp.ClientSession, params: dict, log_id: str, url: str = API_URL):
+    safe_params = _sanitize_params(params)
+    headers = {"Referer": build_referer(safe_params)}
+    async with session.get(url, headers=headers, params=safe_params) as r:
         r.raise_for_status()
-        return r.json()
+        return await r.json(content_type=None)
+
+
+# /영웅-통계 기준/순서 입력값
+METRIC_ALIASES = {"승률": "win_rate", "픽률": "pick_rate"}
+ORDER_ALIASES = {"상위": False, "하위": True}
+MAX_RANKING_SIZE = 10
+
+
+def snapshot_key(params: dict) -> tuple:
+    # 정규화된 요청 파라미터 조합 (map, rq, tier, region, input)
+    # 역할은 테이블에서 나누므로 항상 전체(All)로 요청
+    return tuple(sorted(_sanitize_params({**params, "role": "All"}).items()))
+
+
+def build_rate_params(map: str, role: str, rq: str, tier: str | None) -> dict | None:
+    """
+    명령어 입력값을 API 파라미터로 변환 (모드가 빠대/경쟁전이 아니면 None)
+    """
+    rq_parsed = normalize_rq(rq)
+    if rq_parsed is None:
+        return None
+    if rq_parsed != 0 and not tier:
+        tier = "전체"
+    return {
+        **BASE_PARAMS,
+        "map": normalize_map(map),
+        "role": normalize_role(role),
+        "rq": str(rq_parsed),
+        "tier": normalize_tier(tier) if rq_parsed != 0 else "All",
+    }
+
 
-    return await asyncio.to_thread(_request)
+def _label(value: str | None) -> str:
+    return "전체" if (not value or str(value).lower() == "all") else value
+
+
+def create_http_session() -> aiohttp.ClientSession:
+    # keep-alive 연결을 재사용하는 공유 세션 (Cog가 소유, cog_unload에서 종료)
+    connector = aiohttp.TCPConnector(limit=MAX_CONNECTIONS, keepalive_timeout=KEEPALIVE_SECONDS)
+    return aiohttp.ClientSession(connector=connector, timeout=HTTP_TIMEOUT, headers=HEADERS)
 
 
 class OverwatchRates(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.session: aiohttp.ClientSession | None = None
+        self._request_limit = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        self.snapshots = SnapshotCache(
+            ttl=RATES_CACHE_TTL_SECONDS,
+            stale_ttl=RATES_CACHE_STALE_SECONDS,
+            maxsize=RATES_CACHE_MAX_ENTRIES,
+        )
+        self.scheduler = AsyncIOScheduler()
+        if RATES_PREFETCH_TOP_N:
+            self.scheduler.add_job(self.prefetch_popular, 'interval', seconds=RATES_CACHE_TTL_SECONDS)
+
+    async def cog_load(self):
+        self.session = create_http_session()
+        self.scheduler.start()
+
+    async def cog_unload(self):
+        self.scheduler.shutdown(wait=False)
+        if self.session:
+            await self.session.close()
+            self.session = None
+
+    async def _fetch(self, params: dict, log_id: str = ""):
+        async with self._request_limit:
+            return await fetch_rates(self.session, params, log_id=log_id)
+
+    async def _load_table(self, params: dict) -> RatesTable:
+        # 응답은 받은 직후 한 번만 디코딩하고, 캐시에는 테이블만 보관
+        data = await self._fetch(params)
+        return RatesTable.from_payload(data, params)
+
+    async def _get_table(self, params: dict) -> RatesTable:
+        key = snapshot_key(params)
+        return await self.snapshots.get(key, lambda: self._load_table(dict(key)))
+
+    async def prefetch_popular(self):
+        for key in self.snapshots.top_keys(RATES_PREFETCH_TOP_N):
+            try:
+                await self.snapshots.refresh(key, lambda key=key: self._load_table(dict(key)))
+            except Exception as e:
+                log_bot("Error", f"Overwatch rates prefetch failed {dict(key)}: {e}")
+        log_bot("OverwatchRates", f"prefetch done — cache stats: {self.snapshots.stats()}")
+
+    @app_commands.command(name="승률-캐시-상태", description="[관리]오버워치 승률 데이터 캐시 상태를 확인합니다.")
+    @is_master_or_organizer_appcmd()
+    async def rates_cache_stats(self, interaction: Interaction):
+        stats = self.snapshots.stats()
+        embed = discord.Embed(title="📦 승률 데이터 캐시 상태", color=discord.Color.blue())
+        embed.add_field(name="hit / stale / miss", value=f"`{stats['hits']}` / `{stats['stale_hits']}` / `{stats['misses']}`", inline=False)
+        embed.add_field(
+            name="갱신",
+            value=(
+                f"`{stats['refreshes']}`회 (실패 `{stats['refresh_errors']}`) · "
+                f"평균 `{stats['refresh_ms_avg']:.0f}ms` · 최대 `{stats['refresh_ms_max']:.0f}ms`"
+            ),
+            inline=False,
+        )
+        embed.add_field(name="항목 수", value=f"`{stats['size']}` / `{RATES_CACHE_MAX_ENTRIES}`", inline=False)
+        await interaction.response.send_message(embed=embed, ephemeral=True)
 
     @app_commands.command(name="승률-보기", description="오버워치 영웅 승률 Top 5를 확인합니다.")
     @app_commands.rename(map="맵", role="역할", rq="모드", tier="티어")
@@ -227,34 +489,18 @@ class OverwatchRates(commands.Cog):
     ):
         await interaction.response.defer(thinking=True)
 
-        rq_parsed = normalize_rq(rq)
-        if rq_parsed is None:
+        params = build_rate_params(map, role, rq, tier)
+        if params is None:
             await interaction.followup.send("❌ 빠대/경쟁전 입력만 가능합니다.", ephemeral=True)
             return
-        if rq_parsed != 0 and not tier:
-            tier = "전체"
-
-        params = {
-            **BASE_PARAMS,
-            "map": normalize_map(map),
-            "role": normalize_role(role),
-            "rq": str(rq_parsed),
-            "tier": normalize_tier(tier) if rq_parsed != 0 else "All",
-        }
         try:
-            data = await fetch_rates(params, log_id="")
+            table = await self._get_table(params)
         except Exception as e:
             await interaction.followup.send("❌ 데이터를 가져오는 중 오류가 발생했습니다.", ephemeral=True)
             return
 
-        items = list(_extract_items(data))
-
         try:
-            map_filtered = _filter_by_map(items, params["map"])
-            rq_filtered = _filter_by_rq(map_filtered, params["rq"])
-            tier_filtered = _filter_by_tier(rq_filtered, params["tier"])
-            role_filtered = _filter_by_role(tier_filtered, params["role"])
-            stats = _extract_stats({"rates": role_filtered})
+            stats = table.rank(params, "win_rate", limit=5)
         except Exception as e:
             await interaction.followup.send("❌ 처리 중 오류가 발생했습니다.", ephemeral=True)
             return
@@ -265,17 +511,63 @@ class OverwatchRates(commands.Cog):
                 pass
             return
 
-        top5_lines = _format_top5(stats)
-        map_label = "전체" if (not map or str(map).lower() == "all") else map
-        tier_label = "전체" if (not tier or str(tier).lower() == "all") else tier
-        role_label = "전체" if (not role or str(role).lower() == "all") else role
-        title = f"🎯 `맵: {map_label}`, `티어: {tier_label}`, `포지션: {role_label}` 승률 Top 5 영웅"
+        top5_lines = _format_ranking(stats)
+        title = f"🎯 `맵: {_label(map)}`, `티어: {_label(tier)}`, `포지션: {_label(role)}` 승률 Top 5 영웅"
         embed = discord.Embed(title=title, color=discord.Color.blue())
 
         embed.add_field(name="TOP 5", value="\n".join(top5_lines), inline=False)
         embed.set_footer(text="데이터 출처: Blizzard Overwatch Rates")
         await interaction.followup.send(embed=embed)
 
+    @app_commands.command(name="영웅-통계", description="오버워치 영웅 승률/픽률 상위·하위 순위를 확인합니다.")
+    @app_commands.rename(map="맵", role="역할", rq="모드", tier="티어", metric="기준", order="순서", count="개수")
+    @app_commands.describe(
+        map="맵 이름 (예: 왕의 길/지브롤터/전체)",
+        role="역할 (탱커/딜러/힐러/전체)",
+        rq="모드 (빠른 대전/경쟁전)",
+        tier="티어 (브론즈/실버/골드/플레/다이아/마스터/그마/전체)",
+        metric="기준 (승률/픽률, 기본 승률)",
+        order="순서 (상위/하위, 기본 상위)",
+        count=f"표시할 영웅 수 (1~{MAX_RANKING_SIZE}, 기본 5)",
+    )
+    @is_member_or_above_appcmd()
+    async def show_hero_stats(
+        self,
+        interaction: Interaction,
+        map: str,
+        role: str,
+        rq: str,
+        tier: str | None = None,
+        metric: str = "승률",
+        order: str = "상위",
+        count: app_commands.Range[int, 1, MAX_RANKING_SIZE] = 5,
+    ):
+        await interaction.response.defer(thinking=True)
+
+        params = build_rate_params(map, role, rq, tier)
+        if params is None:
+            await interaction.followup.send("❌ 빠대/경쟁전 입력만 가능합니다.", ephemeral=True)
+            return
+        if metric not in METRIC_ALIASES or order not in ORDER_ALIASES:
+            await interaction.followup.send("❌ 기준은 승률/픽률, 순서는 상위/하위만 가능합니다.", ephemeral=True)
+            return
+        try:
+            table = await self._get_table(params)
+        except Exception as e:
+            await interaction.followup.send("❌ 데이터를 가져오는 중 오류가 발생했습니다.", ephemeral=True)
+            return
+
+        stats = table.rank(params, METRIC_ALIASES[metric], limit=count, ascending=ORDER_ALIASES[order])
+        if not stats:
+            await interaction.followup.send(f"❌ {metric} 데이터를 찾을 수 없습니다.", ephemeral=True)
+            return
+
+        title = f"📊 `맵: {_label(map)}`, `티어: {_label(tier)}`, `포지션: {_label(role)}` {metric} {order} {len(stats)} 영웅"
+        embed = discord.Embed(title=title, color=discord.Color.blue())
+        embed.add_field(name=f"{order} {len(stats)}", value="\n".join(_format_ranking(stats)), inline=False)
+        embed.set_footer(text="데이터 출처: Blizzard Overwatch Rates")
+        await interaction.followup.send(embed=embed)
+
 
 async def setup(bot):
-    await bot.add_cog(OverwatchRates(bot))
+    await bot.add_cog(instrument_cog(OverwatchRates(bot)))
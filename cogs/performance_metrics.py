@@ -0,0 +1,122 @@
+import os
+
+from aiohttp import web
+from discord import app_commands, Interaction
+from discord.ext import commands
+
+from cogs import is_master_or_organizer_appcmd, instrument_cog
+from db.monitoring import command_monitor, pool_monitor
+from db.voice_sessions import retention_stats
+from utils.logging_utils import dropped_logs, log_bot
+from utils.metrics_utils import registry
+
+# Prometheus 형식 /metrics 엔드포인트 (포트 미설정 시 끔, 기본은 로컬에서만 접근)
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+
+MAX_STATS_ROWS = 20
+MAX_NAME_LENGTH = 40
+
+
+def format_stats_table(limit: int) -> str:
+    """
+    누적 시간이 큰 순서로 호출 수 / 에러율 / 평균·p50·p99·최대(ms) 표 생성
+    """
+    rows = registry.snapshot()[:limit]
+    if not rows:
+        return "아직 기록된 호출이 없습니다."
+
+    lines = [f"{'operation':<{MAX_NAME_LENGTH}} {'count':>6} {'err%':>5} {'avg':>7} {'p50':>7} {'p99':>7} {'max':>7}"]
+    for stats in rows:
+        name = stats.name
+        if len(name) > MAX_NAME_LENGTH:
+            name = "…" + name[-(MAX_NAME_LENGTH - 1):]
+        lines.append(
+            f"{name:<{MAX_NAME_LENGTH}} {stats.count:>6} {stats.errors / stats.count * 100:>5.1f} "
+            f"{stats.total / stats.count * 1000:>7.1f} {stats.quantile(0.5) * 1000:>7.1f} "
+            f"{stats.quantile(0.99) * 1000:>7.1f} {stats.max * 1000:>7.1f}"
+        )
+    return "\n".join(lines)
+
+
+class PerformanceMetrics(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self._runner: web.AppRunner | None = None
+
+    async def cog_load(self):
+        if not METRICS_PORT:
+            return
+        app = web.Application()
+        app.router.add_get("/metrics", self._metrics)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        try:
+            await web.TCPSite(self._runner, METRICS_HOST, METRICS_PORT).start()
+        except OSError as e:
+            log_bot("Error", f"metrics endpoint failed to start on {METRICS_HOST}:{METRICS_PORT}: {e}")
+            await self._runner.cleanup()
+            self._runner = None
+            return
+        log_bot("PerformanceMetrics", f"metrics endpoint: http://{METRICS_HOST}:{METRICS_PORT}/metrics")
+
+    async def cog_unload(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _metrics(self, request: web.Request) -> web.Response:
+        text = registry.render_prometheus()
+        text += (
+            "# HELP watchers_dropped_logs_total Log records dropped because the log queue was full.\n"
+            "# TYPE watchers_dropped_logs_total counter\n"
+            f"watchers_dropped_logs_total {dropped_logs()}\n"
+        )
+        pool = pool_monitor.stats()
+        text += (
+            "# HELP watchers_mongo_pool_connections Open MongoDB connections.\n"
+            "# TYPE watchers_mongo_pool_connections gauge\n"
+            f"watchers_mongo_pool_connections {pool['open']}\n"
+            "# HELP watchers_mongo_pool_checked_out MongoDB connections currently checked out.\n"
+            "# TYPE watchers_mongo_pool_checked_out gauge\n"
+            f"watchers_mongo_pool_checked_out {pool['checked_out']}\n"
+            "# HELP watchers_mongo_slow_queries_total Commands slower than MONGODB_SLOW_QUERY_MS.\n"
+            "# TYPE watchers_mongo_slow_queries_total counter\n"
+            f"watchers_mongo_slow_queries_total {command_monitor.slow_queries}\n"
+            "# HELP watchers_voice_retention_runs_total Voice session retention cleanup runs.\n"
+            "# TYPE watchers_voice_retention_runs_total counter\n"
+            f"watchers_voice_retention_runs_total {retention_stats['runs']}\n"
+            "# HELP watchers_voice_retention_deleted_total Documents removed by the voice retention cleanup.\n"
+            "# TYPE watchers_voice_retention_deleted_total counter\n"
+        )
+        for name, count in retention_stats["deleted_by_collection"].items():
+            text += f'watchers_voice_retention_deleted_total{{collection="{name}"}} {count}\n'
+        return web.Response(text=text, content_type="text/plain", charset="utf-8")
+
+    @app_commands.command(name="성능-통계", description="[관리]명령어/이벤트/DB 호출별 실행 시간 통계를 확인합니다.")
+    @app_commands.describe(limit="표시할 항목 수 (누적 시간 순, 최대 20)", reset="확인 후 통계 초기화")
+    @is_master_or_organizer_appcmd()
+    async def performance_stats(self, interaction: Interaction, limit: int = 15, reset: bool = False):
+        table = format_stats_table(max(1, min(limit, MAX_STATS_ROWS)))
+        if reset:
+            registry.reset()
+        pool = pool_monitor.stats()
+        retention = f"음성 기록 보존 정리: {retention_stats['runs']}회 · 누적 삭제 {retention_stats['total_deleted']}건"
+        if retention_stats["last_cutoff"]:
+            retention += (
+                f" (최근 기준일 {retention_stats['last_cutoff']}, "
+                f"{sum(retention_stats['last_deleted'].values())}건)"
+            )
+        footer = (
+            f"Mongo 커넥션: 열림 {pool['open']} · 사용 중 {pool['checked_out']} · "
+            f"checkout 대기 p99 {pool['wait_p99_ms']:.1f}ms (최대 {pool['wait_max_ms']:.1f}ms) · "
+            f"느린 쿼리 {command_monitor.slow_queries}건\n"
+            f"{retention}\n"
+            f"시간 단위: ms · 버려진 로그: {dropped_logs()}" + (" · 통계 초기화됨" if reset else "")
+        )
+        await interaction.response.send_message(f"```\n{table}\n```\n{footer}", ephemeral=True)
+
+
+async def setup(bot):
+    await bot.add_cog(instrument_cog(PerformanceMetrics(bot)))
+    log_bot("Load Complete", "PerformanceMetrics Cog loaded")
@@ -1,8 +1,9 @@
 from discord.ext import commands
-from db.quit_db import move_user_to_quitlogs, quitlogs
+from db.quit_db import quit_buffer, quitlogs
 from utils.time_utils import to_kst, KST_DISPLAY_FORMAT
 from settings import ALERT_CHANNEL_ID, ROLE_MASTER_MENTION, ROLE_ORGANIZER_MENTION
 from utils.logging_utils import log_bot
+from cogs import instrument_cog
 
 # Refactor: constants moved to settings; values unchanged
 
@@ -10,8 +11,17 @@ class RejoinTracker(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
+    async def cog_load(self):
+        quit_buffer.start()
+
+    async def cog_unload(self):
+        await quit_buffer.close()
+
     @commands.Cog.listener()
     async def on_member_join(self, member):
+        # 버퍼에 남아있거나 진행 중인 퇴장 처리를 먼저 반영
+        await quit_buffer.wait_for(str(member.id))
+
         # quitlogs에서 해당 유저의 기록 조회
         doc = await quitlogs.find_one({"user_id": str(member.id)})
         if doc:
@@ -35,8 +45,8 @@ class RejoinTracker(commands.Cog):
     @commands.Cog.listener()
     async def on_member_remove(self, member):
         log_id = log_bot("DB Writing", f"move user to quitlogs: {member.name}")
-        await move_user_to_quitlogs(str(member.id), log_id=log_id)
+        await quit_buffer.put(str(member.id), log_id=log_id)
 
 async def setup(bot):
-    await bot.add_cog(RejoinTracker(bot))
+    await bot.add_cog(instrument_cog(RejoinTracker(bot)))
     log_bot("Load Complete", "RejoinTracker Cog loaded")
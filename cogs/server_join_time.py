@@ -1,7 +1,9 @@
 from discord.ext import commands
 from discord import Member
 from db.mongo import save_join_time
+from db.quit_db import quit_buffer
 from utils.logging_utils import log_bot
+from cogs import instrument_cog
 
 class ServerJoinTime(commands.Cog):
     def __init__(self, bot):
@@ -9,9 +11,11 @@ class ServerJoinTime(commands.Cog):
 
     @commands.Cog.listener()
     async def on_member_join(self, member: Member):
+        # 이전 퇴장 처리가 끝나기 전에 문서를 만들면 이동 과정에서 삭제되므로 먼저 대기
+        await quit_buffer.wait_for(str(member.id))
         log_id = log_bot("DB Writing", f"save join time: {member.name}")
         await save_join_time(str(member.id), member.name, log_id=log_id)
 
 async def setup(bot):
-    await bot.add_cog(ServerJoinTime(bot))
+    await bot.add_cog(instrument_cog(ServerJoinTime(bot)))
     log_bot("Load Complete", "ServerJoinTime Cog loaded")
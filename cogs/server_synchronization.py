@@ -1,19 +1,87 @@
 from discord.ext import commands
 from discord import app_commands, Interaction
 import discord
-from db.mongo import upsert_member_info
+from db.mongo import (
+    build_member_info_update, bulk_upsert_member_info, get_sync_fingerprints, member_fingerprint, member_sync_fields,
+)
+from db.quit_db import move_users_to_quitlogs
+from db.write_behind import member_updates
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from cogs import is_master_or_organizer_appcmd
+from cogs import is_master_or_organizer_appcmd, instrument_cog
 from settings import ALERT_CHANNEL_ID, ROLE_MASTER_MENTION, ROLE_ORGANIZER_MENTION
 from utils.logging_utils import log_bot
 
+def member_sync_data(member) -> dict:
+    return {
+        "user_id": str(member.id),
+        "username": member.name,
+        "server_nickname": member.display_name,
+        "joined_at_server": member.joined_at,
+        "granted_role": [r.name for r in member.roles if not r.is_default()],
+    }
+
+
+def member_cache_complete(guild) -> bool:
+    """
+    서버가 사용 가능하고 멤버 캐시가 전부 채워졌는지 (장애/chunk 실패 중에는 False)
+    """
+    return (
+        not guild.unavailable
+        and guild.chunked
+        and guild.member_count is not None
+        and guild.member_count == len(guild.members)
+    )
+
+
+SYNC_ABORTED_MESSAGE = "❌ DB에서 저장된 멤버 정보를 불러오지 못해 동기화를 중단했습니다. 잠시 후 다시 시도해주세요."
+
+
+def format_sync_report(report: dict | None) -> str:
+    if report is None:
+        return SYNC_ABORTED_MESSAGE
+    return (
+        f"✅ 변경된 멤버 `{report['updated']}`명의 정보를 동기화했습니다.\n"
+        f"변경 없음 `{report['unchanged']}`명 · 탈퇴 처리 `{report['removed']}`명"
+    )
+
+
 class ServerSynchronization(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.scheduler = AsyncIOScheduler()
+        # 평소 변경분은 on_member_update/on_user_update로 반영, 주간 동기화는 누락분 정합성 검사
         self.scheduler.add_job(self.auto_sync_server_members, 'interval', days=7)
         self.scheduler.start()
 
+    async def cog_load(self):
+        member_updates.start()
+
+    async def cog_unload(self):
+        self.scheduler.shutdown(wait=False)
+        await member_updates.close()
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before, after):
+        if after.bot:
+            return
+        before_data = member_sync_data(before)
+        after_data = member_sync_data(after)
+        if before_data == after_data:
+            return  # 상태/부스트 등 동기화 대상이 아닌 변경
+        # 변경된 필드만 쓰면 DB에 남아있던 누락/오래된 필드가 fingerprint에 가려지므로 전체 필드를 기록
+        member_updates.put(after_data["user_id"], member_sync_fields(after_data))
+
+    @commands.Cog.listener()
+    async def on_user_update(self, before, after):
+        if after.bot or (before.name == after.name and before.display_name == after.display_name):
+            return
+        for guild in self.bot.guilds:
+            member = guild.get_member(after.id)
+            if not member:
+                continue
+            data = member_sync_data(member)
+            member_updates.put(data["user_id"], member_sync_fields(data))
+
     @app_commands.command(name="서버동기화", description="현재 서버에 있는 모든 멤버 정보를 DB와 동기화합니다.")
     @is_master_or_organizer_appcmd()
     async def sync_server_members(self, interaction: Interaction):
@@ -22,50 +90,76 @@ class ServerSynchronization(commands.Cog):
 
     async def auto_sync_server_members(self):
         for guild in self.bot.guilds:
-            updated = await self._sync_members(guild)
+            report = await self._sync_members(guild)
             # 동기화 후 메시지 전송
             channel = guild.get_channel(ALERT_CHANNEL_ID)
             if channel:
                 embed = discord.Embed(
-                    title="🔁 서버 멤버 주간 동기화 완료",
-                    description=f"{ROLE_MASTER_MENTION} {ROLE_ORGANIZER_MENTION}\n✅ 총 `{updated}`명의 멤버 정보를 동기화했습니다.",
-                    color=discord.Color.teal()
+                    title="🔁 서버 멤버 주간 동기화 완료" if report is not None else "⚠️ 서버 멤버 주간 동기화 실패",
+                    description=f"{ROLE_MASTER_MENTION} {ROLE_ORGANIZER_MENTION}\n{format_sync_report(report)}",
+                    color=discord.Color.teal() if report is not None else discord.Color.red()
                 )
                 await channel.send(embed=embed)
 
-    async def _sync_members(self, guild, interaction=None):
+    async def _sync_members(self, guild, interaction=None) -> dict | None:
+        report = {"unchanged": 0, "updated": 0, "removed": 0}
         if not guild:
             if interaction:
                 await interaction.followup.send("❌ 서버 정보를 가져올 수 없습니다.")
-            return 0
-        
-        updated = 0
-        async for member in guild.fetch_members(limit=None):
+            return report
+
+        # REST fetch_members 대신 gateway 멤버 캐시 사용 (캐시가 비어있으면 chunk 요청)
+        for g in self.bot.guilds:
+            if not g.unavailable and not g.chunked:
+                try:
+                    await g.chunk()
+                except Exception as e:
+                    log_bot("Error", f"member chunk failed: {g.name}: {e}")
+
+        log_id = log_bot("DB Reading", f"load sync fingerprints: {guild.name}")
+        stored = await get_sync_fingerprints(log_id=log_id)
+        if stored is None:
+            # 빈 목록으로 진행하면 전원을 다시 기록하고 탈퇴 판정도 틀어지므로 중단
+            if interaction:
+                await interaction.followup.send(SYNC_ABORTED_MESSAGE)
+            return None
+
+        ops = []
+        for member in guild.members:
             if member.bot:
                 continue  # 봇은 제외
 
-            data = {
-                "user_id": str(member.id),
-                "username": member.name,
-                "server_nickname": member.display_name,
-                "joined_at_server": member.joined_at.isoformat() if member.joined_at else None,
-                "granted_role": [r.name for r in member.roles if not r.is_default()],
-            }
+            data = member_sync_data(member)
+            fingerprint = member_fingerprint(data)
+            if stored.get(data["user_id"]) == fingerprint:
+                report["unchanged"] += 1
+                continue
+            ops.append(build_member_info_update(data, fingerprint))
+
+        log_id = log_bot("DB Writing", f"sync member info: {len(ops)} changed members")
+        report["updated"] = await bulk_upsert_member_info(ops, log_id=log_id)
 
-            log_id = log_bot("DB Writing", f"sync member info: {member.name}")
-            await upsert_member_info(data, log_id=log_id)
-            updated += 1
+        # 봇이 속한 어떤 서버에도 없는 유저 -> 탈퇴 처리 (봇이 꺼져있는 동안 나간 멤버)
+        # 멤버 캐시가 불완전한 서버가 하나라도 있으면 전원이 탈퇴로 보일 수 있으므로 이번 실행에서는 건너뜀
+        incomplete = [g.name for g in self.bot.guilds if not member_cache_complete(g)]
+        present = {str(m.id) for g in self.bot.guilds for m in g.members}
+        departed = [] if incomplete else sorted(stored.keys() - present)
+        if incomplete:
+            log_bot("Error", f"skip departure sync, member cache incomplete: {incomplete}")
+        if departed:
+            log_id = log_bot("DB Writing", f"move departed users to quitlogs: {len(departed)}")
+            report["removed"] = await move_users_to_quitlogs(departed, log_id=log_id)
 
         if interaction:
             embed = discord.Embed(
                     title="🔁 서버 멤버 수동 동기화 완료",
-                    description=f"✅ 총 `{updated}`명의 멤버 정보를 동기화했습니다.",
+                    description=format_sync_report(report),
                     color=discord.Color.teal()
             )
             await interaction.followup.send(embed=embed)
 
-        return updated
+        return report
 
 async def setup(bot):
-    await bot.add_cog(ServerSynchronization(bot))
+    await bot.add_cog(instrument_cog(ServerSynchronization(bot)))
     log_bot("Load Complete", "ServerSynchronization Cog loaded")
@@ -3,7 +3,7 @@ from discord import app_commands, Interaction, Member
 import discord
 from db.mongo import get_user_profile
 from utils.time_utils import to_kst, KST_DISPLAY_FORMAT
-from cogs import is_master_or_organizer_appcmd
+from cogs import is_master_or_organizer_appcmd, instrument_cog
 from utils.logging_utils import log_bot
 
 # Refactor: unified KST parsing/formatting; behavior unchanged
@@ -51,7 +51,7 @@ class UserProfileTracker(commands.Cog):
         await interaction.response.defer()
 
         user_id = str(user.id)
-        log_id = log_bot("DB Reading", f"get user profile: {user.display_name}")
+        log_id = log_bot("DB Reading", "get user profile: %s", user.display_name)
         profile = await get_user_profile(user_id, log_id=log_id)
 
         if not profile:
@@ -103,5 +103,5 @@ class UserProfileTracker(commands.Cog):
 
 
 async def setup(bot):
-    await bot.add_cog(UserProfileTracker(bot))
+    await bot.add_cog(instrument_cog(UserProfileTracker(bot)))
     log_bot("Load Complete", "UserProfileTracker Cog loaded")
@@ -3,6 +3,7 @@ from discord import app_commands, Interaction, User
 from db.mongo import get_total_voice_duration
 import discord
 from utils.logging_utils import log_bot
+from cogs import instrument_cog
 
 def format_duration(seconds: int) -> str:
     units = [
@@ -43,5 +44,5 @@ class VoiceDurationTracker(commands.Cog):
         await interaction.followup.send(embed=embed)
 
 async def setup(bot):
-    await bot.add_cog(VoiceDurationTracker(bot))
+    await bot.add_cog(instrument_cog(VoiceDurationTracker(bot)))
     log_bot("Load Complete", "VoiceDurationTracker Cog loaded")
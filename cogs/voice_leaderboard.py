@@ -1,18 +1,27 @@
+import asyncio
+import heapq
 from datetime import datetime, timedelta, timezone
 
 import discord
 from dateutil.relativedelta import relativedelta
 from discord import app_commands, Interaction
 from discord.ext import commands
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.triggers.cron import CronTrigger
 
-from cogs import is_member_or_above_appcmd
-from db.voice_sessions import (
+from cogs import is_master_or_organizer_appcmd, is_member_or_above_appcmd, instrument_cog
+from db.leaderboard_cache import (
     aggregate_month,
     aggregate_month_week,
     aggregate_range,
-    cleanup_old_months,
+    leaderboard_cache,
 )
+from db import voice_rollups
+from db.open_sessions import open_sessions
+from db.voice_sessions import cleanup_old_months
+from settings import VOICE_RETENTION_BATCH_SIZE, VOICE_RETENTION_MONTHS
 from utils.logging_utils import log_bot
+from utils.metrics_utils import span
 from utils.time_utils import to_kst
 
 
@@ -70,12 +79,35 @@ def render_leaderboard(title: str, results, guild, header_line: str | None = Non
         total_seconds = int(row.get("total_seconds", 0))
         member = guild.get_member(int(user_id)) if guild else None
         display_name = member.display_name if member else username
-        lines.append(f"{idx}. **{display_name}** — {format_duration(total_seconds)}")
+        live_mark = " 🎙️" if row.get("live") else ""
+        lines.append(f"{idx}. **{display_name}** — {format_duration(total_seconds)}{live_mark}")
 
     embed.description = "\n".join(lines)
     return embed
 
 
+async def with_live_sessions(results, load_stored, limit: int = 10):
+    """
+    저장된 집계 결과에 진행 중인 음성 세션 시간을 더해 다시 순위를 매김 (DB 쓰기 없음)
+    - load_stored(user_ids): 상위 목록에 없는 접속 중 유저들의 저장된 합계 조회
+    """
+    live = open_sessions.live_seconds(datetime.now(timezone.utc))
+    if not live:
+        return results
+
+    totals = {row["_id"]: dict(row) for row in results}
+    missing = [user_id for user_id in live if user_id not in totals]
+    if missing:
+        for row in await load_stored(missing):
+            totals.setdefault(row["_id"], dict(row))
+
+    for user_id, (username, seconds) in live.items():
+        row = totals.setdefault(user_id, {"_id": user_id, "username": username, "total_seconds": 0})
+        row["total_seconds"] += seconds
+        row["live"] = True
+    return heapq.nlargest(limit, totals.values(), key=lambda row: row["total_seconds"])
+
+
 def render_future_notice(title: str, header_line: str | None = None) -> discord.Embed:
     embed = discord.Embed(title=title, color=discord.Color.purple())
     lines = []
@@ -90,17 +122,47 @@ def render_future_notice(title: str, header_line: str | None = None) -> discord.
 class VoiceLeaderboard(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-
-    async def _cleanup(self):
+        # 보존 기간이 지난 데이터는 명령어 처리와 분리하여 매일 새벽에 정리
+        self.scheduler = AsyncIOScheduler()
+        self.scheduler.add_job(
+            self.cleanup_old_sessions,
+            trigger=CronTrigger(hour=4, minute=0, timezone='Asia/Seoul')
+        )
+        self.scheduler.start()
+        self._backfill_task: asyncio.Task | None = None
+
+    async def cog_load(self):
+        # 집계 컬렉션이 비어 있으면(사전 집계 도입 후 첫 시작) 원본으로 채움, 시작을 막지 않도록 백그라운드 실행
+        self._backfill_task = asyncio.create_task(self.backfill_rollups())
+
+    async def cog_unload(self):
+        self.scheduler.shutdown(wait=False)
+        if self._backfill_task and not self._backfill_task.done():
+            self._backfill_task.cancel()
+
+    async def backfill_rollups(self):
+        log_id = log_bot("DB Writing", "backfill voice leaderboard rollups")
+        counts = await voice_rollups.backfill_rollups_if_empty(log_id=log_id)
+        if counts is not None:
+            leaderboard_cache.clear()
+            log_bot("DB Writing", f"voice leaderboard rollups backfilled: {counts}", log_id=log_id)
+
+    async def cleanup_old_sessions(self):
         now_kst = to_kst(datetime.now(timezone.utc))
         log_id = log_bot("DB Writing", "cleanup old voice sessions")
-        await cleanup_old_months(now_kst, keep_months=4, log_id=log_id)
+        deleted = await cleanup_old_months(
+            now_kst,
+            keep_months=VOICE_RETENTION_MONTHS,
+            batch_size=VOICE_RETENTION_BATCH_SIZE,
+            log_id=log_id,
+        )
+        leaderboard_cache.clear()
+        log_bot("VoiceLeaderboard", f"retention cleanup done — deleted: {deleted}")
 
     @app_commands.command(name="주간-음성-리더보드-오늘", description="오늘 기준 최근 7일간 음성채널 상주 시간 Top 10 멤버")
     @is_member_or_above_appcmd()
     async def weekly_leaderboard_today(self, interaction: Interaction):
         await interaction.response.defer(thinking=True)
-        await self._cleanup()
 
         now_kst = to_kst(datetime.now(timezone.utc))
         start_date = (now_kst.date() - timedelta(days=7)).strftime("%Y-%m-%d")
@@ -108,17 +170,21 @@ class VoiceLeaderboard(commands.Cog):
 
         log_id = log_bot("DB Reading", f"weekly leaderboard {start_date}~{end_date}")
         results = await aggregate_range(start_date, end_date, limit=10, log_id=log_id)
+        results = await with_live_sessions(
+            results,
+            lambda user_ids: voice_rollups.aggregate_range(start_date, end_date, limit=len(user_ids), user_ids=user_ids, log_id=log_id),
+        )
         title = "📅 음성 리더보드 (오늘 기준)"
         current_week = week_of_month(now_kst.year, now_kst.month, now_kst.day)
         header_line = f"이번 주차: {now_kst.year}년 {now_kst.month}월 {current_week}주차"
         embed = render_leaderboard(title, results, interaction.guild, header_line=header_line)
-        await interaction.followup.send(embed=embed)
+        with span("discord.voice_leaderboard.send"):
+            await interaction.followup.send(embed=embed)
 
     @app_commands.command(name="월간-음성-리더보드-오늘", description="오늘 기준 최근 1개월 음성채널 상주 시간 Top 10 멤버")
     @is_member_or_above_appcmd()
     async def monthly_leaderboard_today(self, interaction: Interaction):
         await interaction.response.defer(thinking=True)
-        await self._cleanup()
 
         now_kst = to_kst(datetime.now(timezone.utc))
         start_date = (now_kst.date() - relativedelta(months=1)).strftime("%Y-%m-%d")
@@ -126,17 +192,21 @@ class VoiceLeaderboard(commands.Cog):
 
         log_id = log_bot("DB Reading", f"monthly leaderboard {start_date}~{end_date}")
         results = await aggregate_range(start_date, end_date, limit=10, log_id=log_id)
+        results = await with_live_sessions(
+            results,
+            lambda user_ids: voice_rollups.aggregate_range(start_date, end_date, limit=len(user_ids), user_ids=user_ids, log_id=log_id),
+        )
         title = "🗓️ 월간 음성 리더보드 (오늘 기준)"
         current_week = week_of_month(now_kst.year, now_kst.month, now_kst.day)
         header_line = f"이번 주차: {now_kst.year}년 {now_kst.month}월 {current_week}주차"
         embed = render_leaderboard(title, results, interaction.guild, header_line=header_line)
-        await interaction.followup.send(embed=embed)
+        with span("discord.voice_leaderboard.send"):
+            await interaction.followup.send(embed=embed)
 
     @app_commands.command(name="주차별-음성-리더보드", description="최근 3개월 중 특정 주차의 음성채널 상주 시간 Top 10 멤버")
     @is_member_or_above_appcmd()
     async def week_leaderboard(self, interaction: Interaction, week: int):
         await interaction.response.defer(thinking=True)
-        await self._cleanup()
 
         now_kst = to_kst(datetime.now(timezone.utc))
         year = now_kst.year
@@ -151,17 +221,22 @@ class VoiceLeaderboard(commands.Cog):
 
         log_id = log_bot("DB Reading", f"week leaderboard {year}-{month} W{week}")
         results = await aggregate_month_week(year, month, week, limit=10, log_id=log_id)
+        if week == current_week:
+            results = await with_live_sessions(
+                results,
+                lambda user_ids: voice_rollups.aggregate_month_week(year, month, week, limit=len(user_ids), user_ids=user_ids, log_id=log_id),
+            )
         start_day, end_day = week_range_in_month(year, month, week)
         title = f"📆 {year}년 {month}월 {week}주차 음성 리더보드 ({start_day}일~{end_day}일)"
         header_line = f"이번 주차: {year}년 {month}월 {current_week}주차"
         embed = render_leaderboard(title, results, interaction.guild, header_line=header_line)
-        await interaction.followup.send(embed=embed)
+        with span("discord.voice_leaderboard.send"):
+            await interaction.followup.send(embed=embed)
 
     @app_commands.command(name="월별-음성-리더보드", description="최근 3개월 중 특정 월의 음성채널 상주 시간 Top 10 멤버")
     @is_member_or_above_appcmd()
     async def month_leaderboard(self, interaction: Interaction, month: int):
         await interaction.response.defer(thinking=True)
-        await self._cleanup()
 
         now_kst = to_kst(datetime.now(timezone.utc))
         year = now_kst.year
@@ -175,13 +250,38 @@ class VoiceLeaderboard(commands.Cog):
 
         log_id = log_bot("DB Reading", f"month leaderboard {year}-{month}")
         results = await aggregate_month(year, month, limit=10, log_id=log_id)
+        if month == now_kst.month:
+            results = await with_live_sessions(
+                results,
+                lambda user_ids: voice_rollups.aggregate_month(year, month, limit=len(user_ids), user_ids=user_ids, log_id=log_id),
+            )
         title = f"🗓️ {year}년 {month}월 음성 리더보드"
         current_week = week_of_month(now_kst.year, now_kst.month, now_kst.day)
         header_line = f"이번 주차: {now_kst.year}년 {now_kst.month}월 {current_week}주차"
         embed = render_leaderboard(title, results, interaction.guild, header_line=header_line)
-        await interaction.followup.send(embed=embed)
+        with span("discord.voice_leaderboard.send"):
+            await interaction.followup.send(embed=embed)
+
+    @app_commands.command(name="음성-리더보드-재계산", description="[관리]음성 세션 원본으로 리더보드 집계 데이터를 다시 생성합니다.")
+    @is_master_or_organizer_appcmd()
+    async def rebuild_leaderboard(self, interaction: Interaction):
+        await interaction.response.defer(thinking=True, ephemeral=True)
+
+        log_id = log_bot("DB Writing", "rebuild voice leaderboard rollups")
+        counts = await voice_rollups.rebuild_rollups(log_id=log_id)
+        leaderboard_cache.clear()
+        lines = [
+            f"`{name}`: {'❌ 실패' if count is None else f'{count}건'}"
+            for name, count in counts.items()
+        ]
+        embed = discord.Embed(
+            title="🔁 음성 리더보드 재계산 완료",
+            description="\n".join(lines),
+            color=discord.Color.teal()
+        )
+        await interaction.followup.send(embed=embed, ephemeral=True)
 
 
 async def setup(bot):
-    await bot.add_cog(VoiceLeaderboard(bot))
+    await bot.add_cog(instrument_cog(VoiceLeaderboard(bot)))
     log_bot("Load Complete", "VoiceLeaderboard Cog loaded")
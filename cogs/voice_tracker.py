@@ -1,7 +1,10 @@
 from discord.ext import commands
 from discord import app_commands, User
-from db.mongo import update_user_voice_log, get_last_active_by_user_id, add_voice_duration
-from db.voice_sessions import add_voice_session
+from cogs import instrument_cog
+from db.mongo import get_last_active_by_user_id
+from db.write_behind import voice_writes, queue_voice_log, queue_voice_leave
+from db.open_sessions import open_sessions, queue_open_session, queue_close_session, load_open_sessions, touch_open_sessions
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from utils.time_utils import to_kst, KST_DISPLAY_FORMAT
 from utils.logging_utils import log_bot
 from datetime import datetime, timezone
@@ -11,7 +14,75 @@ import discord
 class VoiceTracker(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.voice_times = {}
+        self.voice_times = open_sessions
+        self._restored = False
+        self.scheduler = AsyncIOScheduler()
+        self.scheduler.add_job(self.heartbeat_open_sessions, 'interval', minutes=5)
+        self.scheduler.start()
+
+    async def cog_load(self):
+        voice_writes.start()
+
+    async def cog_unload(self):
+        self.scheduler.shutdown(wait=False)
+        # 큐에 남은 쓰기 작업을 모두 DB에 반영한 뒤 종료
+        await voice_writes.close()
+        log_bot("DB Writing", f"voice write-behind queue closed: {voice_writes.stats()}")
+
+    async def heartbeat_open_sessions(self):
+        if self.voice_times and self.bot.is_ready():
+            await touch_open_sessions(datetime.now(timezone.utc))
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        now = datetime.now(timezone.utc)
+
+        # 현재 음성 채널에 있는 멤버
+        in_voice = {}
+        for guild in self.bot.guilds:
+            for channel in [*guild.voice_channels, *guild.stage_channels]:
+                for member in channel.members:
+                    in_voice[str(member.id)] = (member, channel)
+
+        # 최초 on_ready: DB에 남아있는 열린 세션 복구 / 재연결: 메모리 상의 세션 기준
+        if not self._restored:
+            log_id = log_bot("DB Reading", "restore open voice sessions")
+            stored = await load_open_sessions(log_id=log_id)
+            self._restored = True
+        else:
+            stored = {
+                user_id: {"username": username, "join_time": join_time, "last_seen": now}
+                for user_id, (join_time, username) in self.voice_times.snapshot().items()
+            }
+
+        restored = started = closed = 0
+        for user_id, (member, channel) in in_voice.items():
+            session = stored.get(user_id)
+            if session:
+                self.voice_times.start(user_id, member.name, session["join_time"])
+                restored += 1
+            elif user_id not in self.voice_times:
+                # 봇이 꺼져있는 동안 입장한 멤버 -> 지금부터 기록
+                self.voice_times.start(user_id, member.name, now)
+                await queue_open_session(user_id, member.name, now, channel=channel.name)
+                started += 1
+
+        for user_id, session in stored.items():
+            if user_id in in_voice:
+                continue
+            # 봇이 꺼져있는 동안 퇴장한 멤버 -> 마지막 heartbeat 시각으로 세션 종료
+            join_time = session["join_time"]
+            end_time = min(session["last_seen"] or join_time, now)
+            duration = int((end_time - join_time).total_seconds())
+            username = session["username"] or user_id
+            log_id = log_bot("DB Writing", f"close stale voice session: {username} +{duration}s")
+            if duration > 0:
+                await queue_voice_leave(user_id, username, join_time, end_time, duration, log_id=log_id)
+            await queue_close_session(user_id, log_id=log_id)
+            self.voice_times.end(user_id)
+            closed += 1
+
+        log_bot("VoiceTracker", f"open sessions reconciled — restored: {restored}, started: {started}, closed: {closed}")
 
     @commands.Cog.listener()
     async def on_voice_state_update(self, member, before, after):
@@ -21,28 +92,27 @@ class VoiceTracker(commands.Cog):
         
         # Voice Channel Enter
         if before.channel is None and after.channel is not None:
-            self.voice_times[user_id] = now
-            log_id = log_bot("DB Writing", f"update user voice log (join): {username}")
-            await update_user_voice_log(user_id, username=username, join_time=now, channel=after.channel.name, log_id=log_id)
+            self.voice_times.start(user_id, username, now)
+            log_id = log_bot("DB Writing", "update user voice log (join): %s", username)
+            await queue_voice_log(user_id, username=username, join_time=now, channel=after.channel.name, log_id=log_id)
+            await queue_open_session(user_id, username, now, channel=after.channel.name, log_id=log_id)
         
         # Voice Channel Quit
         elif before.channel is not None and after.channel is None:
-            join_time = self.voice_times.get(user_id)
+            join_time = self.voice_times.join_time(user_id)
             if join_time:
                 duration = int((now - join_time).total_seconds())
-                log_id = log_bot("DB Writing", f"add voice duration: {username} +{duration}s")
-                await add_voice_duration(str(member.id), member.name, duration, log_id=log_id)
-                log_id = log_bot("DB Writing", f"add voice session: {username} +{duration}s")
-                await add_voice_session(str(member.id), member.name, join_time, now, duration, log_id=log_id)
-                log_id = log_bot("DB Writing", f"update user voice log (leave): {username}")
-                await update_user_voice_log(user_id, username=username, leave_time=now, log_id=log_id)
-                del self.voice_times[user_id]
+                log_id = log_bot("DB Writing", "queue voice leave: %s +%ss", username, duration)
+                await queue_voice_leave(user_id, username, join_time, now, duration, log_id=log_id)
+                await queue_close_session(user_id, log_id=log_id)
+                self.voice_times.end(user_id)
         
         # Voice Channel Change
         elif before.channel != after.channel:
-            self.voice_times[user_id] = now
-            log_id = log_bot("DB Writing", f"update user voice log (move): {username}")
-            await update_user_voice_log(user_id, username=username, join_time=now, channel=after.channel.name, log_id=log_id)
+            self.voice_times.start(user_id, username, now)
+            log_id = log_bot("DB Writing", "update user voice log (move): %s", username)
+            await queue_voice_log(user_id, username=username, join_time=now, channel=after.channel.name, log_id=log_id)
+            await queue_open_session(user_id, username, now, channel=after.channel.name, log_id=log_id)
 
     @app_commands.command(name="출석-확인", description="닉네임 기준으로 마지막 음성 채널 접속시간을 확인합니다.")
     async def attendance_check(self, interaction: discord.Interaction, user: User):
@@ -50,7 +120,7 @@ class VoiceTracker(commands.Cog):
         user_id = str(user.id)
         username = user.name
 
-        log_id = log_bot("DB Reading", f"get last active: {username}")
+        log_id = log_bot("DB Reading", "get last active: %s", username)
         last_active = await get_last_active_by_user_id(user_id, log_id=log_id)
         if last_active:
             formatted_time = to_kst(last_active).strftime(KST_DISPLAY_FORMAT)
@@ -70,5 +140,5 @@ class VoiceTracker(commands.Cog):
 
 # 🔑 비동기 setup 함수 (필수!)
 async def setup(bot):
-    await bot.add_cog(VoiceTracker(bot))
+    await bot.add_cog(instrument_cog(VoiceTracker(bot)))
     log_bot("Load Complete", "VoiceTracker Cog loaded")
@@ -2,13 +2,45 @@ import os
 from dotenv import load_dotenv
 from motor.motor_asyncio import AsyncIOMotorClient
 
+from db.monitoring import command_monitor, pool_monitor
+
 # Refactor: centralize Mongo connection; behavior unchanged
 load_dotenv()
 MONGO_URI = os.getenv("MONGODB_URI")
 
-client = AsyncIOMotorClient(MONGO_URI)
+# 커넥션 풀 / 타임아웃 (미설정 시 드라이버 기본값)
+_POOL_OPTIONS = {
+    "maxPoolSize": "MONGODB_MAX_POOL_SIZE",
+    "minPoolSize": "MONGODB_MIN_POOL_SIZE",
+    "maxIdleTimeMS": "MONGODB_MAX_IDLE_TIME_MS",
+    "waitQueueTimeoutMS": "MONGODB_WAIT_QUEUE_TIMEOUT_MS",
+    "connectTimeoutMS": "MONGODB_CONNECT_TIMEOUT_MS",
+    "socketTimeoutMS": "MONGODB_SOCKET_TIMEOUT_MS",
+    "serverSelectionTimeoutMS": "MONGODB_SERVER_SELECTION_TIMEOUT_MS",
+}
+client_options = {
+    option: int(os.getenv(env_name))
+    for option, env_name in _POOL_OPTIONS.items()
+    if os.getenv(env_name)
+}
+
+# tz_aware: BSON date를 UTC aware datetime으로 읽음 (to_kst 변환 시 naive로 오인하지 않도록)
+# event_listeners: userlogs/quitlogs/voice_sessions 명령 실행 시간, 느린 쿼리, 커넥션 풀 상태 (db/monitoring.py)
+client = AsyncIOMotorClient(
+    MONGO_URI,
+    tz_aware=True,
+    event_listeners=[command_monitor, pool_monitor],
+    **client_options,
+)
 db = client.watchersdb
 
 userlogs = db.userlogs
 quitlogs = db.quitlogs
 voice_sessions = db.voice_sessions
+voice_open_sessions = db.voice_open_sessions
+migrations = db.migrations
+
+# 음성 리더보드용 사전 집계 (voice_sessions 기록 시 $inc로 갱신)
+voice_daily_totals = db.voice_daily_totals
+voice_weekly_totals = db.voice_weekly_totals
+voice_monthly_totals = db.voice_monthly_totals
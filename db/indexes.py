@@ -0,0 +1,143 @@
+import asyncio
+import os
+import sys
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+from db.connection import (
+    quitlogs,
+    userlogs,
+    voice_daily_totals,
+    voice_monthly_totals,
+    voice_open_sessions,
+    voice_sessions,
+    voice_weekly_totals,
+)
+from utils.logging_utils import log_db
+from utils.metrics_utils import timed
+
+# 쿼리 플랜 검증 모드: "" (끔) / "report" (로그만) / "strict" (COLLSCAN 발견 시 시작 중단)
+VERIFY_QUERY_PLANS = os.getenv("MONGODB_VERIFY_QUERY_PLANS", "").lower()
+
+_YEAR_MONTH_WEEK = [("kst_year", ASCENDING), ("kst_month", ASCENDING), ("kst_week_of_month", ASCENDING)]
+
+INDEXES = [
+    (userlogs, [
+        IndexModel([("user_id", ASCENDING)], unique=True, name="user_id_unique"),
+        IndexModel([("last_active", ASCENDING)], name="last_active"),
+        IndexModel([("joined_at_server", ASCENDING)], name="joined_at_server"),
+    ]),
+    (quitlogs, [
+        IndexModel([("user_id", ASCENDING)], unique=True, name="user_id_unique"),
+    ]),
+    (voice_sessions, [
+        IndexModel([("kst_date", ASCENDING)], name="kst_date"),
+        IndexModel(_YEAR_MONTH_WEEK, name="kst_year_month_week"),
+    ]),
+    (voice_open_sessions, [
+        IndexModel([("user_id", ASCENDING)], unique=True, name="user_id_unique"),
+    ]),
+    (voice_daily_totals, [
+        IndexModel([("user_id", ASCENDING), ("kst_date", ASCENDING)], unique=True, name="user_date_unique"),
+        IndexModel([("kst_date", ASCENDING)], name="kst_date"),
+    ]),
+    (voice_weekly_totals, [
+        IndexModel([("user_id", ASCENDING), *_YEAR_MONTH_WEEK], unique=True, name="user_week_unique"),
+        IndexModel([*_YEAR_MONTH_WEEK, ("total_seconds", DESCENDING)], name="week_ranking"),
+    ]),
+    (voice_monthly_totals, [
+        IndexModel([("user_id", ASCENDING), ("kst_year", ASCENDING), ("kst_month", ASCENDING)], unique=True, name="user_month_unique"),
+        IndexModel([("kst_year", ASCENDING), ("kst_month", ASCENDING), ("total_seconds", DESCENDING)], name="month_ranking"),
+    ]),
+]
+
+# db/ 헬퍼가 실행하는 쿼리 형태: (헬퍼 이름, 컬렉션, filter, sort)
+QUERY_SHAPES = [
+    ("mongo.user_id lookup", userlogs, {"user_id": "0"}, None),
+    ("mongo.find_inactive_users (last_active)", userlogs, {"last_active": {"$gt": "2000-01-01", "$lte": "2000-01-02"}}, None),
+    ("mongo.find_inactive_users (joined_at_server)", userlogs, {"last_active": {"$in": [None, ""]}, "joined_at_server": {"$gt": "2000-01-01", "$lte": "2000-01-02"}}, None),
+    ("quit_db.move_user_to_quitlogs", quitlogs, {"user_id": "0"}, None),
+    ("voice_sessions.aggregate_range", voice_sessions, {"kst_date": {"$gte": "2000-01-01", "$lte": "2000-01-31"}}, None),
+    ("voice_sessions.aggregate_month_week", voice_sessions, {"kst_year": 2000, "kst_month": 1, "kst_week_of_month": 1}, None),
+    ("voice_sessions.aggregate_month", voice_sessions, {"kst_year": 2000, "kst_month": 1}, None),
+    ("voice_sessions.cleanup_old_months", voice_sessions, {"kst_date": {"$lt": "2000-01-01"}}, None),
+    ("voice_rollups.aggregate_range", voice_daily_totals, {"kst_date": {"$gte": "2000-01-01", "$lte": "2000-01-31"}}, None),
+    ("voice_rollups.aggregate_month_week", voice_weekly_totals, {"kst_year": 2000, "kst_month": 1, "kst_week_of_month": 1}, [("total_seconds", DESCENDING)]),
+    ("voice_rollups.aggregate_month", voice_monthly_totals, {"kst_year": 2000, "kst_month": 1}, [("total_seconds", DESCENDING)]),
+]
+
+
+@timed()
+async def ensure_indexes(log_id: str | None = None):
+    """
+    필요한 인덱스를 선언 (이미 같은 인덱스가 있으면 아무 작업도 하지 않음)
+    """
+    for collection, models in INDEXES:
+        try:
+            names = await collection.create_indexes(models)
+            log_db("DB", f"indexes ensured on {collection.name}: {names}", log_id=log_id)
+        except Exception as e:
+            # 예: 기존 데이터에 user_id 중복이 있어 unique 인덱스 생성 실패
+            log_db("Error", f"index creation failed on {collection.name}: {e}", log_id=log_id)
+
+
+def _plan_stages(plan) -> list[str]:
+    stages = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for value in plan.values():
+            stages.extend(_plan_stages(value))
+    elif isinstance(plan, list):
+        for value in plan:
+            stages.extend(_plan_stages(value))
+    return stages
+
+
+@timed()
+async def verify_query_plans(strict: bool = False, log_id: str | None = None) -> list[tuple[str, list[str]]]:
+    """
+    QUERY_SHAPES 각각에 explain()을 실행하여 winning plan의 stage 목록을 반환
+    - COLLSCAN이 포함된 쿼리는 Error 로그, strict이면 RuntimeError
+    """
+    report = []
+    collscans = []
+    for name, collection, query, sort in QUERY_SHAPES:
+        cursor = collection.find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+        explain = await cursor.explain()
+        stages = _plan_stages(explain.get("queryPlanner", {}).get("winningPlan", {}))
+        report.append((name, stages))
+        if "COLLSCAN" in stages:
+            collscans.append(name)
+            log_db("Error", f"query plan COLLSCAN: {name} on {collection.name} {query}", log_id=log_id)
+        else:
+            log_db("DB", f"query plan ok: {name} -> {' > '.join(stages)}", log_id=log_id)
+
+    if collscans and strict:
+        raise RuntimeError(f"COLLSCAN query plans: {', '.join(collscans)}")
+    return report
+
+
+async def bootstrap_indexes(log_id: str | None = None):
+    await ensure_indexes(log_id=log_id)
+    if VERIFY_QUERY_PLANS in ("report", "strict"):
+        await verify_query_plans(strict=VERIFY_QUERY_PLANS == "strict", log_id=log_id)
+
+
+async def _main() -> int:
+    await ensure_indexes()
+    try:
+        report = await verify_query_plans(strict=True)
+    except RuntimeError as e:
+        print(e)
+        return 1
+    for name, stages in report:
+        print(f"{name}: {' > '.join(stages)}")
+    return 0
+
+
+if __name__ == "__main__":
+    # python -m db.indexes : 인덱스 생성 후 쿼리 플랜 검증 (COLLSCAN 발견 시 exit 1)
+    sys.exit(asyncio.run(_main()))
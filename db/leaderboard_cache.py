@@ -0,0 +1,74 @@
+import os
+from datetime import datetime, timezone
+from typing import Iterable
+
+from db import voice_rollups
+from utils.cache_utils import AsyncTTLCache
+from utils.time_utils import to_kst
+from utils.metrics_utils import timed
+
+# 리더보드 조회 결과 캐시
+# - 진행 중인 기간은 TTL 동안만 유지, 지난 달(닫힌 기간)은 만료 없이 유지
+# - 세션이 기록되면 해당 날짜가 포함된 항목을 무효화
+LEADERBOARD_CACHE_TTL_SECONDS = float(os.getenv("LEADERBOARD_CACHE_TTL_SECONDS", "60"))
+LEADERBOARD_CACHE_MAX_ENTRIES = int(os.getenv("LEADERBOARD_CACHE_MAX_ENTRIES", "128"))
+
+leaderboard_cache = AsyncTTLCache(ttl=LEADERBOARD_CACHE_TTL_SECONDS, maxsize=LEADERBOARD_CACHE_MAX_ENTRIES)
+
+
+def _ttl_for_month(year: int, month: int):
+    now_kst = to_kst(datetime.now(timezone.utc))
+    if (year, month) < (now_kst.year, now_kst.month):
+        return None
+    return LEADERBOARD_CACHE_TTL_SECONDS
+
+
+@timed()
+async def aggregate_range(start_kst_date: str, end_kst_date: str, limit: int = 10, log_id: str | None = None):
+    return await leaderboard_cache.get_or_load(
+        ("range", start_kst_date, end_kst_date, limit),
+        lambda: voice_rollups.aggregate_range(start_kst_date, end_kst_date, limit=limit, log_id=log_id),
+    )
+
+
+@timed()
+async def aggregate_month_week(year: int, month: int, week: int, limit: int = 10, log_id: str | None = None):
+    return await leaderboard_cache.get_or_load(
+        ("week", year, month, week, limit),
+        lambda: voice_rollups.aggregate_month_week(year, month, week, limit=limit, log_id=log_id),
+        ttl=_ttl_for_month(year, month),
+    )
+
+
+@timed()
+async def aggregate_month(year: int, month: int, limit: int = 10, log_id: str | None = None):
+    return await leaderboard_cache.get_or_load(
+        ("month", year, month, limit),
+        lambda: voice_rollups.aggregate_month(year, month, limit=limit, log_id=log_id),
+        ttl=_ttl_for_month(year, month),
+    )
+
+
+def invalidate_sessions(sessions: Iterable[dict]) -> int:
+    """
+    기록된 voice_sessions 문서들의 기간(kst_date / 주차 / 월)을 포함하는 캐시 항목 제거
+    """
+    dates = set()
+    weeks = set()
+    months = set()
+    for session in sessions:
+        dates.add(session["kst_date"])
+        weeks.add((session["kst_year"], session["kst_month"], session["kst_week_of_month"]))
+        months.add((session["kst_year"], session["kst_month"]))
+
+    def affected(key) -> bool:
+        kind = key[0]
+        if kind == "range":
+            return any(key[1] <= date <= key[2] for date in dates)
+        if kind == "week":
+            return key[1:4] in weeks
+        if kind == "month":
+            return key[1:3] in months
+        return False
+
+    return leaderboard_cache.invalidate(affected)
@@ -0,0 +1,83 @@
+import asyncio
+from datetime import datetime, timezone
+
+from pymongo import UpdateOne
+
+from db.connection import migrations, quitlogs, userlogs, voice_open_sessions, voice_sessions
+from utils.logging_utils import log_db
+from utils.metrics_utils import timed
+
+# ISO 문자열로 저장된 시각 필드 -> BSON date 변환 대상
+DATE_FIELDS = [
+    (userlogs, ["join_time", "leave_time", "last_active", "joined_at_server", "granted_time"]),
+    (quitlogs, ["join_time", "leave_time", "last_active", "joined_at_server", "granted_time", "quit_time"]),
+    (voice_sessions, ["start_time", "end_time"]),
+    (voice_open_sessions, ["join_time", "last_seen"]),
+]
+
+
+def _parse_iso(value: str) -> datetime | None:
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+async def _migrate_collection(collection, fields: list[str], batch_size: int, pause: float, log_id: str | None) -> int:
+    progress_id = f"iso_dates_to_bson:{collection.name}"
+    progress = await migrations.find_one({"_id": progress_id}) or {}
+    last_id = progress.get("last_id")
+
+    string_fields = {"$or": [{field: {"$type": "string"}} for field in fields]}
+    projection = {field: 1 for field in fields}
+    converted = progress.get("converted", 0)
+    while True:
+        query = {**string_fields, "_id": {"$gt": last_id}} if last_id is not None else string_fields
+        docs = [doc async for doc in collection.find(query, projection).sort("_id", 1).limit(batch_size)]
+        if not docs:
+            break
+
+        ops = []
+        for doc in docs:
+            originals = {f: doc[f] for f in fields if isinstance(doc.get(f), str)}
+            parsed = {f: _parse_iso(v) for f, v in originals.items()}
+            parsed = {f: v for f, v in parsed.items() if v is not None}
+            if parsed:
+                # 변환 사이에 봇이 같은 필드를 새로 기록했다면 건너뜀 (다음 실행에서 다시 확인)
+                ops.append(UpdateOne({"_id": doc["_id"], **{f: originals[f] for f in parsed}}, {"$set": parsed}))
+        if ops:
+            result = await collection.bulk_write(ops, ordered=False)
+            converted += result.modified_count
+
+        last_id = docs[-1]["_id"]
+        await migrations.update_one(
+            {"_id": progress_id},
+            {"$set": {"last_id": last_id, "converted": converted, "updated_at": datetime.now(timezone.utc)}},
+            upsert=True,
+        )
+        await asyncio.sleep(pause)
+
+    # 끝까지 처리했으면 진행 상태 초기화 (다음 실행은 처음부터 남은 문자열만 확인)
+    await migrations.delete_one({"_id": progress_id})
+    log_db("DB Writing", f"iso date migration done on {collection.name}: {converted} docs", log_id=log_id)
+    return converted
+
+
+@timed()
+async def migrate_iso_dates(batch_size: int = 500, pause: float = 0.1, log_id: str | None = None) -> dict:
+    """
+    ISO 문자열 시각 필드를 BSON date로 변환 (온라인, 배치 단위, 중단 후 이어서 실행 가능)
+    - 진행 상태는 migrations 컬렉션에 배치마다 기록
+    - 변환 중에도 읽는 쪽은 두 형식을 모두 처리하므로 봇을 멈출 필요 없음
+    """
+    results = {}
+    for collection, fields in DATE_FIELDS:
+        try:
+            results[collection.name] = await _migrate_collection(collection, fields, batch_size, pause, log_id)
+        except Exception as e:
+            log_db("Error", f"iso date migration failed on {collection.name}: {e}", log_id=log_id)
+            results[collection.name] = None
+    return results
@@ -1,25 +1,28 @@
-from datetime import datetime, timezone
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+
+from pymongo import UpdateOne
 
 from db.connection import userlogs as collection
 from utils.logging_utils import log_db
+from utils.metrics_utils import timed
 
-# Update User Voice Log In DB
-async def update_user_voice_log(
-    user_id: str,
+
+def _voice_log_fields(
     username: str = None,
     join_time: datetime = None,
     leave_time: datetime = None,
     channel: str = None,
-    log_id: str | None = None,
-):
+) -> dict:
     update_fields = {}
 
     if join_time:
-        update_fields["join_time"] = join_time.astimezone(timezone.utc).isoformat()
-        update_fields["last_active"] = join_time.astimezone(timezone.utc).isoformat()
+        update_fields["join_time"] = join_time.astimezone(timezone.utc)
+        update_fields["last_active"] = join_time.astimezone(timezone.utc)
 
     if leave_time:
-        update_fields["leave_time"] = leave_time.astimezone(timezone.utc).isoformat()
+        update_fields["leave_time"] = leave_time.astimezone(timezone.utc)
 
     if channel:
         update_fields["channel"] = channel
@@ -27,11 +30,36 @@ async def update_user_voice_log(
     if username:
         update_fields["username"] = username
 
+    return update_fields
+
+
+def build_voice_log_update(user_id: str, **fields) -> UpdateOne | None:
+    """
+    update_user_voice_log와 같은 내용의 UpdateOne을 생성 (bulk_write 용)
+    """
+    update_fields = _voice_log_fields(**fields)
+    if not update_fields:
+        return None
+    return UpdateOne({"user_id": user_id}, {"$set": update_fields}, upsert=True)
+
+
+# Update User Voice Log In DB
+@timed()
+async def update_user_voice_log(
+    user_id: str,
+    username: str = None,
+    join_time: datetime = None,
+    leave_time: datetime = None,
+    channel: str = None,
+    log_id: str | None = None,
+):
+    update_fields = _voice_log_fields(username, join_time, leave_time, channel)
+
     if not update_fields:
         log_db("DB", "update_user_voice_log: update_fields empty — skip write", log_id=log_id)
         return
 
-    log_db("DB Writing", f"update_user_voice_log: {update_fields}", log_id=log_id)
+    log_db("DB Writing", "update_user_voice_log: %s fields=%s", user_id, sorted(update_fields), log_id=log_id)
 
     try:
         result = await collection.update_one(
@@ -39,28 +67,39 @@ async def update_user_voice_log(
             {"$set": update_fields},
             upsert=True
         )
-        log_db("DB", f"MongoDB write result: {result.raw_result}", log_id=log_id)
+        log_db("DB", "MongoDB write result: matched=%s modified=%s upserted=%s",
+               result.matched_count, result.modified_count, result.upserted_id is not None, log_id=log_id)
     except Exception as e:
         log_db("Error", f"MongoDB write failed: {e}", log_id=log_id)
 
 # Get Last Active Time -> To User
+@timed()
 async def get_last_active_by_user_id(user_id: str, log_id: str | None = None) -> str | None:
     doc = await collection.find_one({"user_id": user_id})
-    log_db("DB", f"User doc: {doc}", log_id=log_id)
+    log_db("DB Reading", "User doc: %s found=%s", user_id, doc is not None, log_id=log_id)
     if doc and "last_active" in doc:
         return doc["last_active"]
     return None
 
 # Save Role in DB
-async def save_granted_role(user_id: str, username: str, role_name: str, log_id: str | None = None):
-    doc = {
+def _granted_role_doc(user_id: str, username: str, role_name: str) -> dict:
+    return {
         "user_id": user_id,
         "username": username,
         "granted_role": role_name,
-        "granted_time": datetime.now(timezone.utc).isoformat(),
+        "granted_time": datetime.now(timezone.utc),
     }
 
-    log_db("DB Writing", f"Saving granted role: {doc}", log_id=log_id)
+
+def build_granted_role_update(user_id: str, username: str, role_name: str) -> UpdateOne:
+    return UpdateOne({"user_id": user_id}, {"$set": _granted_role_doc(user_id, username, role_name)}, upsert=True)
+
+
+@timed()
+async def save_granted_role(user_id: str, username: str, role_name: str, log_id: str | None = None):
+    doc = _granted_role_doc(user_id, username, role_name)
+
+    log_db("DB Writing", "Saving granted role: %s %s", user_id, role_name, log_id=log_id)
     
     try:
         await collection.update_one(
@@ -71,11 +110,29 @@ async def save_granted_role(user_id: str, username: str, role_name: str, log_id:
     except Exception as e:
         log_db("Error", f"MongoDB save failed: {e}", log_id=log_id)
 
+@timed()
+async def save_granted_roles(grants: list[tuple[str, str, str]], log_id: str | None = None) -> int:
+    """
+    (user_id, username, role_name) 목록을 한 번의 bulk_write로 저장, 반영된 건수 반환
+    """
+    if not grants:
+        return 0
+    ops = [build_granted_role_update(user_id, username, role_name) for user_id, username, role_name in grants]
+    log_db("DB Writing", f"Saving granted roles: {len(ops)} members", log_id=log_id)
+    try:
+        result = await collection.bulk_write(ops, ordered=False)
+        log_db("DB", f"Granted roles saved (upserted {result.upserted_count}, modified {result.modified_count})", log_id=log_id)
+        return len(ops)
+    except Exception as e:
+        log_db("Error", f"MongoDB bulk save failed: {e}", log_id=log_id)
+        return 0
+
 # Save User's Server Enter Time in DB
+@timed()
 async def save_join_time(user_id: str, username: str, log_id: str | None = None):
-    doc = { "user_id": user_id, "username": username , "joined_at_server": datetime.now(timezone.utc).isoformat(), }
+    doc = { "user_id": user_id, "username": username , "joined_at_server": datetime.now(timezone.utc), }
     
-    log_db("DB Writing", f"Saving join time: {doc}", log_id=log_id)
+    log_db("DB Writing", "Saving join time: %s", user_id, log_id=log_id)
 
     try:
         await collection.update_one(
@@ -87,24 +144,32 @@ async def save_join_time(user_id: str, username: str, log_id: str | None = None)
         log_db("Error", f"MongoDB save failed (join time): {e}", log_id=log_id)
 
 # User Voice Duration Time
+@timed()
 async def get_total_voice_duration(user_id: str, log_id: str | None = None) -> int:
     """
     MongoDB에서 해당 유저의 전체 접속 시간 누적을 초 단위로 반환
     """
     doc = await collection.find_one({"user_id": user_id})
-    log_db("DB", f"Voice duration doc: {doc}", log_id=log_id)
+    log_db("DB Reading", "Voice duration doc: %s found=%s", user_id, doc is not None, log_id=log_id)
     if doc and "durations" in doc:
         return int(doc["durations"].get("total_seconds", 0))
     return 0
 
+def _voice_duration_update(username: str, duration_seconds: int) -> dict:
+    return {
+        "$set": {"username": username},
+        "$inc": {"durations.total_seconds": duration_seconds}
+    }
+
+def build_voice_duration_update(user_id: str, username: str, duration_seconds: int) -> UpdateOne:
+    return UpdateOne({"user_id": user_id}, _voice_duration_update(username, duration_seconds), upsert=True)
+
+@timed()
 async def add_voice_duration(user_id: str, username: str, duration_seconds: int, log_id: str | None = None):
     try:
         await collection.update_one(
             {"user_id": user_id},
-            {
-                "$set": {"username": username},
-                "$inc": {"durations.total_seconds": duration_seconds}
-            },
+            _voice_duration_update(username, duration_seconds),
             upsert=True
         )
         log_db("DB", f"Voice duration updated: {username} +{duration_seconds}s", log_id=log_id)
@@ -112,29 +177,101 @@ async def add_voice_duration(user_id: str, username: str, duration_seconds: int,
         log_db("Error", f"Voice duration update failed: {e}", log_id=log_id)
 
 # Server Synchronization to DB
+MEMBER_SYNC_FIELDS = ("username", "server_nickname", "joined_at_server", "granted_role")
+
+def member_fingerprint(data: dict) -> str:
+    """
+    동기화 대상 필드의 해시 (변경 여부 비교용)
+    """
+    payload = json.dumps([data.get(field) for field in MEMBER_SYNC_FIELDS], default=str, ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+def member_sync_fields(data: dict, fingerprint: str | None = None) -> dict:
+    """
+    동기화 대상 필드 전체 + fingerprint
+    - fingerprint는 모든 필드를 덮으므로 항상 전체 필드와 함께 기록 (일부만 쓰면 누락/오래된 필드가 "변경 없음"으로 남음)
+    """
+    fields = {field: data[field] for field in MEMBER_SYNC_FIELDS}
+    fields["sync_fingerprint"] = fingerprint or member_fingerprint(data)
+    return fields
+
+def build_member_info_update(data: dict, fingerprint: str | None = None) -> UpdateOne:
+    return UpdateOne({"user_id": data["user_id"]}, {"$set": member_sync_fields(data, fingerprint)}, upsert=True)
+
+@timed()
 async def upsert_member_info(data: dict, log_id: str | None = None):
     """
     유저 정보를 user_id 기준으로 최신화하거나 새로 삽입
     """
+    await bulk_upsert_member_info([build_member_info_update(data)], log_id=log_id)
+
+@timed()
+async def bulk_upsert_member_info(ops: list[UpdateOne], log_id: str | None = None) -> int:
+    """
+    build_member_info_update로 만든 UpdateOne들을 한 번의 bulk_write로 전송, 반영된 건수 반환
+    """
+    if not ops:
+        return 0
     try:
-        await collection.update_one(
-            {"user_id": data["user_id"]},
-            {"$set": {
-                "username": data["username"],
-                "server_nickname": data["server_nickname"],
-                "joined_at_server": data["joined_at_server"],
-                "granted_role": data["granted_role"],
-            }},
-            upsert=True
-        )
-        log_db("DB", f"User info synced: {data['username'], data['server_nickname']}", log_id=log_id)
+        result = await collection.bulk_write(ops, ordered=False)
+        log_db("DB", f"User info synced: {len(ops)} members (upserted {result.upserted_count}, modified {result.modified_count})", log_id=log_id)
+        return len(ops)
     except Exception as e:
         log_db("Error", f"User info sync failed: {e}", log_id=log_id)
+        return 0
+
+@timed()
+async def get_sync_fingerprints(log_id: str | None = None) -> dict[str, str | None] | None:
+    """
+    DB에 있는 모든 유저의 {user_id: sync_fingerprint} (한 번의 쿼리, 필요한 필드만 조회)
+    - 조회 실패 시 None (빈 dict로 처리하면 전원을 다시 기록하게 되므로 구분)
+    """
+    fingerprints = {}
+    try:
+        async for doc in collection.find({}, {"_id": 0, "user_id": 1, "sync_fingerprint": 1}):
+            if doc.get("user_id"):
+                fingerprints[doc["user_id"]] = doc.get("sync_fingerprint")
+    except Exception as e:
+        log_db("Error", f"sync fingerprints load failed: {e}", log_id=log_id)
+        return None
+    log_db("DB Reading", f"sync fingerprints loaded: {len(fingerprints)}", log_id=log_id)
+    return fingerprints
+
+# Attendance Alert: N일째 미접속 유저 조회
+def _day_windows(now: datetime, days: int) -> list[dict]:
+    # (now - t).days == days  <=>  now-(days+1)일 < t <= now-days일
+    # 마이그레이션 전의 ISO 문자열과 BSON date 모두 조회 (비교 연산은 같은 타입끼리만 매칭됨)
+    upper = (now - timedelta(days=days)).astimezone(timezone.utc)
+    lower = (now - timedelta(days=days + 1)).astimezone(timezone.utc)
+    return [
+        {"$gt": lower, "$lte": upper},
+        {"$gt": lower.isoformat(), "$lte": upper.isoformat()},
+    ]
+
+@timed()
+async def find_inactive_users(now: datetime, days_list: tuple[int, ...] = (14, 30), log_id: str | None = None) -> list[dict]:
+    """
+    마지막 접속(없으면 서버 입장) 후 정확히 days_list 일째인 유저를 인덱스 범위 쿼리로 조회
+    """
+    conditions = []
+    for days in days_list:
+        for window in _day_windows(now, days):
+            conditions.append({"last_active": window})
+            conditions.append({"last_active": {"$in": [None, ""]}, "joined_at_server": window})
+    projection = {"_id": 0, "user_id": 1, "username": 1, "last_active": 1, "joined_at_server": 1}
+    try:
+        users = [doc async for doc in collection.find({"$or": conditions}, projection)]
+        log_db("DB Reading", f"find_inactive_users {days_list}: {len(users)} users", log_id=log_id)
+        return users
+    except Exception as e:
+        log_db("Error", f"find_inactive_users failed: {e}", log_id=log_id)
+        return []
 
 # Get User Information From DB
+@timed()
 async def get_user_profile(user_id: str, log_id: str | None = None):
     doc = await collection.find_one({"user_id": user_id})
-    log_db("DB", f"User profile doc: {doc}", log_id=log_id)
+    log_db("DB Reading", "User profile doc: %s found=%s", user_id, doc is not None, log_id=log_id)
     return doc
 
 # MongoDB 접속 테스트 함수
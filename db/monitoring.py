@@ -0,0 +1,163 @@
+import os
+import threading
+
+from pymongo import monitoring
+
+from utils.logging_utils import log_db
+from utils.metrics_utils import registry
+
+# 실행 시간을 기록할 컬렉션 / 느린 쿼리 기준(ms)
+MONITORED_COLLECTIONS = frozenset({"userlogs", "quitlogs", "voice_sessions"})
+MONGODB_SLOW_QUERY_MS = float(os.getenv("MONGODB_SLOW_QUERY_MS", "100"))
+
+# 명령 이름 → 명령 문서에서 필터가 들어 있는 위치
+_FILTER_FIELDS = {
+    "find": "filter",
+    "count": "query",
+    "distinct": "query",
+    "findAndModify": "query",
+    "aggregate": "pipeline",
+}
+_STATEMENT_FIELDS = {
+    "update": ("updates", "q"),
+    "delete": ("deletes", "q"),
+}
+_MAX_SHAPE_DEPTH = 6
+
+
+def query_shape(value, depth: int = 0):
+    """
+    필터의 값은 "?"로 바꾸고 키 구조만 남김 (값 없이 어떤 인덱스를 타야 하는지 확인용)
+    {"user_id": "123", "kst_date": {"$gte": "2026-01-01"}} → {"user_id": "?", "kst_date": {"$gte": "?"}}
+    """
+    if depth >= _MAX_SHAPE_DEPTH:
+        return "…"
+    if isinstance(value, dict):
+        return {key: query_shape(item, depth + 1) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        # 파이프라인 / $and / $or 같은 문서 배열은 구조 유지, 값 배열($in 등)은 "?" 하나로
+        if value and all(isinstance(item, dict) for item in value):
+            return [query_shape(item, depth + 1) for item in value]
+        return "?"
+    return "?"
+
+
+def command_shape(command_name: str, command: dict):
+    field = _FILTER_FIELDS.get(command_name)
+    if field is not None:
+        return query_shape(command.get(field, {}))
+    statements = _STATEMENT_FIELDS.get(command_name)
+    if statements is not None:
+        docs = command.get(statements[0]) or []
+        # 여러 문장을 한 번에 보낸 bulk 명령은 첫 문장의 필터와 문장 수만 기록
+        shape = query_shape(docs[0].get(statements[1], {})) if docs else {}
+        return {"n": len(docs), "q": shape} if len(docs) > 1 else shape
+    return None
+
+
+class CommandMonitor(monitoring.CommandListener):
+    """
+    감시 대상 컬렉션에 대한 명령 실행 시간을 "mongo.<컬렉션>.<명령>"으로 기록하고
+    MONGODB_SLOW_QUERY_MS 이상 걸린 명령은 필터 형태와 함께 로그로 남김
+    - 드라이버의 작업 스레드에서 호출되므로 집계는 lock 안에서 처리
+    """
+
+    def __init__(self, slow_ms: float):
+        self.slow_ms = slow_ms
+        self._inflight: dict[tuple, tuple[str, str, dict]] = {}
+        self._lock = threading.Lock()
+        self.slow_queries = 0
+
+    def started(self, event: monitoring.CommandStartedEvent):
+        collection = event.command.get(event.command_name)
+        if not isinstance(collection, str) or collection not in MONITORED_COLLECTIONS:
+            return
+        self._inflight[(event.connection_id, event.request_id)] = (collection, event.command_name, event.command)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent):
+        self._finish(event, error=False)
+
+    def failed(self, event: monitoring.CommandFailedEvent):
+        self._finish(event, error=True)
+
+    def _finish(self, event, error: bool):
+        inflight = self._inflight.pop((event.connection_id, event.request_id), None)
+        if inflight is None:
+            return
+        collection, command_name, command = inflight
+        elapsed_ms = event.duration_micros / 1000
+        with self._lock:
+            registry.observe(f"mongo.{collection}.{command_name}", elapsed_ms / 1000, error)
+            slow = elapsed_ms >= self.slow_ms
+            if slow:
+                self.slow_queries += 1
+        if slow:
+            log_db(
+                "Slow Query", "%s.%s took %.1fms filter=%s",
+                collection, command_name, elapsed_ms, command_shape(command_name, command),
+            )
+
+
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    """
+    커넥션 풀 상태 (열린 커넥션 / 사용 중인 커넥션 / checkout 대기 시간)
+    - checkout 대기 시간은 "mongo.pool.checkout_wait"으로 기록
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {"open": 0, "checked_out": 0, "checkout_failed": 0, "cleared": 0}
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        wait = registry.get("mongo.pool.checkout_wait")
+        stats["wait_p99_ms"] = wait.quantile(0.99) * 1000
+        stats["wait_max_ms"] = wait.max * 1000
+        return stats
+
+    def _count(self, name: str, amount: int = 1):
+        with self._lock:
+            self._stats[name] += amount
+
+    def connection_created(self, event):
+        self._count("open")
+
+    def connection_closed(self, event):
+        self._count("open", -1)
+
+    def connection_checked_out(self, event):
+        with self._lock:
+            self._stats["checked_out"] += 1
+            registry.observe("mongo.pool.checkout_wait", event.duration or 0.0)
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self._stats["checkout_failed"] += 1
+            registry.observe("mongo.pool.checkout_wait", event.duration or 0.0, True)
+        log_db("Error", f"Mongo connection checkout failed ({event.reason}) after {(event.duration or 0) * 1000:.0f}ms")
+
+    def connection_checked_in(self, event):
+        self._count("checked_out", -1)
+
+    def pool_cleared(self, event):
+        self._count("cleared")
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_check_out_started(self, event):
+        pass
+
+
+command_monitor = CommandMonitor(slow_ms=MONGODB_SLOW_QUERY_MS)
+pool_monitor = PoolMonitor()
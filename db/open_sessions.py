@@ -0,0 +1,132 @@
+from datetime import datetime, timezone
+
+from pymongo import DeleteOne, UpdateOne
+
+from db.connection import voice_open_sessions
+from db.write_behind import voice_writes
+from utils.logging_utils import log_db
+from utils.metrics_utils import timed
+
+# 음성 채널에 접속 중인 세션을 DB에 보관하여 재시작 후에도 복구할 수 있게 함
+# 쓰기는 write-behind 큐를 통해 처리되므로 join 경로에 DB 대기 시간이 추가되지 않음
+
+
+class OpenSessionRegistry:
+    """
+    프로세스 내 공유 열린 세션 목록 (user_id -> 입장 시각, username)
+    - VoiceTracker가 갱신하고, 다른 Cog는 유저당 O(1)로 조회
+    """
+
+    def __init__(self):
+        self._sessions: dict[str, tuple[datetime, str]] = {}
+
+    def __contains__(self, user_id: str) -> bool:
+        return user_id in self._sessions
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def start(self, user_id: str, username: str, join_time: datetime):
+        self._sessions[user_id] = (join_time, username)
+
+    def end(self, user_id: str) -> datetime | None:
+        session = self._sessions.pop(user_id, None)
+        return session[0] if session else None
+
+    def join_time(self, user_id: str) -> datetime | None:
+        session = self._sessions.get(user_id)
+        return session[0] if session else None
+
+    def username(self, user_id: str) -> str | None:
+        session = self._sessions.get(user_id)
+        return session[1] if session else None
+
+    def snapshot(self) -> dict[str, tuple[datetime, str]]:
+        return dict(self._sessions)
+
+    def live_seconds(self, now: datetime) -> dict[str, tuple[str, int]]:
+        """
+        진행 중인 세션의 현재까지 누적 시간 -> {user_id: (username, seconds)}
+        """
+        return {
+            user_id: (username, max(0, int((now - join_time).total_seconds())))
+            for user_id, (join_time, username) in self._sessions.items()
+        }
+
+
+open_sessions = OpenSessionRegistry()
+
+
+def _as_datetime(value) -> datetime | None:
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    if isinstance(value, str) and value:
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    return None
+
+
+async def queue_open_session(
+    user_id: str,
+    username: str,
+    join_time: datetime,
+    channel: str | None = None,
+    log_id: str | None = None,
+):
+    join_utc = join_time.astimezone(timezone.utc)
+    op = UpdateOne(
+        {"user_id": user_id},
+        {"$set": {
+            "user_id": user_id,
+            "username": username,
+            "join_time": join_utc,
+            "channel": channel,
+            "last_seen": join_utc,
+        }},
+        upsert=True,
+    )
+    await voice_writes.put(voice_open_sessions, op, log_id=log_id)
+
+
+async def queue_close_session(user_id: str, log_id: str | None = None):
+    await voice_writes.put(voice_open_sessions, DeleteOne({"user_id": user_id}), log_id=log_id)
+
+
+@timed()
+async def load_open_sessions(log_id: str | None = None) -> dict[str, dict]:
+    """
+    저장된 모든 열린 세션을 한 번의 쿼리로 로드 -> {user_id: {"username", "join_time", "last_seen"}}
+    """
+    sessions = {}
+    try:
+        async for doc in voice_open_sessions.find({}, {"_id": 0}):
+            join_time = _as_datetime(doc.get("join_time"))
+            if not doc.get("user_id") or not join_time:
+                continue
+            sessions[doc["user_id"]] = {
+                "username": doc.get("username"),
+                "join_time": join_time,
+                "last_seen": _as_datetime(doc.get("last_seen")),
+            }
+        log_db("DB Reading", f"load_open_sessions: {len(sessions)} sessions", log_id=log_id)
+    except Exception as e:
+        log_db("Error", f"load_open_sessions failed: {e}", log_id=log_id)
+    return sessions
+
+
+@timed()
+async def touch_open_sessions(now: datetime, log_id: str | None = None):
+    """
+    열린 세션 전체의 last_seen 갱신 (heartbeat)
+    - 봇이 비정상 종료되면 마지막 heartbeat 시각을 세션 종료 시각으로 사용
+    """
+    try:
+        result = await voice_open_sessions.update_many(
+            {},
+            {"$set": {"last_seen": now.astimezone(timezone.utc)}},
+        )
+        log_db("DB", f"touch_open_sessions: {result.modified_count} sessions", log_id=log_id)
+    except Exception as e:
+        log_db("Error", f"touch_open_sessions failed: {e}", log_id=log_id)
@@ -1,34 +1,219 @@
+import asyncio
+import os
+import uuid
 from datetime import datetime, timezone
 
-from db.connection import userlogs, quitlogs
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError
+
+from db.connection import client, userlogs, quitlogs
 from utils.logging_utils import log_db
-        
-async def move_user_to_quitlogs(user_id: str, log_id: str | None = None):
-    # 1) userlogs에서 유저 정보 꺼내오기
-    user_doc = await userlogs.find_one({"user_id": user_id})
+from utils.metrics_utils import timed
+
+QUIT_BATCH_SECONDS = float(os.getenv("QUIT_BATCH_SECONDS", "2.0"))
+QUIT_BATCH_SIZE = int(os.getenv("QUIT_BATCH_SIZE", "200"))
+
+# quitlogs로 옮기지 않는 필드 (quit_move_id는 이동 중 표시용)
+_EXCLUDED_FIELDS = ("_id", "user_id", "times", "quit_move_id")
+
+_transactions_supported: bool | None = None
+
+
+def _quit_update(user_id: str, user_doc: dict, quit_time: datetime, move_id: str | None = None) -> tuple[dict, dict]:
+    # quitlogs upsert의 (filter, update): 필드는 $set으로, 횟수 증가는 $inc로
+    fields = {key: value for key, value in user_doc.items() if key not in _EXCLUDED_FIELDS}
+    query = {"user_id": user_id}
+    if move_id is not None:
+        fields["last_move_id"] = move_id
+        # 같은 이동이 이미 반영된 문서는 매칭되지 않음 → upsert가 중복 키로 실패
+        query["last_move_id"] = {"$ne": move_id}
+    return query, {"$set": {**fields, "quit_time": quit_time}, "$inc": {"times": 1}}
+
+
+async def supports_transactions() -> bool:
+    """
+    replica set / sharded cluster에서만 트랜잭션 사용 가능 (단일 서버는 불가)
+    """
+    global _transactions_supported
+    if _transactions_supported is None:
+        try:
+            hello = await client.admin.command("hello")
+            _transactions_supported = "setName" in hello or hello.get("msg") == "isdbgrid"
+        except Exception:
+            _transactions_supported = False
+    return _transactions_supported
+
+
+async def _move_in_transaction(user_ids: list[str], log_id: str | None = None) -> int:
+    quit_time = datetime.now(timezone.utc)
+    moved = 0
+
+    async def callback(session):
+        nonlocal moved
+        docs = [doc async for doc in userlogs.find({"user_id": {"$in": user_ids}}, session=session)]
+        if not docs:
+            moved = 0
+            return
+        # 트랜잭션 없는 경로(_move_one)가 quitlogs까지만 반영하고 중단된 문서는 다시 세지 않음
+        move_ids = {doc["user_id"]: doc.get("quit_move_id") or uuid.uuid4().hex for doc in docs}
+        marked = [doc["user_id"] for doc in docs if doc.get("quit_move_id")]
+        applied = set()
+        if marked:
+            async for quit_doc in quitlogs.find(
+                {"user_id": {"$in": marked}}, {"user_id": 1, "last_move_id": 1}, session=session,
+            ):
+                if quit_doc.get("last_move_id") == move_ids[quit_doc["user_id"]]:
+                    applied.add(quit_doc["user_id"])
+        ops = [
+            UpdateOne(*_quit_update(doc["user_id"], doc, quit_time, move_ids[doc["user_id"]]), upsert=True)
+            for doc in docs if doc["user_id"] not in applied
+        ]
+        if ops:
+            await quitlogs.bulk_write(ops, ordered=False, session=session)
+        result = await userlogs.delete_many({"user_id": {"$in": [doc["user_id"] for doc in docs]}}, session=session)
+        moved = result.deleted_count
+
+    async with await client.start_session() as session:
+        await session.with_transaction(callback)
+
+    missing = len(user_ids) - moved
+    if missing:
+        log_db("DB", f"quitlogs move: {missing} users not found in userlogs", log_id=log_id)
+    return moved
+
+
+async def _move_one(user_id: str, log_id: str | None = None) -> bool:
+    """
+    트랜잭션 없이 한 명을 옮기는 경로 — 어느 단계에서 중단돼도 다시 실행하면 한 번만 반영됨
+    1) userlogs 문서에 이동 ID 표시 (이전 시도에서 표시된 ID가 있으면 재사용)
+    2) quitlogs에 같은 이동 ID가 없을 때만 upsert (unique 인덱스가 없어도 중복 반영되지 않음)
+    3) 해당 이동 ID가 표시된 userlogs 문서 삭제
+    """
+    user_doc = await userlogs.find_one_and_update(
+        {"user_id": user_id, "quit_move_id": {"$exists": False}},
+        {"$set": {"quit_move_id": uuid.uuid4().hex}},
+        return_document=ReturnDocument.AFTER,
+    )
+    if user_doc is None:
+        user_doc = await userlogs.find_one({"user_id": user_id})
     if not user_doc:
         log_db("Error", f"User not found in userlogs: {user_id}", log_id=log_id)
-        return
-
-    # 2) 불필요한 필드 삭제 (_id, user_id, 그리고 혹시 남아있을 times)
-    user_doc.pop("_id", None)
-    user_doc.pop("user_id", None)
-    user_doc.pop("times", None)
-
-    # 3) 퇴장 시각만 별도로 계산
-    quit_time = datetime.now(timezone.utc).isoformat()
-
-    # 4) quitlogs에 upsert: 필드는 $set으로, 횟수 증가는 $inc로
-    await quitlogs.update_one(
-        {"user_id": user_id},
-        {
-            "$set": {**user_doc, "quit_time": quit_time},
-            "$inc": {"times": 1}
-        },
-        upsert=True
-    )
+        return False
+
+    move_id = user_doc["quit_move_id"]
+    # 이미 반영된 이동인지 먼저 확인 (quitlogs user_id unique 인덱스가 없으면 upsert가 중복 문서를 만들 수 있음)
+    applied = await quitlogs.find_one({"user_id": user_id, "last_move_id": move_id}, {"_id": 1})
+    if applied is None:
+        try:
+            await quitlogs.update_one(*_quit_update(user_id, user_doc, datetime.now(timezone.utc), move_id), upsert=True)
+        except DuplicateKeyError:
+            pass  # 확인 직후 다른 시도에서 반영됨
+
+    await userlogs.delete_one({"user_id": user_id, "quit_move_id": move_id})
+    return True
+
+
+@timed()
+async def move_users_to_quitlogs(user_ids: list[str], log_id: str | None = None) -> int:
+    """
+    userlogs → quitlogs 이동 (quit_time 기록, times +1), 옮긴 인원 수 반환
+    - 트랜잭션을 지원하면 전체를 한 트랜잭션 안에서 bulk 처리
+    - 아니면 한 명씩 멱등 경로로 처리
+    """
+    user_ids = list(dict.fromkeys(user_ids))
+    if not user_ids:
+        return 0
+
+    if await supports_transactions():
+        try:
+            moved = await _move_in_transaction(user_ids, log_id=log_id)
+            log_db("DB", f"Moved {moved} users to quitlogs in a transaction", log_id=log_id)
+            return moved
+        except Exception as e:
+            log_db("Error", f"quitlogs transaction failed, falling back to per-user moves: {e}", log_id=log_id)
+
+    moved = 0
+    for user_id in user_ids:
+        try:
+            if await _move_one(user_id, log_id=log_id):
+                moved += 1
+        except Exception as e:
+            log_db("Error", f"quitlogs move failed: {user_id}: {e}", log_id=log_id)
+    log_db("DB", f"Moved {moved} users to quitlogs with quit_time recorded (times +1)", log_id=log_id)
+    return moved
+
+
+async def move_user_to_quitlogs(user_id: str, log_id: str | None = None):
+    await move_users_to_quitlogs([user_id], log_id=log_id)
+
+
+class QuitBuffer:
+    """
+    퇴장 이벤트를 window 초 동안 모아 move_users_to_quitlogs 한 번으로 처리
+    - batch_size 명이 모이면 바로 처리
+    - start() 이전 / close() 이후의 put()은 바로 처리
+    """
+
+    def __init__(self, window: float, batch_size: int):
+        self.window = window
+        self.batch_size = batch_size
+        self._pending: dict[str, str | None] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._running = False
+        self._flushing: set[asyncio.Task] = set()
+
+    def __contains__(self, user_id: str) -> bool:
+        return user_id in self._pending
+
+    def start(self):
+        self._running = True
+
+    async def close(self):
+        self._running = False
+        await self.flush()
+        if self._flushing:
+            await asyncio.gather(*self._flushing, return_exceptions=True)
+
+    async def wait_for(self, user_id: str):
+        """
+        user_id의 퇴장 처리가 DB에 반영될 때까지 대기 (재입장 처리 전에 호출)
+        - 버퍼에 남아있으면 바로 처리하고, 이미 진행 중인 처리도 끝날 때까지 대기
+        """
+        if user_id in self._pending:
+            await self.flush()
+        if self._flushing:
+            await asyncio.gather(*self._flushing, return_exceptions=True)
+
+    async def put(self, user_id: str, log_id: str | None = None):
+        if not self._running:
+            await move_users_to_quitlogs([user_id], log_id=log_id)
+            return
+        self._pending[user_id] = log_id
+        if len(self._pending) >= self.batch_size:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.window, self._flush_later)
+
+    def _flush_later(self):
+        self._timer = None
+        task = asyncio.get_running_loop().create_task(self.flush())
+        self._flushing.add(task)
+        task.add_done_callback(self._flushing.discard)
+
+    async def flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        # 배치의 첫 이벤트 log_id로 묶어서 기록
+        log_id = next(iter(pending.values()))
+        # 진행 중인 이동은 wait_for()에서 기다릴 수 있도록 task로 실행
+        task = asyncio.ensure_future(move_users_to_quitlogs(list(pending), log_id=log_id))
+        self._flushing.add(task)
+        task.add_done_callback(self._flushing.discard)
+        await task
 
-    # 5) userlogs에서 원본 문서 삭제
-    await userlogs.delete_one({"user_id": user_id})
 
-    log_db("DB", f"Moved user to quitlogs with quit_time recorded (times +1): {user_id}", log_id=log_id)
+quit_buffer = QuitBuffer(window=QUIT_BATCH_SECONDS, batch_size=QUIT_BATCH_SIZE)
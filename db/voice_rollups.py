@@ -0,0 +1,179 @@
+from pymongo import UpdateOne
+
+from db.connection import (
+    voice_daily_totals,
+    voice_monthly_totals,
+    voice_sessions,
+    voice_weekly_totals,
+)
+from utils.logging_utils import log_db
+from utils.metrics_utils import timed
+
+# 음성 리더보드 사전 집계
+# - voice_daily_totals:   (user_id, kst_date)
+# - voice_weekly_totals:  (user_id, kst_year, kst_month, kst_week_of_month)
+# - voice_monthly_totals: (user_id, kst_year, kst_month)
+# 세션 기록 시 $inc로 갱신되므로 리더보드 조회 비용은 세션 수가 아닌 멤버 수에 비례
+
+
+def build_rollup_updates(session: dict) -> list[tuple]:
+    """
+    voice_sessions 문서 한 건에 대한 (컬렉션, UpdateOne) 목록
+    """
+    user_id = session["user_id"]
+    year = session["kst_year"]
+    month = session["kst_month"]
+    week = session["kst_week_of_month"]
+    inc = {"$inc": {"total_seconds": int(session["duration_seconds"])}}
+    username = {"username": session["username"]}
+    return [
+        (voice_daily_totals, UpdateOne(
+            {"user_id": user_id, "kst_date": session["kst_date"]},
+            {**inc, "$set": {**username, "kst_year": year, "kst_month": month, "kst_week_of_month": week}},
+            upsert=True,
+        )),
+        (voice_weekly_totals, UpdateOne(
+            {"user_id": user_id, "kst_year": year, "kst_month": month, "kst_week_of_month": week},
+            {**inc, "$set": username},
+            upsert=True,
+        )),
+        (voice_monthly_totals, UpdateOne(
+            {"user_id": user_id, "kst_year": year, "kst_month": month},
+            {**inc, "$set": username},
+            upsert=True,
+        )),
+    ]
+
+
+def _as_row(doc: dict) -> dict:
+    # 기존 voice_sessions 집계 결과와 같은 형태로 반환
+    return {"_id": doc["user_id"], "username": doc.get("username"), "total_seconds": doc.get("total_seconds", 0)}
+
+
+def _for_users(query: dict, user_ids: list[str] | None) -> dict:
+    # user_ids가 주어지면 해당 유저들의 합계만 조회 (진행 중 세션 합산용)
+    if user_ids is None:
+        return query
+    return {"user_id": {"$in": list(user_ids)}, **query}
+
+
+@timed()
+async def aggregate_range(
+    start_kst_date: str,
+    end_kst_date: str,
+    limit: int = 10,
+    user_ids: list[str] | None = None,
+    log_id: str | None = None,
+):
+    pipeline = [
+        {"$match": _for_users({"kst_date": {"$gte": start_kst_date, "$lte": end_kst_date}}, user_ids)},
+        {"$group": {"_id": "$user_id", "username": {"$last": "$username"}, "total_seconds": {"$sum": "$total_seconds"}}},
+        {"$sort": {"total_seconds": -1}},
+        {"$limit": limit},
+    ]
+    try:
+        results = [doc async for doc in voice_daily_totals.aggregate(pipeline)]
+        log_db("DB Reading", f"rollup aggregate_range {start_kst_date}~{end_kst_date}: {len(results)} rows", log_id=log_id)
+        return results
+    except Exception as e:
+        log_db("Error", f"rollup aggregate_range failed: {e}", log_id=log_id)
+        return []
+
+
+@timed()
+async def aggregate_month_week(
+    year: int,
+    month: int,
+    week: int,
+    limit: int = 10,
+    user_ids: list[str] | None = None,
+    log_id: str | None = None,
+):
+    query = _for_users({"kst_year": year, "kst_month": month, "kst_week_of_month": week}, user_ids)
+    try:
+        cursor = voice_weekly_totals.find(query).sort("total_seconds", -1).limit(limit)
+        results = [_as_row(doc) async for doc in cursor]
+        log_db("DB Reading", f"rollup aggregate_month_week {year}-{month} W{week}: {len(results)} rows", log_id=log_id)
+        return results
+    except Exception as e:
+        log_db("Error", f"rollup aggregate_month_week failed: {e}", log_id=log_id)
+        return []
+
+
+@timed()
+async def aggregate_month(
+    year: int,
+    month: int,
+    limit: int = 10,
+    user_ids: list[str] | None = None,
+    log_id: str | None = None,
+):
+    query = _for_users({"kst_year": year, "kst_month": month}, user_ids)
+    try:
+        cursor = voice_monthly_totals.find(query).sort("total_seconds", -1).limit(limit)
+        results = [_as_row(doc) async for doc in cursor]
+        log_db("DB Reading", f"rollup aggregate_month {year}-{month}: {len(results)} rows", log_id=log_id)
+        return results
+    except Exception as e:
+        log_db("Error", f"rollup aggregate_month failed: {e}", log_id=log_id)
+        return []
+
+
+@timed()
+async def rebuild_rollups(log_id: str | None = None) -> dict:
+    """
+    voice_sessions 원본으로부터 집계 컬렉션 전체를 재생성 ($out으로 원자적 교체, 인덱스 유지)
+    - 재계산 도중 기록된 세션은 반영되지 않을 수 있으므로 한산한 시간에 실행
+    """
+    group_keys = [
+        (voice_daily_totals, ["user_id", "kst_date", "kst_year", "kst_month", "kst_week_of_month"]),
+        (voice_weekly_totals, ["user_id", "kst_year", "kst_month", "kst_week_of_month"]),
+        (voice_monthly_totals, ["user_id", "kst_year", "kst_month"]),
+    ]
+    counts = {}
+    for collection, keys in group_keys:
+        pipeline = [
+            {"$sort": {"end_time": 1}},
+            {"$group": {
+                "_id": {key: f"${key}" for key in keys},
+                "username": {"$last": "$username"},
+                "total_seconds": {"$sum": "$duration_seconds"},
+            }},
+            {"$project": {
+                "_id": 0,
+                **{key: f"$_id.{key}" for key in keys},
+                "username": 1,
+                "total_seconds": 1,
+            }},
+            {"$out": collection.name},
+        ]
+        try:
+            async for _ in voice_sessions.aggregate(pipeline, allowDiskUse=True):
+                pass
+            counts[collection.name] = await collection.count_documents({})
+        except Exception as e:
+            log_db("Error", f"rebuild {collection.name} failed: {e}", log_id=log_id)
+            counts[collection.name] = None
+    log_db("DB Writing", f"rebuild_rollups: {counts}", log_id=log_id)
+    return counts
+
+
+@timed()
+async def backfill_rollups_if_empty(log_id: str | None = None) -> dict | None:
+    """
+    집계 컬렉션 중 비어 있는 것이 있고 voice_sessions에 원본이 있으면 rebuild_rollups 실행
+    - 사전 집계 도입 전에 기록된 세션을 배포 후 첫 시작 때 반영 (이후 시작 시에는 확인 조회만 수행)
+    """
+    try:
+        if await voice_sessions.find_one({}, {"_id": 1}) is None:
+            return None
+        for collection in (voice_daily_totals, voice_weekly_totals, voice_monthly_totals):
+            if await collection.find_one({}, {"_id": 1}) is None:
+                break
+        else:
+            return None
+    except Exception as e:
+        log_db("Error", f"rollup backfill check failed: {e}", log_id=log_id)
+        return None
+    log_db("DB Writing", "rollup collections empty, rebuilding from voice_sessions", log_id=log_id)
+    return await rebuild_rollups(log_id=log_id)
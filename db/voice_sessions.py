@@ -1,36 +1,32 @@
+import asyncio
+import time
 from datetime import datetime, timezone
-from typing import Iterable
 
-from db.connection import voice_sessions
+from db.connection import voice_daily_totals, voice_monthly_totals, voice_sessions, voice_weekly_totals
 from utils.time_utils import to_kst
 from utils.logging_utils import log_db
+from utils.metrics_utils import timed
 
 
-async def add_voice_session(
+def build_voice_session(
     user_id: str,
     username: str,
     start_time: datetime,
     end_time: datetime,
     duration_seconds: int,
-    log_id: str | None = None,
-):
+) -> dict:
     end_kst = to_kst(end_time)
-    doc = {
+    return {
         "user_id": user_id,
         "username": username,
-        "start_time": start_time.astimezone(timezone.utc).isoformat(),
-        "end_time": end_time.astimezone(timezone.utc).isoformat(),
+        "start_time": start_time.astimezone(timezone.utc),
+        "end_time": end_time.astimezone(timezone.utc),
         "duration_seconds": int(duration_seconds),
         "kst_date": end_kst.strftime("%Y-%m-%d"),
         "kst_year": end_kst.year,
         "kst_month": end_kst.month,
         "kst_week_of_month": week_of_month(end_kst),
     }
-    try:
-        await voice_sessions.insert_one(doc)
-        log_db("DB Writing", f"voice_sessions insert: {doc}", log_id=log_id)
-    except Exception as e:
-        log_db("Error", f"voice_sessions insert failed: {e}", log_id=log_id)
 
 
 def week_of_month(dt_kst) -> int:
@@ -39,10 +35,13 @@ def week_of_month(dt_kst) -> int:
     return ((dt_kst.day + first_weekday - 1) // 7) + 1
 
 
+# voice_sessions 원본 집계 — 리더보드는 db/voice_rollups.py의 사전 집계를 사용하고,
+# 아래 함수들은 사전 집계와의 비교(benchmarks/bench_leaderboard.py)와 원본 데이터 확인용으로 유지
 def _range_query(start_kst_date: str, end_kst_date: str) -> dict:
     return {"kst_date": {"$gte": start_kst_date, "$lte": end_kst_date}}
 
 
+@timed()
 async def aggregate_range(start_kst_date: str, end_kst_date: str, limit: int = 10, log_id: str | None = None):
     pipeline = [
         {"$match": _range_query(start_kst_date, end_kst_date)},
@@ -60,6 +59,7 @@ async def aggregate_range(start_kst_date: str, end_kst_date: str, limit: int = 1
         return []
 
 
+@timed()
 async def aggregate_month_week(year: int, month: int, week: int, limit: int = 10, log_id: str | None = None):
     pipeline = [
         {"$match": {"kst_year": year, "kst_month": month, "kst_week_of_month": week}},
@@ -77,6 +77,7 @@ async def aggregate_month_week(year: int, month: int, week: int, limit: int = 10
         return []
 
 
+@timed()
 async def aggregate_month(year: int, month: int, limit: int = 10, log_id: str | None = None):
     pipeline = [
         {"$match": {"kst_year": year, "kst_month": month}},
@@ -94,7 +95,37 @@ async def aggregate_month(year: int, month: int, limit: int = 10, log_id: str |
         return []
 
 
-async def cleanup_old_months(current_kst_date: datetime, keep_months: int = 4, log_id: str | None = None):
+# 보존 기간 정리 통계 (스케줄 작업에서 갱신, /성능-통계와 /metrics에서 조회)
+retention_stats = {
+    "runs": 0,
+    "last_cutoff": None,
+    "last_deleted": {},
+    "total_deleted": 0,
+    "deleted_by_collection": {},
+    "last_ms": 0.0,
+}
+
+
+async def _delete_in_batches(collection, query: dict, batch_size: int, pause: float) -> int:
+    # 한 번에 batch_size 건씩 _id로 삭제하여 긴 잠금/긴 쓰기 작업을 피함
+    deleted = 0
+    while True:
+        ids = [doc["_id"] async for doc in collection.find(query, {"_id": 1}).limit(batch_size)]
+        if not ids:
+            return deleted
+        result = await collection.delete_many({"_id": {"$in": ids}})
+        deleted += result.deleted_count
+        await asyncio.sleep(pause)
+
+
+@timed()
+async def cleanup_old_months(
+    current_kst_date: datetime,
+    keep_months: int = 4,
+    batch_size: int = 1000,
+    pause: float = 0.1,
+    log_id: str | None = None,
+) -> dict:
     # keep current month + previous (keep_months-1) months
     year = current_kst_date.year
     month = current_kst_date.month
@@ -104,8 +135,32 @@ async def cleanup_old_months(current_kst_date: datetime, keep_months: int = 4, l
         cutoff_month += 12
         cutoff_year -= 1
     cutoff_str = f"{cutoff_year:04d}-{cutoff_month:02d}-01"
-    try:
-        result = await voice_sessions.delete_many({"kst_date": {"$lt": cutoff_str}})
-        log_db("DB", f"cleanup_old_months < {cutoff_str}: {result.deleted_count} deleted", log_id=log_id)
-    except Exception as e:
-        log_db("Error", f"cleanup_old_months failed: {e}", log_id=log_id)
+    before_cutoff_month = {"$or": [
+        {"kst_year": {"$lt": cutoff_year}},
+        {"kst_year": cutoff_year, "kst_month": {"$lt": cutoff_month}},
+    ]}
+    targets = [
+        (voice_sessions, {"kst_date": {"$lt": cutoff_str}}),
+        (voice_daily_totals, {"kst_date": {"$lt": cutoff_str}}),
+        (voice_weekly_totals, before_cutoff_month),
+        (voice_monthly_totals, before_cutoff_month),
+    ]
+
+    started = time.perf_counter()
+    deleted = {}
+    for collection, query in targets:
+        try:
+            deleted[collection.name] = await _delete_in_batches(collection, query, batch_size, pause)
+        except Exception as e:
+            log_db("Error", f"cleanup_old_months failed on {collection.name}: {e}", log_id=log_id)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    retention_stats["runs"] += 1
+    retention_stats["last_cutoff"] = cutoff_str
+    retention_stats["last_deleted"] = deleted
+    retention_stats["total_deleted"] += sum(deleted.values())
+    for name, count in deleted.items():
+        retention_stats["deleted_by_collection"][name] = retention_stats["deleted_by_collection"].get(name, 0) + count
+    retention_stats["last_ms"] = elapsed_ms
+    log_db("DB", f"cleanup_old_months < {cutoff_str}: {deleted} deleted in {elapsed_ms:.0f}ms", log_id=log_id)
+    return deleted
@@ -0,0 +1,370 @@
+import asyncio
+import os
+import time
+from datetime import datetime
+from typing import Any, Callable
+
+from pymongo import InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from db.connection import userlogs, voice_sessions
+from db.leaderboard_cache import invalidate_sessions
+from db.mongo import build_voice_duration_update, build_voice_log_update
+from db.voice_rollups import build_rollup_updates
+from db.voice_sessions import build_voice_session
+from utils.logging_utils import log_db
+from utils.metrics_utils import timed
+
+WRITE_BEHIND_MAX_QUEUE = int(os.getenv("WRITE_BEHIND_MAX_QUEUE", "5000"))
+WRITE_BEHIND_BATCH_SIZE = int(os.getenv("WRITE_BEHIND_BATCH_SIZE", "200"))
+WRITE_BEHIND_FLUSH_SECONDS = float(os.getenv("WRITE_BEHIND_FLUSH_SECONDS", "1.0"))
+WRITE_BEHIND_MAX_RETRIES = int(os.getenv("WRITE_BEHIND_MAX_RETRIES", "3"))
+MEMBER_UPDATE_FLUSH_SECONDS = float(os.getenv("MEMBER_UPDATE_FLUSH_SECONDS", "60"))
+
+_STOP = object()
+
+
+class _Write:
+    """
+    큐에 들어간 쓰기 한 건
+    - requires: 먼저 기록돼야 하는 쓰기 (세션 insert → 리더보드 집계 $inc)
+    - label: 버려졌을 때 로그에 남길 식별 정보 (재생/재계산 대상 확인용)
+    - state: pending / applied / dropped
+    """
+    __slots__ = ("collection", "op", "after_flush", "requires", "label", "attempts", "state")
+
+    def __init__(self, collection, op, after_flush: Callable[[], Any] | None, requires=None, label: str | None = None):
+        self.collection = collection
+        self.op = op
+        self.after_flush = after_flush
+        self.requires = requires
+        self.label = label
+        self.attempts = 0
+        self.state = "pending"
+
+
+class WriteBehindQueue:
+    """
+    DB 쓰기 작업을 큐에 모아두었다가 컬렉션별 bulk_write 한 번으로 전송
+    - batch_size 만큼 모이거나 flush_interval 초가 지나면 flush
+    - 큐가 가득 차면 put()이 빈 자리가 생길 때까지 대기 (backpressure)
+    - start() 이전 / close() 이후의 put()은 큐를 거치지 않고 바로 기록
+    - 일시적인 오류(연결 끊김, primary 변경 등)로 기록되지 않은 작업은 다음 flush에 다시 시도 (최대 max_retries회)
+    - after_flush 콜백은 해당 작업이 실제로 기록된 뒤에만 호출 (캐시 무효화 등)
+    - requires로 지정한 작업이 버려지면 뒤따르는 작업도 기록하지 않음 (세션 원본과 집계가 어긋나지 않도록)
+    """
+
+    def __init__(self, max_size: int, batch_size: int, flush_interval: float, max_retries: int = WRITE_BEHIND_MAX_RETRIES):
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        self._counters = {
+            "enqueued": 0,
+            "written": 0,
+            "retried": 0,
+            "failed": 0,
+            "flushes": 0,
+            "flush_ms_total": 0.0,
+            "flush_ms_last": 0.0,
+            "flush_ms_max": 0.0,
+        }
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def close(self):
+        """남은 작업을 모두 flush한 뒤 종료"""
+        if not self.running:
+            return
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+
+    async def put(
+        self,
+        collection,
+        op,
+        log_id: str | None = None,
+        after_flush: Callable[[], Any] | None = None,
+        requires: _Write | None = None,
+        label: str | None = None,
+    ) -> _Write | None:
+        """
+        반환값은 다른 작업의 requires로 넘길 수 있음
+        """
+        if op is None:
+            return None
+        self._counters["enqueued"] += 1
+        write = _Write(collection, op, after_flush, requires, label)
+        if not self.running:
+            await self._drain([write], log_id=log_id)
+            return write
+        await self._queue.put(write)
+        return write
+
+    def stats(self) -> dict:
+        flushes = self._counters["flushes"]
+        return {
+            **self._counters,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "queue_max": self.max_size,
+            "flush_ms_avg": self._counters["flush_ms_total"] / flushes if flushes else 0.0,
+        }
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        stop = False
+        retry: list[_Write] = []
+        while not stop:
+            # 재시도할 작업이 있으면 새 작업을 기다리지 않고 flush_interval 뒤에 다시 기록
+            batch, retry = retry, []
+            if batch:
+                await asyncio.sleep(self.flush_interval)
+            else:
+                item = await self._queue.get()
+                if item is _STOP:
+                    stop = True
+                else:
+                    batch.append(item)
+
+            deadline = loop.time() + self.flush_interval
+            while not stop and len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is _STOP:
+                    stop = True
+                else:
+                    batch.append(item)
+
+            if batch:
+                retry = await self._flush(batch)
+        await self._drain(retry)
+
+    async def _drain(self, batch: list[_Write], log_id: str | None = None):
+        # 큐를 거치지 않는 경로 / 종료 시: 재시도 횟수가 다할 때까지 바로 기록
+        while batch:
+            batch = await self._flush(batch, log_id=log_id)
+            if batch:
+                await asyncio.sleep(self.flush_interval)
+
+    @staticmethod
+    def _mark_applied(writes: list[_Write], applied: list[_Write]):
+        for write in writes:
+            write.state = "applied"
+        applied.extend(writes)
+
+    def _drop(self, write: _Write, reason: str, log_id: str | None):
+        write.state = "dropped"
+        self._counters["failed"] += 1
+        if write.label:
+            log_db("Error", f"write-behind dropped {write.collection.name} op ({reason}): {write.label}", log_id=log_id)
+
+    def _give_up_or_retry(self, writes: list[_Write], retry: list[_Write], name: str, error, log_id: str | None):
+        for write in writes:
+            write.attempts += 1
+        exhausted = [write for write in writes if write.attempts >= self.max_retries]
+        retried = len(writes) - len(exhausted)
+        self._counters["retried"] += retried
+        log_db(
+            "Error", f"write-behind bulk_write failed on {name} ({len(writes)} ops, {retried} will be retried): {error}",
+            log_id=log_id,
+        )
+        retry.extend(write for write in writes if write.attempts < self.max_retries)
+        for write in exhausted:
+            self._drop(write, "retries exhausted", log_id)
+
+    @timed()
+    async def _flush(self, batch: list[_Write], log_id: str | None = None) -> list[_Write]:
+        """
+        batch를 기록하고 다시 시도할 작업 목록을 반환
+        """
+        # 컬렉션별로 묶되, 같은 컬렉션 안에서는 들어온 순서 유지 (ordered bulk_write)
+        # 다른 작업에 의존하는 작업이 있는 컬렉션(집계)은 의존 대상(세션 원본)보다 나중에 기록
+        grouped: dict[str, tuple] = {}
+        for write in batch:
+            grouped.setdefault(write.collection.name, (write.collection, []))[1].append(write)
+        order = sorted(grouped, key=lambda name: any(write.requires for write in grouped[name][1]))
+
+        started = time.perf_counter()
+        applied: list[_Write] = []
+        retry: list[_Write] = []
+        for name in order:
+            collection, writes = grouped[name]
+            ready = []
+            for write in writes:
+                required = write.requires
+                if required is None or required.state == "applied":
+                    ready.append(write)
+                elif required.state == "dropped":
+                    self._drop(write, f"required {required.collection.name} write was dropped", log_id)
+                else:
+                    retry.append(write)  # 의존 대상이 재시도 중이면 같이 미룸 (시도 횟수는 그대로)
+            writes = ready
+            if not writes:
+                continue
+            try:
+                await collection.bulk_write([write.op for write in writes], ordered=True)
+            except BulkWriteError as e:
+                # ordered 쓰기: 실패한 작업 앞까지는 기록됨, 실패한 작업은 버리고 뒤의 작업은 다시 시도
+                errors = e.details.get("writeErrors") or []
+                if not errors:
+                    self._mark_applied(writes, applied)  # writeConcernError만 있는 경우 (쓰기 자체는 반영됨)
+                    continue
+                index = errors[0]["index"]
+                self._mark_applied(writes[:index], applied)
+                log_db("Error", f"write-behind bulk_write rejected an op on {name}: {errors[0]}", log_id=log_id)
+                self._drop(writes[index], "rejected", log_id)
+                tail = writes[index + 1:]
+                retry.extend(tail)
+                self._counters["retried"] += len(tail)
+                continue
+            except Exception as e:
+                self._give_up_or_retry(writes, retry, name, e, log_id)
+                continue
+            self._mark_applied(writes, applied)
+
+        self._counters["written"] += len(applied)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self._counters["flushes"] += 1
+        self._counters["flush_ms_total"] += elapsed_ms
+        self._counters["flush_ms_last"] = elapsed_ms
+        self._counters["flush_ms_max"] = max(self._counters["flush_ms_max"], elapsed_ms)
+        log_db("DB Writing", "write-behind flush: %d ops in %.1fms", len(batch), elapsed_ms, log_id=log_id)
+
+        for write in applied:
+            if write.after_flush is None:
+                continue
+            try:
+                write.after_flush()
+            except Exception as e:
+                log_db("Error", f"write-behind after_flush callback failed: {e}", log_id=log_id)
+        return retry
+
+
+class CoalescingBuffer:
+    """
+    key(user_id)별 필드 변경분을 모아두었다가 flush_interval마다 한 번의 bulk_write로 전송
+    - 같은 key에 대한 여러 변경은 마지막 값으로 합쳐져 한 건의 $set이 됨
+    - 기존 문서만 갱신 (upsert 없음, 문서가 없는 유저는 주간 동기화에서 채움)
+      upsert하면 퇴장 처리(quitlogs 이동) 직후 늦게 flush된 변경이 탈퇴한 유저의 문서를 다시 만들 수 있음
+    - 기록에 실패한 변경은 버리지 않고 다음 flush에 다시 시도 (그 사이 들어온 더 새로운 값이 우선)
+    """
+
+    def __init__(self, collection, flush_interval: float, key_field: str = "user_id"):
+        self.collection = collection
+        self.flush_interval = flush_interval
+        self.key_field = key_field
+        self._pending: dict[str, dict] = {}
+        self._task: asyncio.Task | None = None
+        self._counters = {"events": 0, "coalesced": 0, "written": 0, "flushes": 0, "failed": 0}
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        if not self.running:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def close(self):
+        if self.running:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def put(self, key: str, fields: dict):
+        self._counters["events"] += 1
+        pending = self._pending.get(key)
+        if pending is None:
+            self._pending[key] = dict(fields)
+        else:
+            self._counters["coalesced"] += 1
+            pending.update(fields)
+
+    def stats(self) -> dict:
+        return {**self._counters, "pending": len(self._pending)}
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    @timed()
+    async def flush(self, log_id: str | None = None):
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        ops = [UpdateOne({self.key_field: key}, {"$set": fields}) for key, fields in pending.items()]
+        self._counters["flushes"] += 1
+        try:
+            await self.collection.bulk_write(ops, ordered=False)
+            self._counters["written"] += len(ops)
+            log_db("DB Writing", f"{self.collection.name} coalesced flush: {len(ops)} updates", log_id=log_id)
+        except Exception as e:
+            self._counters["failed"] += len(ops)
+            log_db("Error", f"{self.collection.name} coalesced flush failed ({len(ops)} updates, requeued): {e}", log_id=log_id)
+            for key, fields in pending.items():
+                newer = self._pending.get(key)
+                self._pending[key] = fields if newer is None else {**fields, **newer}
+
+
+voice_writes = WriteBehindQueue(
+    max_size=WRITE_BEHIND_MAX_QUEUE,
+    batch_size=WRITE_BEHIND_BATCH_SIZE,
+    flush_interval=WRITE_BEHIND_FLUSH_SECONDS,
+)
+
+# 닉네임/역할 등 멤버 프로필 변경 이벤트 (ServerSynchronization)
+member_updates = CoalescingBuffer(userlogs, flush_interval=MEMBER_UPDATE_FLUSH_SECONDS)
+
+
+async def queue_voice_log(user_id: str, log_id: str | None = None, **fields):
+    await voice_writes.put(userlogs, build_voice_log_update(user_id, **fields), log_id=log_id)
+
+
+async def queue_voice_leave(
+    user_id: str,
+    username: str,
+    join_time: datetime,
+    leave_time: datetime,
+    duration_seconds: int,
+    log_id: str | None = None,
+):
+    """
+    음성 채널 퇴장 시의 쓰기(누적 시간, 세션 기록 + 리더보드 집계, 마지막 퇴장 시간)를 큐에 적재
+    """
+    await voice_writes.put(userlogs, build_voice_duration_update(user_id, username, duration_seconds), log_id=log_id)
+    session = build_voice_session(user_id, username, join_time, leave_time, duration_seconds)
+    # 기록되지 못한 세션은 user_id와 시각으로 찾아 재생/재계산할 수 있도록 로그에 남김
+    label = f"voice_session user_id={user_id} start={session['start_time'].isoformat()} end={session['end_time'].isoformat()}"
+    session_write = await voice_writes.put(voice_sessions, InsertOne(session), log_id=log_id, label=label)
+    # 집계는 세션 insert가 기록된 뒤에만 반영 (insert가 버려지면 집계도 건너뜀)
+    rollups = build_rollup_updates(session)
+    for collection, op in rollups[:-1]:
+        await voice_writes.put(collection, op, log_id=log_id, requires=session_write, label=label)
+    # 마지막 집계 작업까지 기록된 뒤 리더보드 캐시 무효화
+    collection, op = rollups[-1]
+    await voice_writes.put(
+        collection, op, log_id=log_id, requires=session_write, label=label,
+        after_flush=lambda: invalidate_sessions([session]),
+    )
+    await queue_voice_log(user_id, username=username, leave_time=leave_time, log_id=log_id)
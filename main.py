@@ -5,7 +5,8 @@ import discord
 
 from discord.ext import commands
 from dotenv import load_dotenv
-from utils.logging_utils import log_bot
+from db.indexes import bootstrap_indexes
+from utils.logging_utils import log_bot, stop_logging
 
 load_dotenv()
 TOKEN = os.getenv("DISCORD_BOT_TOKEN")
@@ -26,6 +27,9 @@ async def on_ready():
         log_bot("Error", f"Slash command sync failed: {e}")
 
 async def main():
+    # 인덱스 선언 (idempotent) 및 선택적 쿼리 플랜 검증
+    await bootstrap_indexes(log_id=log_bot("DB", "bootstrap indexes"))
+
     # Cog 비동기 로드
     await bot.load_extension("cogs.voice_tracker")
     await bot.load_extension("cogs.grant_authority")
@@ -42,8 +46,19 @@ async def main():
     await bot.load_extension("cogs.rejoin_tracker")
     # 출석 알림
     await bot.load_extension("cogs.attendance_alert")
+    # DB 관리 (마이그레이션 등)
+    await bot.load_extension("cogs.db_maintenance")
+    # 명령어/이벤트/DB 호출 실행 시간 통계
+    await bot.load_extension("cogs.performance_metrics")
 
-    await bot.start(TOKEN)
+    try:
+        await bot.start(TOKEN)
+    finally:
+        # close()가 Cog를 unload하면서 write-behind 큐 등을 flush
+        if not bot.is_closed():
+            await bot.close()
+        # 큐에 남은 로그 기록
+        stop_logging()
 
 if __name__ == "__main__":
     import asyncio
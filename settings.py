@@ -1,5 +1,10 @@
+import asyncio
 import json
 import os
+import tempfile
+import threading
+import time
+from typing import Any
 from dotenv import load_dotenv
 
 # Refactor: settings/config centralized; behavior unchanged
@@ -15,17 +20,112 @@ ROLE_ORGANIZER_MENTION = os.getenv("ROLE_ORGANIZER_MENTION", "<@&120556599116208
 MEMBER_ROLE_NAME = os.getenv("MEMBER_ROLE_NAME")
 GUEST_ROLE_NAME = os.getenv("GUEST_ROLE_NAME")
 
+# Voice session retention (current month + previous N-1 months)
+VOICE_RETENTION_MONTHS = int(os.getenv("VOICE_RETENTION_MONTHS", "4"))
+VOICE_RETENTION_BATCH_SIZE = int(os.getenv("VOICE_RETENTION_BATCH_SIZE", "1000"))
+
+
+# config.json 변경 여부 확인(os.stat) 최소 간격
+CONFIG_STAT_INTERVAL_SECONDS = float(os.getenv("CONFIG_STAT_INTERVAL_SECONDS", "1.0"))
+
+
+class ConfigStore:
+    """
+    config.json을 한 번만 파싱해 메모리에서 제공
+    - 파일 mtime이 바뀌었을 때만 다시 읽음 (stat은 stat_interval 초에 한 번)
+    - 쓰기는 임시 파일에 기록 후 os.replace로 교체 (원자적)
+    - version은 내용이 바뀔 때마다 증가 (설정에서 파생된 캐시의 재계산 여부 판단용)
+    - 읽은 내용은 (data, mtime, version) 튜플 참조 교체로 공개 → get()은 쓰기 lock(파일 기록/fsync)을 기다리지 않음
+    """
+
+    def __init__(self, path: str, stat_interval: float = CONFIG_STAT_INTERVAL_SECONDS):
+        self.path = path
+        self.stat_interval = stat_interval
+        self._snapshot: tuple[dict, int | None, int] | None = None
+        self._checked_at = 0.0
+        # 쓰기끼리만 직렬화 (update는 worker 스레드에서 실행)
+        self._write_lock = threading.Lock()
+        # 스냅샷 교체용 (디스크 I/O 중에는 잡지 않음)
+        self._publish_lock = threading.Lock()
+
+    @property
+    def version(self) -> int:
+        snapshot = self._snapshot
+        return snapshot[2] if snapshot else 0
+
+    def get(self) -> dict:
+        now = time.monotonic()
+        snapshot = self._snapshot
+        if snapshot is None or now - self._checked_at >= self.stat_interval:
+            self._checked_at = now
+            snapshot = self._reload_if_changed(snapshot)
+        return dict(snapshot[0])
+
+    def update(self, key: str, value: Any) -> None:
+        with self._write_lock:
+            # 다른 곳에서 파일을 수정했을 수 있으므로 최신 내용에 병합
+            current = self._reload_if_changed(self._snapshot)
+            config = {**current[0], key: value}
+            self._write(config)
+            self._publish(self._snapshot, config, self._stat(), force=True)
+
+    async def update_async(self, key: str, value: Any) -> None:
+        await asyncio.to_thread(self.update, key, value)
+
+    def _stat(self) -> int | None:
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _reload_if_changed(self, snapshot) -> tuple[dict, int | None, int]:
+        mtime = self._stat()
+        if snapshot is not None and mtime == snapshot[1]:
+            return snapshot
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            data = {}
+        return self._publish(snapshot, data, mtime)
+
+    def _publish(self, expected, data: dict, mtime: int | None, force: bool = False) -> tuple[dict, int | None, int]:
+        with self._publish_lock:
+            current = self._snapshot
+            # 읽는 동안 다른 스레드가 더 새로운 내용을 공개했다면 그것을 유지
+            if current is not expected and not force:
+                return current
+            version = current[2] + 1 if current else 1
+            self._snapshot = (data, mtime, version)
+            return self._snapshot
+
+    def _write(self, config: dict):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".config-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(config, f, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+
+
+config_store = ConfigStore(CONFIG_FILE)
+
 
 def load_config() -> dict:
-    try:
-        with open(CONFIG_FILE, "r") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return {}
-
-
-def update_config(key: str, value: str) -> None:
-    config = load_config()
-    config[key] = value
-    with open(CONFIG_FILE, "w") as f:
-        json.dump(config, f, indent=4)
+    return config_store.get()
+
+
+def update_config(key: str, value: Any) -> None:
+    config_store.update(key, value)
+
+
+async def update_config_async(key: str, value: Any) -> None:
+    await config_store.update_async(key, value)
@@ -0,0 +1,184 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+_DEFAULT_TTL = object()
+
+
+class AsyncTTLCache:
+    """
+    asyncio용 TTL + LRU 결과 캐시
+    - 같은 key에 대한 동시 요청은 하나의 loader 호출로 합쳐짐 (single-flight)
+    - ttl=None으로 저장한 항목은 만료되지 않음 (invalidate/clear로만 제거)
+    - 빈 결과(falsy)는 저장하지 않음 (조회 실패 시 빈 값을 반환하는 헬퍼가 많기 때문)
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 128):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: OrderedDict[Hashable, tuple[float | None, Any]] = OrderedDict()
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self._dirty: set[Hashable] = set()
+        self._counters = {"hits": 0, "misses": 0, "coalesced": 0, "evictions": 0, "invalidations": 0}
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]], ttl=_DEFAULT_TTL):
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at is None or expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self._counters["hits"] += 1
+                return value
+            del self._entries[key]
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self._counters["coalesced"] += 1
+        else:
+            self._counters["misses"] += 1
+            # loader는 별도 task로 실행 → 처음 요청한 쪽이 취소돼도 함께 기다리던 요청에는 영향 없음
+            task = asyncio.get_running_loop().create_task(
+                self._load(key, loader, self.ttl if ttl is _DEFAULT_TTL else ttl)
+            )
+            # 대기자가 없어도 "exception never retrieved" 경고가 나지 않도록
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._inflight[key] = task
+        return await asyncio.shield(task)
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]], ttl: float | None):
+        try:
+            value = await loader()
+        finally:
+            self._inflight.pop(key, None)
+            # 로딩 중에 invalidate된 결과는 오래된 값일 수 있으므로 저장하지 않음 (실패/취소여도 표시는 해제)
+            dirty = key in self._dirty
+            self._dirty.discard(key)
+        if value and not dirty:
+            self._store(key, value, ttl)
+        return value
+
+    def _store(self, key: Hashable, value: Any, ttl: float | None):
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def invalidate(self, predicate: Callable[[Hashable], bool]) -> int:
+        keys = [key for key in self._entries if predicate(key)]
+        for key in keys:
+            del self._entries[key]
+        self._dirty.update(key for key in self._inflight if predicate(key))
+        self._counters["invalidations"] += len(keys)
+        return len(keys)
+
+    def clear(self):
+        self._counters["invalidations"] += len(self._entries)
+        self._entries.clear()
+        self._dirty.update(self._inflight)
+
+    def stats(self) -> dict:
+        return {**self._counters, "size": len(self._entries), "inflight": len(self._inflight)}
+
+
+class SnapshotCache:
+    """
+    stale-while-revalidate 스냅샷 캐시
+    - ttl 이내: 캐시 값 반환 (hit)
+    - ttl ~ ttl + stale_ttl: 이전 값을 바로 반환하고 백그라운드에서 갱신 (stale)
+    - 그 이후 / 없음: loader를 기다림 (miss), 같은 key의 동시 요청은 한 번만 호출
+    - key별 요청 횟수를 기록하여 자주 요청되는 key를 미리 갱신(prefetch)할 수 있음
+      (캐시에 있는 key만 집계 → 로딩에 실패한 임의 입력 key로 커지지 않고, 제거된 key는 함께 삭제)
+    """
+
+    def __init__(self, ttl: float, stale_ttl: float, maxsize: int = 64):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.maxsize = maxsize
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self._requests: dict[Hashable, int] = {}
+        self._counters = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "refreshes": 0,
+            "refresh_errors": 0,
+            "refresh_ms_total": 0.0,
+            "refresh_ms_last": 0.0,
+            "refresh_ms_max": 0.0,
+        }
+
+    async def get(self, key: Hashable, loader: Callable[[], Awaitable[Any]]):
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._count_request(key)
+            loaded_at, value = entry
+            age = time.monotonic() - loaded_at
+            if age < self.ttl:
+                self._entries.move_to_end(key)
+                self._counters["hits"] += 1
+                return value
+            if age < self.ttl + self.stale_ttl:
+                self._entries.move_to_end(key)
+                self._counters["stale_hits"] += 1
+                self._refresh_task(key, loader)
+                return value
+
+        self._counters["misses"] += 1
+        value = await asyncio.shield(self._refresh_task(key, loader))
+        self._count_request(key)
+        return value
+
+    async def refresh(self, key: Hashable, loader: Callable[[], Awaitable[Any]]):
+        return await asyncio.shield(self._refresh_task(key, loader))
+
+    def _count_request(self, key: Hashable):
+        if key in self._entries:
+            self._requests[key] = self._requests.get(key, 0) + 1
+
+    def top_keys(self, n: int) -> list[Hashable]:
+        return sorted(self._requests, key=self._requests.get, reverse=True)[:n]
+
+    def stats(self) -> dict:
+        refreshes = self._counters["refreshes"]
+        return {
+            **self._counters,
+            "refresh_ms_avg": self._counters["refresh_ms_total"] / refreshes if refreshes else 0.0,
+            "size": len(self._entries),
+            "inflight": len(self._inflight),
+        }
+
+    def _refresh_task(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(self._load(key, loader))
+            # 백그라운드 갱신 실패는 refresh_errors로만 집계 (대기자가 없어도 경고가 나지 않도록)
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._inflight[key] = task
+        return task
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]):
+        started = time.perf_counter()
+        try:
+            value = await loader()
+        except Exception:
+            self._counters["refresh_errors"] += 1
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self._counters["refreshes"] += 1
+        self._counters["refresh_ms_total"] += elapsed_ms
+        self._counters["refresh_ms_last"] = elapsed_ms
+        self._counters["refresh_ms_max"] = max(self._counters["refresh_ms_max"], elapsed_ms)
+
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            evicted, _ = self._entries.popitem(last=False)
+            self._requests.pop(evicted, None)
+        return value
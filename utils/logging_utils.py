@@ -0,0 +1,162 @@
+"""
+봇/DB 로그 공통 모듈
+
+- log_bot / log_db는 호출한 쪽(이벤트 루프)에서 큐에 넣기만 하고, 파일/콘솔 출력은 백그라운드 스레드(QueueListener)가 처리
+- 메시지는 %-포맷 인자로 넘기면 실제로 기록될 때만 문자열로 만듦
+  log_db("DB", "User profile doc: %s", doc, log_id=log_id)
+- 카테고리별 샘플링 (LOG_SAMPLE_RATES="DB Reading=0.1,DB Writing=0.5"), Error는 항상 기록
+- 한 줄에 JSON 하나 (ts, level, source, category, log_id, message)
+"""
+import atexit
+import itertools
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FILE = os.getenv("LOG_FILE", "")
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+# 카테고리별 로그 레벨 (없으면 INFO)
+CATEGORY_LEVELS = {
+    "Error": logging.ERROR,
+}
+
+_error_callback: Callable[[str], Any] | None = None
+_listener: logging.handlers.QueueListener | None = None
+_dropped = 0
+_LOG_ID_PREFIX = os.urandom(3).hex()
+_log_id_counter = itertools.count(1)
+
+
+def _parse_sample_rates(value: str) -> dict[str, float]:
+    rates = {}
+    for part in value.split(","):
+        if "=" not in part:
+            continue
+        category, rate = part.rsplit("=", 1)
+        try:
+            rates[category.strip()] = min(1.0, max(0.0, float(rate)))
+        except ValueError:
+            continue
+    return rates
+
+
+SAMPLE_RATES = _parse_sample_rates(os.getenv("LOG_SAMPLE_RATES", ""))
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "source": getattr(record, "source", record.name),
+            "category": getattr(record, "category", None),
+            "log_id": getattr(record, "log_id", None),
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    # 큐가 가득 차면 이벤트 루프를 막지 않고 버림 (버린 건수는 dropped_logs()로 확인)
+    def enqueue(self, record: logging.LogRecord):
+        global _dropped
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _dropped += 1
+
+
+def stop_logging():
+    """남은 로그를 모두 기록한 뒤 writer 스레드 종료"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def _install() -> logging.Logger:
+    global _listener
+    logger = logging.getLogger("watchers")
+    if _listener is not None:
+        return logger
+
+    formatter = JsonFormatter()
+    handlers: list[logging.Handler] = [logging.StreamHandler(sys.stdout)]
+    if LOG_FILE:
+        handlers.append(logging.handlers.RotatingFileHandler(
+            LOG_FILE, maxBytes=10 * 1024 * 1024, backupCount=5, encoding="utf-8"
+        ))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    logger.addHandler(_DroppingQueueHandler(log_queue))
+    logger.setLevel(getattr(logging, LOG_LEVEL, logging.INFO))
+    logger.propagate = False
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+    return logger
+
+
+_logger = _install()
+
+
+def dropped_logs() -> int:
+    return _dropped
+
+
+def new_log_id() -> str:
+    # 프로세스별 prefix + 순번 (uuid4보다 훨씬 저렴)
+    return f"{_LOG_ID_PREFIX}{next(_log_id_counter):06x}"
+
+
+def set_error_callback(callback: Callable[[str], Any] | None):
+    global _error_callback
+    _error_callback = callback
+
+
+def _log(source: str, category: str, message: str, args: tuple, log_id: str | None) -> str:
+    log_id = log_id or new_log_id()
+    level = CATEGORY_LEVELS.get(category, logging.INFO)
+
+    if level < logging.ERROR:
+        if not _logger.isEnabledFor(level):
+            return log_id
+        rate = SAMPLE_RATES.get(category)
+        if rate is not None and random.random() >= rate:
+            return log_id
+
+    record = _logger.makeRecord(
+        _logger.name, level, "(unknown file)", 0, message, args, None,
+        extra={"source": source, "category": category, "log_id": log_id},
+    )
+    _logger.handle(record)
+
+    if level >= logging.ERROR and _error_callback is not None:
+        text = message % args if args else message
+        try:
+            # log_id는 넣지 않음 (같은 에러가 알림에서 한 줄로 합쳐지도록)
+            _error_callback(f"[{source.upper()}][{category}] {text}")
+        except Exception:
+            pass
+    return log_id
+
+
+def log_bot(category: str, message: str, *args, log_id: str | None = None) -> str:
+    return _log("bot", category, message, args, log_id)
+
+
+def log_db(category: str, message: str, *args, log_id: str | None = None) -> str:
+    return _log("db", category, message, args, log_id)
@@ -0,0 +1,180 @@
+"""
+명령어 / 이벤트 / DB 호출별 실행 시간 집계
+
+- @timed(): 함수 호출 시간을 이름별 히스토그램에 기록 (이름 생략 시 "모듈.함수")
+    @timed()
+    async def get_user_profile(...): ...
+- span(name): 코드 구간 측정
+    with span("discord.followup"):
+        await interaction.followup.send(...)
+- 예외로 끝난 호출은 errors로도 집계 (취소된 호출은 기록하지 않음)
+- @timed / span은 이벤트 루프 스레드에서만 갱신하므로 lock 없이 기록 (호출당 수 µs 이내)
+- MetricsRegistry의 get/observe/snapshot/reset은 lock으로 보호
+  (pymongo 모니터링 콜백은 motor의 executor 스레드에서 registry.observe를 호출)
+"""
+import functools
+import inspect
+import threading
+from bisect import bisect_left
+from time import perf_counter
+
+# 히스토그램 구간 상한(초), 마지막 구간은 +Inf
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class OperationStats:
+    __slots__ = ("name", "count", "errors", "total", "max", "buckets")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+
+    def observe(self, seconds: float, error: bool = False):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        if error:
+            self.errors += 1
+        self.buckets[bisect_left(BUCKETS, seconds)] += 1
+
+    def quantile(self, q: float) -> float:
+        """
+        구간 안에서 선형 보간한 근사값(초), 마지막 구간은 max 사용
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for idx, bucket in enumerate(self.buckets):
+            if bucket and seen + bucket >= rank:
+                lower = BUCKETS[idx - 1] if idx else 0.0
+                upper = BUCKETS[idx] if idx < len(BUCKETS) else self.max
+                return min(self.max, lower + (upper - lower) * (rank - seen) / bucket)
+            seen += bucket
+        return self.max
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._ops: dict[str, OperationStats] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> OperationStats:
+        stats = self._ops.get(name)
+        if stats is None:
+            with self._lock:
+                stats = self._ops.get(name)
+                if stats is None:
+                    stats = self._ops[name] = OperationStats(name)
+        return stats
+
+    def observe(self, name: str, seconds: float, error: bool = False):
+        stats = self.get(name)
+        with self._lock:
+            stats.observe(seconds, error)
+
+    def snapshot(self) -> list[OperationStats]:
+        # 호출된 적 있는 항목만, 누적 시간 순
+        with self._lock:
+            ops = list(self._ops.values())
+        return sorted((s for s in ops if s.count), key=lambda s: s.total, reverse=True)
+
+    def reset(self):
+        # 데코레이터가 OperationStats를 직접 잡고 있으므로 객체는 유지하고 값만 초기화
+        with self._lock:
+            for stats in self._ops.values():
+                stats.reset()
+
+    def render_prometheus(self, prefix: str = "watchers") -> str:
+        lines = [
+            f"# HELP {prefix}_operation_seconds Latency of commands, events and DB helpers.",
+            f"# TYPE {prefix}_operation_seconds histogram",
+        ]
+        snapshot = self.snapshot()
+        for stats in snapshot:
+            label = f'op="{_escape_label(stats.name)}"'
+            # 다른 스레드가 기록 중이어도 +Inf 구간과 count가 일치하도록 복사본의 합계를 count로 사용
+            buckets = list(stats.buckets)
+            count = sum(buckets)
+            cumulative = 0
+            for bound, bucket in zip(BUCKETS, buckets):
+                cumulative += bucket
+                lines.append(f'{prefix}_operation_seconds_bucket{{{label},le="{bound}"}} {cumulative}')
+            lines.append(f'{prefix}_operation_seconds_bucket{{{label},le="+Inf"}} {count}')
+            lines.append(f"{prefix}_operation_seconds_sum{{{label}}} {stats.total:.6f}")
+            lines.append(f"{prefix}_operation_seconds_count{{{label}}} {count}")
+        lines.append(f"# HELP {prefix}_operation_errors_total Calls that raised an exception.")
+        lines.append(f"# TYPE {prefix}_operation_errors_total counter")
+        for stats in snapshot:
+            lines.append(f'{prefix}_operation_errors_total{{op="{_escape_label(stats.name)}"}} {stats.errors}')
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+registry = MetricsRegistry()
+
+
+class span:
+    __slots__ = ("_stats", "_started")
+
+    def __init__(self, name: str):
+        self._stats = registry.get(name)
+
+    def __enter__(self):
+        self._started = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None or issubclass(exc_type, Exception):
+            self._stats.observe(perf_counter() - self._started, exc_type is not None)
+        return False
+
+
+def timed(name=None):
+    """
+    @timed() / @timed("이름") / @timed 모두 사용 가능 (동기/비동기 함수)
+    """
+    if callable(name):
+        return timed()(name)
+
+    def decorator(fn):
+        stats = registry.get(name or f"{fn.__module__}.{fn.__qualname__}")
+        observe = stats.observe
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                started = perf_counter()
+                try:
+                    result = await fn(*args, **kwargs)
+                except Exception:
+                    observe(perf_counter() - started, True)
+                    raise
+                observe(perf_counter() - started)
+                return result
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            started = perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception:
+                observe(perf_counter() - started, True)
+                raise
+            observe(perf_counter() - started)
+            return result
+        return wrapper
+
+    return decorator